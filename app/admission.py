@@ -0,0 +1,185 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from app.config import Settings, settings
+from app.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_WAIT
+from app.logger import logger
+
+# Admission control for /api requests, per worker.
+#
+# Without it, a spike queues requests inside the connection pool: each
+# waits up to DB_POOL_TIMEOUT for a connection and then fails with a 500,
+# long after the client gave up, while everything in the queue behind it
+# slows down too. AdmissionMiddleware caps the requests in flight per
+# class - reads (GET/HEAD) and writes (everything else) - at about what
+# the pool can serve, lets a few more wait in a short FIFO queue, and
+# answers the rest at once with 503 + Retry-After. Admitted requests keep
+# their latency; the overflow is shed cheaply, before any work is done.
+#
+# Probes, /metrics and /internal/* are not /api and are never held back.
+#
+# With GROUP_COMMIT, creates (POST /api/v1/articles) get a gate of their
+# own. A parked create holds no connection - only the flush does, one per
+# batch - so capping creates at a third of the pool would keep batches
+# from ever filling up and shed creates the committer could have taken.
+# Their gate admits GROUP_COMMIT_MAX_BATCH, a full batch; the other writes
+# keep the connection-sized limit.
+
+ADMITTED_PREFIX = "/api/"
+READ_METHODS = ("GET", "HEAD")
+CREATE_PATHS = ("/api/v1/articles", "/api/v1/articles/")
+
+# shedding is logged at most this often (seconds) - under overload a
+# line per rejected request would only add to the load
+LOG_INTERVAL = 10
+
+
+class AdmissionGate:
+    # One class of requests: at most `limit` in flight, up to `queue_size`
+    # more waiting, first come first served, for at most `queue_timeout`
+    # seconds. Event loop only - no locks.
+
+    def __init__(self, name: str, limit: int, queue_size: int, queue_timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._update_gauges()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.name, value=self.in_flight)
+        ADMISSION_QUEUE_DEPTH.set(self.name, value=self.queued)
+
+    async def acquire(self) -> Optional[str]:
+        # None once admitted, otherwise why the request was turned away
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self._update_gauges()
+            return None
+        if len(self._waiters) >= self.queue_size:
+            return "queue_full"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            return "queue_timeout"
+        except asyncio.CancelledError:
+            # the client went away - pass on a slot handed over meanwhile
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            self._update_gauges()
+        ADMISSION_WAIT.observe(time.perf_counter() - started, self.name)
+        return None
+
+    def release(self) -> None:
+        # hand the slot straight to the oldest waiter (in_flight unchanged)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._update_gauges()
+                return
+        self.in_flight -= 1
+        self._update_gauges()
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "queue_size": self.queue_size,
+            "queue_timeout_ms": round(self.queue_timeout * 1000, 1),
+        }
+
+
+def make_gates(config: Settings = settings) -> Dict[str, AdmissionGate]:
+    # One request holds at most one connection: by default the pool at full
+    # overflow is split between the classes, a third of it (at least one)
+    # for writes
+    connections = config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW
+    writes = config.ADMISSION_WRITE_LIMIT or max(connections // 3, 1)
+    reads = config.ADMISSION_READ_LIMIT or max(connections - writes, 1)
+    timeout = config.ADMISSION_QUEUE_TIMEOUT_MS / 1000
+    gates = {
+        "read": AdmissionGate("read", reads, config.ADMISSION_READ_QUEUE, timeout),
+        "write": AdmissionGate("write", writes, config.ADMISSION_WRITE_QUEUE, timeout),
+    }
+    if config.GROUP_COMMIT:
+        creates = config.ADMISSION_CREATE_LIMIT or max(config.GROUP_COMMIT_MAX_BATCH, 1)
+        gates["create"] = AdmissionGate("create", creates, config.ADMISSION_WRITE_QUEUE, timeout)
+    return gates
+
+
+class AdmissionMiddleware:
+
+    def __init__(self, app, gates: Dict[str, AdmissionGate], retry_after: int = 1):
+        self.app = app
+        self.gates = gates
+        self.retry_after = retry_after
+        self._body = json.dumps({
+            "detail": {"success": False, "error": "The server is busy. Please retry shortly."}
+        }).encode("utf-8")
+        self._shed = 0
+        self._logged_at = 0.0
+
+    async def _reject(self, send, gate: AdmissionGate, reason: str) -> None:
+        ADMISSION_REJECTED.inc(gate.name, reason)
+        self._shed += 1
+        now = time.monotonic()
+        if now - self._logged_at >= LOG_INTERVAL:
+            logger.warning(
+                f"Failure: Overloaded - shed {self._shed} request(s) since the last report "
+                f"(latest: {gate.name}, {reason}, {gate.in_flight} in flight, {gate.queued} queued)"
+            )
+            self._shed = 0
+            self._logged_at = now
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(self._body)).encode("latin-1")),
+                (b"retry-after", str(self.retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": self._body})
+
+    def _request_class(self, scope) -> str:
+        if scope["method"] in READ_METHODS:
+            return "read"
+        if scope["method"] == "POST" and scope["path"] in CREATE_PATHS and "create" in self.gates:
+            return "create"
+        return "write"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(ADMITTED_PREFIX):
+            await self.app(scope, receive, send)
+            return
+
+        gate = self.gates[self._request_class(scope)]
+        reason = await gate.acquire()
+        if reason is not None:
+            await self._reject(send, gate, reason)
+            return
+        try:
+            # held until the whole body is sent - streaming exports keep
+            # their connection that long too
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
@@ -0,0 +1,80 @@
+import zlib
+from typing import Optional, Tuple
+from app.config import settings
+
+# Article bodies are stored apart from the article rows, compressed, in
+# article_bodies(article_id, codec, data, size). The articles table keeps
+# only metadata plus a short preview, so list and filter queries scan
+# small rows and never read a body; the body is fetched and decompressed
+# only when a response returns `content` (Article.content, app/models.py).
+#
+# codec says how `data` is encoded, so bodies written with different
+# settings (or before zstandard was installed) stay readable:
+#   zstd  - zstandard (in requirements.txt), the default
+#   zlib  - stdlib, for hosts that can't install zstandard (BODY_CODEC=zlib)
+#   plain - UTF-8 as is: short bodies, or ones compression didn't shrink
+
+# characters of the body kept inline in articles.preview - list excerpts
+# are cut from it, so EXCERPT_LENGTH can't usefully exceed this
+PREVIEW_LENGTH = 500
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+if settings.BODY_CODEC not in ("zstd", "zlib", "plain"):
+    raise ValueError(f"Unknown BODY_CODEC: {settings.BODY_CODEC!r}")
+# refuse to start rather than quietly write zlib: a host without the
+# package couldn't read the zstd bodies other hosts write either
+if settings.BODY_CODEC == "zstd" and zstandard is None:
+    raise RuntimeError("BODY_CODEC=zstd requires the 'zstandard' package (pip install zstandard) - or set BODY_CODEC=zlib")
+
+
+def encode_body(text: str) -> Tuple[str, bytes]:
+    # (codec, data) for a body
+    raw = text.encode("utf-8")
+    codec = settings.BODY_CODEC
+    if codec == "plain" or len(raw) < settings.BODY_COMPRESS_MIN_SIZE:
+        return "plain", raw
+
+    if codec == "zstd":
+        # a ZstdCompressor must not be shared between threads - one per call
+        data = zstandard.ZstdCompressor(level=settings.BODY_COMPRESSION_LEVEL).compress(raw)
+    else:
+        data = zlib.compress(raw, min(settings.BODY_COMPRESSION_LEVEL, 9))
+    if len(data) >= len(raw):
+        return "plain", raw
+    return codec, data
+
+
+def decode_body(codec: Optional[str], data: Optional[bytes]) -> Optional[str]:
+    if data is None:
+        return None
+    data = bytes(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Article body is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    return data.decode("utf-8")
+
+
+def make_preview(text: Optional[str]) -> Optional[str]:
+    return text[:PREVIEW_LENGTH] if text is not None else None
+
+
+def body_row(article_id: int, text: str) -> dict:
+    # article_bodies row for Core inserts (bulk import, seeding, restore)
+    codec, data = encode_body(text)
+    return {"article_id": article_id, "codec": codec, "data": data, "size": len(text.encode("utf-8"))}
+
+
+def article_row(row: dict) -> dict:
+    # A row with `content` -> its articles row (preview inline, the body
+    # goes to article_bodies through body_row)
+    article = {name: value for name, value in row.items() if name != "content"}
+    article["preview"] = make_preview(row["content"])
+    return article
@@ -0,0 +1,290 @@
+import codecs
+import json
+import re
+from typing import AsyncIterator, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.engine import Row
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Article, ArticleBody, ArticleTag
+from app.bodies import body_row, make_preview
+from app.schemas.article import ArticleCreate
+from app.tags import normalize_tags, join_tags
+from app.counts import adjust_counts, tag_deltas
+from app.search import index_articles
+from app.cache import list_cache
+from app.logger import logger
+
+# Streaming bulk import: records are parsed from the request body as it
+# arrives, validated one by one and inserted batch by batch, so memory
+# stays bounded by BULK_BATCH_SIZE no matter how large the upload is.
+
+_decoder = json.JSONDecoder()
+
+# strings (closed, or one still open at the end of the buffer) and the
+# characters that delimit array elements
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|"|[\[\]{},]')
+
+
+def _skip_separators(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+        pos += 1
+    return pos
+
+
+def _element_end(buffer: str, pos: int) -> Optional[int]:
+    # Where the array element starting at pos ends: the "," or "]" after it
+    # at the top level. None if the buffer ends first.
+    depth = 0
+    for match in _STRUCTURE.finditer(buffer, pos):
+        token = match.group()
+        if token == '"':
+            return None
+        if token[0] == '"':
+            continue
+        if token in "[{":
+            depth += 1
+        elif depth == 0 and token in ",]":
+            return match.start()
+        elif token in "]}":
+            depth -= 1
+    return None
+
+
+def _drain_array(buffer: str) -> Tuple[List[Tuple[Optional[object], Optional[str]]], str, bool]:
+    # Decode every complete element of a JSON array body.
+    # Returns (records, unconsumed rest, reached closing bracket).
+    records = []
+    pos = 0
+    while True:
+        pos = _skip_separators(buffer, pos)
+        if pos >= len(buffer):
+            return records, "", False
+        if buffer[pos] == "]":
+            return records, buffer[pos + 1:], True
+        try:
+            obj, end = _decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            end = _element_end(buffer, pos)
+            if end is None:
+                # most likely an element cut in half by the chunk boundary
+                return records, buffer[pos:], False
+            # complete but malformed - reported like a bad NDJSON line, and
+            # decoding resumes at the next element
+            records.append((None, f"Invalid JSON: {e.msg}"))
+            pos = end
+            continue
+        if end == len(buffer):
+            # a number can decode early ("12" arriving as "1") - only trust
+            # an element once whatever follows it has arrived
+            return records, buffer[pos:], False
+        records.append((obj, None))
+        pos = end
+
+
+def _parse_line(line: str) -> Tuple[Optional[object], Optional[str]]:
+    try:
+        return json.loads(line), None
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e.msg}"
+
+
+async def iter_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[object], Optional[str]]]:
+    # Yields (index, parsed object, parse error) for an NDJSON body
+    # (one object per line) or a JSON array body, sniffed from the first
+    # non-blank character. A body that isn't UTF-8 stops the import where
+    # it goes wrong - nothing after it can be trusted to split correctly.
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    mode = None
+    finished = False
+    index = 0
+    received = 0
+
+    async for chunk in chunks:
+        if finished:
+            continue
+        # e.start counts from the bytes the decoder still held back
+        held = len(utf8.getstate()[0])
+        try:
+            buffer += utf8.decode(chunk)
+        except UnicodeDecodeError as e:
+            yield index, None, f"Invalid UTF-8 at byte {received - held + e.start}, import stopped"
+            return
+        received += len(chunk)
+
+        if mode is None:
+            buffer = buffer.lstrip()
+            if not buffer:
+                continue
+            mode = "array" if buffer[0] == "[" else "ndjson"
+            if mode == "array":
+                buffer = buffer[1:]
+
+        if mode == "ndjson":
+            *lines, buffer = buffer.split("\n")
+            records = [_parse_line(line) for line in lines if line.strip()]
+        else:
+            records, buffer, finished = _drain_array(buffer)
+
+        for obj, error in records:
+            yield index, obj, error
+            index += 1
+
+        # the limit is in bytes - the buffer is decoded text, so measure its
+        # UTF-8 size (ASCII text: one byte per character)
+        pending = len(buffer) if buffer.isascii() else len(buffer.encode("utf-8"))
+        if pending > settings.BULK_MAX_RECORD_BYTES:
+            yield index, None, f"Record exceeds {settings.BULK_MAX_RECORD_BYTES} bytes, import stopped"
+            return
+
+    held = len(utf8.getstate()[0])
+    try:
+        buffer += utf8.decode(b"", final=True)
+    except UnicodeDecodeError:
+        # the body ends inside a character
+        yield index, None, f"Invalid UTF-8 at byte {received - held}, import stopped"
+        return
+    if mode == "ndjson" and buffer.strip():
+        obj, error = _parse_line(buffer)
+        yield index, obj, error
+    elif mode == "array" and not finished:
+        records, buffer, finished = _drain_array(buffer)
+        for obj, error in records:
+            yield index, obj, error
+            index += 1
+        if buffer.strip() or not finished:
+            yield index, None, "Invalid JSON: unterminated array or malformed element"
+
+
+def validate_record(obj) -> Tuple[Optional[ArticleCreate], Optional[str]]:
+    try:
+        return ArticleCreate.model_validate(obj), None
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{'.'.join(str(part) for part in err['loc']) or 'record'}: {err['msg']}"
+            for err in e.errors()
+        )
+
+
+def _row(article: ArticleCreate) -> dict:
+    return {
+        "title": article.title,
+        "preview": make_preview(article.content),
+        "author": article.author if article.author else "Anonymous",
+        "tags": join_tags(article.tags),
+    }
+
+
+def insert_articles(db, articles: List[ArticleCreate]) -> List[Row]:
+    # One multi-row INSERT ... RETURNING for the articles (insertmanyvalues),
+    # one for their compressed bodies, one for their tags, then counters and
+    # search index - same transaction.
+    # Returns (id, created_at, updated_at) rows in input order.
+    rows = [_row(article) for article in articles]
+    created = db.execute(
+        insert(Article).returning(Article.id, Article.created_at, Article.updated_at, sort_by_parameter_order=True),
+        rows
+    ).all()
+    db.execute(insert(ArticleBody), [body_row(row.id, article.content) for row, article in zip(created, articles)])
+
+    links = []
+    added_tags = []
+    for row, article in zip(created, articles):
+        for tag in normalize_tags(article.tags):
+            links.append({"article_id": row.id, "tag": tag})
+            added_tags.append(tag)
+    if links:
+        db.execute(insert(ArticleTag), links)
+
+    adjust_counts(db, total_delta=len(created), tag_delta=tag_deltas(added=added_tags))
+    index_articles(db.connection(), [(row.id, article.title, article.content) for row, article in zip(created, articles)])
+    return created
+
+
+def insert_each(articles: List[ArticleCreate]) -> List[Tuple[Optional[Row], Optional[str]]]:
+    # (created row, None) or (None, error) per article. Runs in the threadpool.
+    # If the batch as a whole fails, rows are retried one by one in
+    # savepoints so only the offending rows are rejected.
+    batch_tags = [tag for article in articles for tag in normalize_tags(article.tags)]
+    with SessionLocal() as db:
+        try:
+            created = insert_articles(db, articles)
+            db.commit()
+            list_cache.invalidate(batch_tags)
+            return [(row, None) for row in created]
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Batch of {len(articles)} articles failed, retrying row by row - Error: {str(e)}")
+
+        results = []
+        for article in articles:
+            try:
+                with db.begin_nested():
+                    results.append((insert_articles(db, [article])[0], None))
+            except Exception as e:
+                results.append((None, f"Database error: {str(e.__cause__ or e).splitlines()[0]}"))
+        db.commit()
+        list_cache.invalidate(batch_tags)
+        return results
+
+
+def insert_batch(batch: List[Tuple[int, ArticleCreate]]) -> Tuple[int, List[dict]]:
+    # Returns (inserted count, [{index, error}]) for the bulk import
+    results = insert_each([article for _, article in batch])
+    errors = [
+        {"index": index, "error": error}
+        for (index, _), (_, error) in zip(batch, results) if error is not None
+    ]
+    return len(batch) - len(errors), errors
+
+
+async def import_articles(chunks: AsyncIterator[bytes]) -> dict:
+    # Drives the whole import: parse -> validate -> insert every
+    # BULK_BATCH_SIZE valid records. Database work runs in the threadpool
+    # on the sync engine, so the endpoint behaves the same on both stacks.
+    received = 0
+    inserted = 0
+    failed = 0
+    errors: List[dict] = []
+    batch: List[Tuple[int, ArticleCreate]] = []
+
+    def record_error(index: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.BULK_MAX_ERRORS:
+            errors.append({"index": index, "error": error})
+
+    async def flush() -> None:
+        nonlocal inserted
+        if not batch:
+            return
+        batch_inserted, batch_errors = await run_in_threadpool(insert_batch, list(batch))
+        batch.clear()
+        inserted += batch_inserted
+        for error in batch_errors:
+            record_error(error["index"], error["error"])
+
+    async for index, obj, error in iter_records(chunks):
+        received += 1
+        if error is None:
+            article, error = validate_record(obj)
+        if error is not None:
+            record_error(index, error)
+            continue
+
+        batch.append((index, article))
+        if len(batch) >= settings.BULK_BATCH_SIZE:
+            await flush()
+
+    await flush()
+
+    return {
+        "received": received,
+        "inserted": inserted,
+        "failed": failed,
+        "errors": errors,
+        "errors_truncated": failed > len(errors)
+    }
@@ -0,0 +1,462 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.config import settings
+from app.conditional import REPRESENTATION_VERSION
+from app.logger import logger
+
+
+class LRUCache:
+    # Bounded in-process cache: least recently used entries are evicted
+    # once maxsize is reached, entries older than ttl seconds expire.
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Shared backends store JSON text under string keys, like any networked
+# cache would. InMemoryBackend is the local stand-in used in tests and
+# single-process setups; RedisBackend needs the optional `redis` package.
+class InMemoryBackend:
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def incr(self, key: str) -> int:
+        # counters never expire, like INCR on a key without a TTL
+        with self._lock:
+            entry = self._data.get(key)
+            value = int(entry[0]) + 1 if entry is not None else 1
+            self._data[key] = (str(value), float("inf"))
+            return value
+
+
+class RedisBackend:
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package (pip install redis)") from e
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(key)
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._client.set(key, value, ex=max(int(ttl), 1))
+
+    def delete(self, key: str) -> None:
+        self._client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+
+def make_backend(name: str, url: Optional[str] = None):
+    if not name or name == "none":
+        return None
+    if name == "memory":
+        return InMemoryBackend()
+    if name == "redis":
+        return RedisBackend(url)
+    raise ValueError(f"Unknown CACHE_BACKEND: {name!r}")
+
+
+class ArticleCache:
+    # Read-through cache for single articles (the response "data" dict),
+    # keyed by id: local LRU first, then the optional shared backend.
+    #
+    # Every invalidation bumps a generation number. A reader remembers the
+    # generation before it queries the database and only fills the cache if
+    # nothing was invalidated meanwhile, so a slow read racing an update
+    # can't put the old row back (at worst an unrelated write skips a fill).
+    #
+    # With a shared backend, every worker has its own LRU, and a write only
+    # reaches the LRU of the worker that made it. So each article also has a
+    # version in the shared backend (INCR on invalidation, like the list
+    # page generations). Local and shared entries carry the version they were
+    # read at and are only served while it is still current - one small GET
+    # per local hit instead of serving another worker's stale copy.
+
+    def __init__(self, local: LRUCache, shared=None, shared_ttl: float = 300, prefix: str = "article:"):
+        self.local = local
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.prefix = prefix
+        self._generation = 0
+        self._invalidated_at = 0.0
+        self._lock = threading.Lock()
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+        self.stale = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.maxsize > 0 or self.shared is not None
+
+    def _version(self, id: int) -> Optional[int]:
+        # the article's shared version; None when the backend can't be read
+        try:
+            return int(self.shared.get(f"{self.prefix}ver:{id}") or 0)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache version read failed - ID: {id}, Error: {str(e)}")
+            return None
+
+    def generation(self, id: int) -> Tuple[int, Optional[int]]:
+        # Taken before the database read and handed back to set()
+        with self._lock:
+            generation = self._generation
+        return generation, self._version(id) if self.shared is not None else None
+
+    def get(self, id: int) -> Optional[dict]:
+        if self.shared is None:
+            entry = self.local.get(id)
+            return entry[0] if entry is not None else None
+
+        # an entry is good while the shared version hasn't moved; with the
+        # backend down nothing can be trusted - a miss
+        generation, version = self.generation(id)
+        if version is None:
+            return None
+        entry = self.local.get(id)
+        if entry is not None:
+            if entry[1] == version:
+                return entry[0]
+            # changed on another worker
+            self.stale += 1
+            self.local.delete(id)
+
+        # local miss - try the shared backend, a failing backend is just a miss
+        try:
+            raw = self.shared.get(self.prefix + str(id))
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache get failed - ID: {id}, Error: {str(e)}")
+            return None
+
+        cached = json.loads(raw) if raw is not None else None
+        if cached is None or cached.get("version") != version:
+            self.shared_misses += 1
+            return None
+
+        self.shared_hits += 1
+        # same rule as set(): an invalidation while the shared read was in
+        # flight may have deleted exactly this entry - don't copy it locally
+        with self._lock:
+            if self._generation == generation:
+                self.local.set(id, (cached["data"], version))
+        return cached["data"]
+
+    def set(self, id: int, data: dict, generation: Tuple[int, Optional[int]]) -> None:
+        local_generation, version = generation
+        if self.shared is not None and version is None:
+            return
+        with self._lock:
+            if self._generation != local_generation:
+                return
+            self.local.set(id, (data, version))
+
+        if self.shared is not None:
+            try:
+                self.shared.set(self.prefix + str(id), json.dumps({"version": version, "data": data}), self.shared_ttl)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared cache set failed - ID: {id}, Error: {str(e)}")
+
+    def invalidated_within(self, seconds: float) -> bool:
+        # True if any article was invalidated in the last `seconds`
+        with self._lock:
+            return time.monotonic() - self._invalidated_at < seconds
+
+    def invalidate(self, id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidated_at = time.monotonic()
+            self.local.delete(id)
+
+        if self.shared is not None:
+            try:
+                # the version first - it is what makes every copy stale
+                self.shared.incr(f"{self.prefix}ver:{id}")
+                self.shared.delete(self.prefix + str(id))
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared cache invalidation failed - ID: {id}, Error: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "shared": None if self.shared is None else {
+                "backend": type(self.shared).__name__,
+                "stale_local": self.stale,
+                "hits": self.shared_hits,
+                "misses": self.shared_misses,
+                "errors": self.shared_errors,
+            },
+        }
+
+
+class ListPageCache:
+    # Rendered list pages (ETag + response body) for the first pages of
+    # GET /api/v1/articles, keyed by the request's filters and paging.
+    #
+    # Nothing is ever deleted on writes. Each key embeds generation numbers:
+    # the global one for unfiltered (and author/date) pages, one per tag for
+    # tag pages. A write bumps the global generation and those of the tags
+    # it touched, so the next read builds a new key and stale pages simply
+    # age out of the LRU/TTL. With a shared backend the generations live
+    # there too (INCR), so every worker sees every other worker's writes.
+    #
+    # Stampede protection: the first request to miss a key computes the
+    # page, concurrent misses for the same key wait for it (up to
+    # STAMPEDE_WAIT seconds) instead of running the same queries.
+
+    STAMPEDE_WAIT = 5.0
+    GLOBAL_SCOPE = "all"
+
+    def __init__(self, local: LRUCache, shared=None, shared_ttl: float = 30, prefix: str = "list:"):
+        self.local = local
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.prefix = prefix
+        self._generations: Dict[str, int] = {}
+        self._invalidated_at = 0.0
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._ainflight: Dict[str, asyncio.Event] = {}
+        self.shared_errors = 0
+        self.waits = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.local.maxsize > 0 or self.shared is not None
+
+    def _generation(self, scope: str) -> Optional[int]:
+        if self.shared is None:
+            with self._lock:
+                return self._generations.get(scope, 0)
+        try:
+            return int(self.shared.get(f"{self.prefix}gen:{scope}") or 0)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache generation read failed - Scope: {scope}, Error: {str(e)}")
+            return None
+
+    def key(self, tags: Optional[List[str]], params: str) -> Optional[str]:
+        # tags: the page's tag filter when it is the only filter (per-tag
+        # generations), None for every other page (global generation).
+        # None = don't cache (generation unknown).
+        scopes = [f"tag:{tag}" for tag in sorted(tags)] if tags else [self.GLOBAL_SCOPE]
+        parts = []
+        for scope in scopes:
+            generation = self._generation(scope)
+            if generation is None:
+                return None
+            parts.append(f"{scope}@{generation}")
+        digest = hashlib.sha1(params.encode()).hexdigest()[:20]
+        return f"{self.prefix}{','.join(parts)}:{digest}"
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        page = self.local.get(key)
+        if page is not None or self.shared is None:
+            return page
+        try:
+            raw = self.shared.get(key)
+        except Exception as e:
+            self.shared_errors += 1
+            logger.warning(f"Shared cache get failed - Key: {key}, Error: {str(e)}")
+            return None
+        if raw is None:
+            return None
+        etag, _, body = raw.partition("\n")
+        page = (etag, body.encode())
+        self.local.set(key, page)
+        return page
+
+    def set(self, key: str, etag: str, body: bytes) -> None:
+        self.local.set(key, (etag, body))
+        if self.shared is not None:
+            try:
+                self.shared.set(key, f"{etag}\n{body.decode()}", self.shared_ttl)
+            except Exception as e:
+                self.shared_errors += 1
+                logger.warning(f"Shared cache set failed - Key: {key}, Error: {str(e)}")
+
+    def claim(self, key: str) -> Optional[Tuple[str, bytes]]:
+        # Sync handlers (threadpool). Returns the cached page, or None when
+        # the caller should compute it - and then call release(key).
+        while True:
+            page = self.get(key)
+            if page is not None:
+                return page
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    self._inflight[key] = threading.Event()
+                    return None
+                self.waits += 1
+            if not event.wait(self.STAMPEDE_WAIT):
+                return None
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def aclaim(self, key: str) -> Optional[Tuple[str, bytes]]:
+        # claim() for async handlers - waits on the event loop
+        while True:
+            page = self.get(key)
+            if page is not None:
+                return page
+            event = self._ainflight.get(key)
+            if event is None:
+                self._ainflight[key] = asyncio.Event()
+                return None
+            self.waits += 1
+            try:
+                await asyncio.wait_for(event.wait(), self.STAMPEDE_WAIT)
+            except asyncio.TimeoutError:
+                return None
+
+    def arelease(self, key: str) -> None:
+        event = self._ainflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def invalidated_within(self, seconds: float) -> bool:
+        with self._lock:
+            return time.monotonic() - self._invalidated_at < seconds
+
+    def invalidate(self, tags: Iterable[str] = ()) -> None:
+        # After a committed write: every list changed, and so did the
+        # pages of each tag the written articles had before or after
+        scopes = [self.GLOBAL_SCOPE] + [f"tag:{tag}" for tag in set(tags)]
+        with self._lock:
+            self._invalidated_at = time.monotonic()
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+        if self.shared is not None:
+            for scope in scopes:
+                try:
+                    self.shared.incr(f"{self.prefix}gen:{scope}")
+                except Exception as e:
+                    self.shared_errors += 1
+                    logger.warning(f"Shared cache generation bump failed - Scope: {scope}, Error: {str(e)}")
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "stampede_waits": self.waits,
+            "shared": None if self.shared is None else {
+                "backend": type(self.shared).__name__,
+                "errors": self.shared_errors,
+            },
+        }
+
+
+# one connection/store for both caches
+shared_backend = make_backend(settings.CACHE_BACKEND, settings.CACHE_URL)
+
+# the prefix carries the representation version, so a release that changes
+# the article JSON never reads entries written by the previous one ("e2":
+# shared entries are {version, data}, no longer the bare data)
+article_cache = ArticleCache(
+    LRUCache(maxsize=settings.ARTICLE_CACHE_SIZE, ttl=settings.ARTICLE_CACHE_TTL),
+    shared=shared_backend,
+    shared_ttl=settings.SHARED_CACHE_TTL,
+    prefix=f"article:v{REPRESENTATION_VERSION}:e2:"
+)
+
+list_cache = ListPageCache(
+    LRUCache(maxsize=settings.LIST_CACHE_SIZE, ttl=settings.LIST_CACHE_TTL),
+    shared=shared_backend,
+    shared_ttl=settings.LIST_CACHE_TTL,
+    prefix=f"list:v{REPRESENTATION_VERSION}:"
+)
@@ -0,0 +1,252 @@
+import gzip
+from typing import Callable, Dict, List, Optional
+import anyio
+from app.config import settings
+from app.cache import LRUCache
+from app.metrics import COMPRESSED_RESPONSES, COMPRESSION_BYTES
+from app.logger import logger
+
+# Negotiated response compression (Accept-Encoding: zstd, br, gzip).
+#
+# CompressionMiddleware buffers complete responses (JSONResponse and
+# friends send their body in one message) of a compressible media type and
+# at least COMPRESSION_MIN_SIZE bytes, and compresses them with the best
+# encoding both sides support. Streaming responses pass through untouched -
+# the export endpoint compresses its own stream.
+#
+# CPU is bounded three ways: moderate default levels, bodies above
+# INLINE_LIMIT are compressed in worker threads capped at
+# COMPRESSION_MAX_CONCURRENCY (when all are busy the response goes out
+# uncompressed rather than queueing), and hot responses are served from a
+# cache of compressed bytes instead of being compressed again.
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# smaller bodies compress in microseconds - not worth a thread hop
+INLINE_LIMIT = 64 * 1024
+
+
+def _gzip_codec(level: int) -> Callable[[bytes], bytes]:
+    # mtime=0 keeps the output deterministic for a given body
+    return lambda data: gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _brotli_codec(quality: int) -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return lambda data: brotli.compress(data, quality=quality)
+
+
+def _zstd_codec(level: int) -> Optional[Callable[[bytes], bytes]]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    # a ZstdCompressor must not be shared between threads - one per call
+    return lambda data: zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def load_codecs(names: List[str]) -> Dict[str, Callable[[bytes], bytes]]:
+    # Encodings in server preference order. br and zstd need the `brotli` /
+    # `zstandard` packages (requirements.txt); an install without them
+    # skips those encodings with a warning and negotiates the rest.
+    factories = {
+        "gzip": lambda: _gzip_codec(settings.COMPRESSION_GZIP_LEVEL),
+        "br": lambda: _brotli_codec(settings.COMPRESSION_BROTLI_QUALITY),
+        "zstd": lambda: _zstd_codec(settings.COMPRESSION_ZSTD_LEVEL),
+    }
+    codecs = {}
+    for name in names:
+        if name not in factories:
+            raise ValueError(f"Unknown compression encoding: {name!r}")
+        codec = factories[name]()
+        if codec is None:
+            logger.warning(f"Compression: {name} unavailable (package not installed), skipped")
+            continue
+        codecs[name] = codec
+    return codecs
+
+
+def accepted_encodings(header: str) -> Dict[str, float]:
+    # Accept-Encoding -> {coding: q}; "*" stands for anything not listed
+    accepted = {}
+    for coding in header.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def accepts(header: str, encoding: str) -> bool:
+    accepted = accepted_encodings(header)
+    return accepted.get(encoding, accepted.get("*", 0.0)) > 0
+
+
+def negotiate(header: str, available) -> Optional[str]:
+    # Highest q wins; ties go to the server's preference order
+    accepted = accepted_encodings(header)
+    best, best_q = None, 0.0
+    for name in available:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressionMiddleware:
+    # Plain ASGI middleware, like MetricsMiddleware
+
+    def __init__(self, app, codecs: Dict[str, Callable[[bytes], bytes]], min_size: int,
+                 max_concurrency: int, cache: LRUCache):
+        self.app = app
+        self.codecs = codecs
+        self.min_size = min_size
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        # keys seen once - a response is cached on its second request, so
+        # one-off pages (deep offsets, rare filters) don't evict hot ones
+        self._seen = LRUCache(maxsize=cache.maxsize * 4, ttl=cache.ttl)
+        self._limiter = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.codecs:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        encoding = negotiate(headers.get(b"accept-encoding", b"").decode("latin-1"), self.codecs)
+        if encoding is None:
+            # nothing acceptable - still mark compressible responses as varying
+            async def send_vary(message):
+                if message["type"] == "http.response.start" and _compressible(message):
+                    message = _with_vary(message)
+                await send(message)
+
+            await self.app(scope, receive, send_vary)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                if not _compressible(message):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+
+            if message.get("more_body", False):
+                # streaming - send as is
+                passthrough = True
+                await send(_with_vary(start))
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            await self._send_body(scope, start, body, encoding, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_body(self, scope, start, body: bytes, encoding: str, send) -> None:
+        if len(body) < self.min_size:
+            await send(_with_vary(start))
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        response_headers = dict(start.get("headers", []))
+        etag = response_headers.get(b"etag")
+        key = None
+        if scope["method"] == "GET" and start["status"] == 200 and etag:
+            # the ETag pins the body, the URL pins the parts of it the ETag
+            # doesn't cover (page number, count mode)
+            key = (scope["path"], scope.get("query_string", b""), etag, encoding)
+
+        compressed = self.cache.get(key) if key else None
+        if compressed is not None:
+            COMPRESSED_RESPONSES.inc(encoding, "cache")
+        else:
+            compressed = await self._compress(body, encoding)
+            if compressed is None:
+                await send(_with_vary(start))
+                await send({"type": "http.response.body", "body": body})
+                return
+            if key:
+                if self._seen.get(key) is not None:
+                    self.cache.set(key, compressed)
+                else:
+                    self._seen.set(key, True)
+
+        COMPRESSION_BYTES.inc(encoding, "in", amount=len(body))
+        COMPRESSION_BYTES.inc(encoding, "out", amount=len(compressed))
+
+        headers = [
+            (name, value) for name, value in start.get("headers", [])
+            if name not in (b"content-length", b"etag")
+        ]
+        headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"content-length", str(len(compressed)).encode()))
+        if etag:
+            # a different byte sequence may not share a strong validator -
+            # weaken it, If-None-Match already uses weak comparison
+            headers.append((b"etag", etag if etag.startswith(b"W/") else b"W/" + etag))
+
+        await send(_with_vary({**start, "headers": headers}))
+        await send({"type": "http.response.body", "body": compressed})
+
+    async def _compress(self, body: bytes, encoding: str) -> Optional[bytes]:
+        # None = not worth it (no smaller) or no compression thread free
+        codec = self.codecs[encoding]
+        if len(body) <= INLINE_LIMIT:
+            compressed = codec(body)
+        else:
+            if self._limiter is None:
+                self._limiter = anyio.CapacityLimiter(max(self.max_concurrency, 1))
+            if self._limiter.available_tokens <= 0:
+                COMPRESSED_RESPONSES.inc(encoding, "skipped_busy")
+                return None
+            compressed = await anyio.to_thread.run_sync(codec, body, limiter=self._limiter)
+
+        if len(compressed) >= len(body):
+            return None
+        COMPRESSED_RESPONSES.inc(encoding, "compressed")
+        return compressed
+
+
+def _compressible(start: dict) -> bool:
+    headers = dict(start.get("headers", []))
+    content_type = headers.get(b"content-type", b"").decode("latin-1")
+    return b"content-encoding" not in headers and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _with_vary(start: dict) -> dict:
+    # The body depends on Accept-Encoding whether or not this one was compressed
+    headers = list(start.get("headers", []))
+    for i, (name, value) in enumerate(headers):
+        if name == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[i] = (name, value + b", Accept-Encoding")
+            return {**start, "headers": headers}
+    headers.append((b"vary", b"Accept-Encoding"))
+    return {**start, "headers": headers}
+
+
+compressed_cache = LRUCache(maxsize=settings.COMPRESSION_CACHE_SIZE, ttl=settings.COMPRESSION_CACHE_TTL)
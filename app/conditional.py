@@ -0,0 +1,87 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Tuple
+from fastapi import Request, Response
+
+# Bump when the JSON representation of articles changes, so validators
+# issued by an older release stop matching
+REPRESENTATION_VERSION = "2"
+
+
+def _timestamp(value: Optional[datetime]) -> str:
+    # naive datetimes are UTC here - never let the server timezone leak in,
+    # or two hosts would issue different ETags for the same row
+    if value is None:
+        return "0"
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return f"{value.timestamp():.6f}"
+
+
+def article_etag(id: int, updated_at: Optional[datetime]) -> str:
+    # Strong validator - every write to an article bumps updated_at
+    return f'"a{id}-{_timestamp(updated_at)}-v{REPRESENTATION_VERSION}"'
+
+
+def list_etag(items: Iterable[Tuple[int, Optional[datetime]]], total: Optional[int], has_more: bool, variant: str = "") -> str:
+    # Weak validator for a list page: which articles are on it, their
+    # versions, the pagination meta around them and the item shape (variant)
+    digest = hashlib.sha1(f"{REPRESENTATION_VERSION}|{variant}|".encode())
+    for id, updated_at in items:
+        digest.update(f"{id}:{_timestamp(updated_at)};".encode())
+    digest.update(f"total={total};more={has_more}".encode())
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def http_date(value: datetime) -> str:
+    # updated_at is stored as naive UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value, usegmt=True)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((tag[2:] if tag.startswith("W/") else tag) == bare for tag in candidates)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    # If-None-Match wins over If-Modified-Since when both are sent (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified if last_modified.tzinfo else last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have second precision
+        return modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def has_conditional_headers(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    # no-cache: caches may store the response but must revalidate it
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
@@ -11,10 +11,130 @@ load_dotenv(dotenv_path=env_path)
 class Settings:
     # database configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # connection pool (QueuePool) - size it against the number of workers:
+    # serve.py caps workers so that workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # (twice that with ASYNC_DB) stays within DB_CONNECTION_BUDGET
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "True") == "True"
+    # connections opened per pool at startup, before /ready reports ready,
+    # so the first requests don't pay for connection setup (0 disables)
+    DB_POOL_WARMUP: int = int(os.getenv("DB_POOL_WARMUP", os.getenv("DB_POOL_SIZE", 5)))
+    # /ready also waits for the database to be at the latest Alembic
+    # revision - turn off for databases made with create_all (create_db.py)
+    READY_REQUIRE_MIGRATIONS: bool = os.getenv("READY_REQUIRE_MIGRATIONS", "True") == "True"
+    # log every SQL statement (slow, development only)
+    DB_ECHO: bool = os.getenv("DB_ECHO", "False") == "True"
+    # single-article read-through cache (0 disables the in-process LRU).
+    # serve.py with several workers and no shared (redis) backend caps the
+    # TTL at ARTICLE_CACHE_WORKERS_TTL - a write can't reach the other
+    # workers' LRUs, this is how long they may serve the old article
+    ARTICLE_CACHE_SIZE: int = int(os.getenv("ARTICLE_CACHE_SIZE", 1000))
+    ARTICLE_CACHE_TTL: float = float(os.getenv("ARTICLE_CACHE_TTL", 60))
+    ARTICLE_CACHE_WORKERS_TTL: float = float(os.getenv("ARTICLE_CACHE_WORKERS_TTL", 2))
+    # list page cache - the first LIST_CACHE_MAX_PAGE pages of every
+    # filter combination (0 entries disables it)
+    LIST_CACHE_SIZE: int = int(os.getenv("LIST_CACHE_SIZE", 500))
+    LIST_CACHE_TTL: float = float(os.getenv("LIST_CACHE_TTL", 30))
+    LIST_CACHE_MAX_PAGE: int = int(os.getenv("LIST_CACHE_MAX_PAGE", 3))
+    # optional shared cache: "none", "memory" (local stand-in) or "redis"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "none")
+    CACHE_URL: str = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+    SHARED_CACHE_TTL: float = float(os.getenv("SHARED_CACHE_TTL", 300))
+    # characters of content in list excerpts (view=summary / fields=excerpt)
+    EXCERPT_LENGTH: int = int(os.getenv("EXCERPT_LENGTH", 200))
+    # article bodies (article_bodies table, see app/bodies.py) - codec for
+    # new bodies: "zstd" (zstandard package - startup fails without it),
+    # "zlib" or "plain"; compression level, and the size in bytes below
+    # which bodies are stored uncompressed
+    BODY_CODEC: str = os.getenv("BODY_CODEC", "zstd")
+    BODY_COMPRESSION_LEVEL: int = int(os.getenv("BODY_COMPRESSION_LEVEL", 6))
+    BODY_COMPRESS_MIN_SIZE: int = int(os.getenv("BODY_COMPRESS_MIN_SIZE", 256))
+    # text search configuration used for the Postgres full-text index
+    SEARCH_LANGUAGE: str = os.getenv("SEARCH_LANGUAGE", "english")
+    # POST /api/v1/articles/bulk - rows per INSERT batch, max failures listed
+    # in the response, max size of a single JSON record
+    BULK_BATCH_SIZE: int = int(os.getenv("BULK_BATCH_SIZE", 1000))
+    BULK_MAX_ERRORS: int = int(os.getenv("BULK_MAX_ERRORS", 1000))
+    BULK_MAX_RECORD_BYTES: int = int(os.getenv("BULK_MAX_RECORD_BYTES", 1_000_000))
+    # GET /api/v1/articles/export - rows per server-side cursor fetch, gzip level
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 2000))
+    EXPORT_GZIP_LEVEL: int = int(os.getenv("EXPORT_GZIP_LEVEL", 6))
+    # group commit for POST /api/v1/articles - concurrent creates wait up to
+    # GROUP_COMMIT_WINDOW_MS (or until GROUP_COMMIT_MAX_BATCH are pending)
+    # and are inserted in one transaction
+    GROUP_COMMIT: bool = os.getenv("GROUP_COMMIT", "False") == "True"
+    GROUP_COMMIT_WINDOW_MS: float = float(os.getenv("GROUP_COMMIT_WINDOW_MS", 5))
+    GROUP_COMMIT_MAX_BATCH: int = int(os.getenv("GROUP_COMMIT_MAX_BATCH", 100))
+    # request/SQL metrics on /metrics; requests slower than SLOW_REQUEST_MS
+    # are logged with the SQL they ran (0 disables the slow request log)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True") == "True"
+    SLOW_REQUEST_MS: float = float(os.getenv("SLOW_REQUEST_MS", 0))
+    SLOW_REQUEST_MAX_SQL: int = int(os.getenv("SLOW_REQUEST_MAX_SQL", 50))
+    # response compression - encodings in preference order (br and zstd use
+    # the brotli / zstandard packages from requirements.txt), smallest body worth it,
+    # levels, compression threads for large bodies, and the cache of
+    # compressed bytes for hot responses (entries, seconds)
+    COMPRESSION_ENABLED: bool = os.getenv("COMPRESSION_ENABLED", "True") == "True"
+    COMPRESSION_ENCODINGS: str = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", 5))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+    COMPRESSION_MAX_CONCURRENCY: int = int(os.getenv("COMPRESSION_MAX_CONCURRENCY", 4))
+    COMPRESSION_CACHE_SIZE: int = int(os.getenv("COMPRESSION_CACHE_SIZE", 500))
+    COMPRESSION_CACHE_TTL: float = float(os.getenv("COMPRESSION_CACHE_TTL", 300))
+    # admission control for /api requests (app/admission.py) - requests in
+    # flight per class (reads: GET/HEAD, writes: the rest; 0 = split
+    # DB_POOL_SIZE + DB_MAX_OVERFLOW, a third for writes), how many more may
+    # wait and for how long before a 503 with Retry-After (seconds). With
+    # GROUP_COMMIT, creates are a class of their own, ADMISSION_CREATE_LIMIT
+    # in flight (0 = GROUP_COMMIT_MAX_BATCH - parked creates hold no connection)
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "True") == "True"
+    ADMISSION_READ_LIMIT: int = int(os.getenv("ADMISSION_READ_LIMIT", 0))
+    ADMISSION_WRITE_LIMIT: int = int(os.getenv("ADMISSION_WRITE_LIMIT", 0))
+    ADMISSION_CREATE_LIMIT: int = int(os.getenv("ADMISSION_CREATE_LIMIT", 0))
+    ADMISSION_READ_QUEUE: int = int(os.getenv("ADMISSION_READ_QUEUE", 20))
+    ADMISSION_WRITE_QUEUE: int = int(os.getenv("ADMISSION_WRITE_QUEUE", 10))
+    ADMISSION_QUEUE_TIMEOUT_MS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", 250))
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+    # read replicas - comma-separated URLs; GET handlers read from them
+    # round-robin, writes go to DATABASE_URL. After a write, the client
+    # reads from the primary for READ_YOUR_WRITES_SECONDS (sticky cookie).
+    REPLICA_DATABASE_URLS: str = os.getenv("REPLICA_DATABASE_URLS", "")
+    REPLICA_HEALTH_INTERVAL: float = float(os.getenv("REPLICA_HEALTH_INTERVAL", 10))
+    READ_YOUR_WRITES_SECONDS: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    # optional monthly partitioning of articles (Postgres, see
+    # partition_articles.py) - partitions created ahead of time at startup,
+    # and where / after how many months the cold archive moves old months
+    PARTITION_MONTHS_AHEAD: int = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+    ARCHIVE_DIR: str = os.getenv("ARCHIVE_DIR", "archive")
+    ARCHIVE_AFTER_MONTHS: int = int(os.getenv("ARCHIVE_AFTER_MONTHS", 24))
+    # async stack - serve the articles API from SQLAlchemy's asyncio engine
+    # (asyncpg on Postgres, aiosqlite on SQLite) instead of the threadpool
+    ASYNC_DB: bool = os.getenv("ASYNC_DB", "False") == "True"
+    # optional explicit async URL, otherwise derived from DATABASE_URL
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL")
     
     # app configuration
     APP_NAME : str = "My Professional Blog API"
     DEBUG: bool = os.getenv("DEBUG_MODE", "False") == "True"
     PORT: int = int(os.getenv("APP_PORT", 8000))
+    HOST: str = os.getenv("APP_HOST", "0.0.0.0")
+    # production launcher (serve.py, gunicorn + uvicorn workers) - WEB_WORKERS=0
+    # means one per CPU core; either way capped by DB_CONNECTION_BUDGET, the
+    # connections all workers together may open (Postgres max_connections
+    # minus superuser_reserved_connections and what other clients need)
+    WEB_WORKERS: int = int(os.getenv("WEB_WORKERS", 0))
+    DB_CONNECTION_BUDGET: int = int(os.getenv("DB_CONNECTION_BUDGET", 80))
+    # seconds a silent worker may run before it's killed, and a stopping
+    # worker gets to finish its requests; workers are replaced after
+    # WORKER_MAX_REQUESTS (+ random jitter) requests (0 = never)
+    WORKER_TIMEOUT: int = int(os.getenv("WORKER_TIMEOUT", 60))
+    WORKER_GRACEFUL_TIMEOUT: int = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", 30))
+    WORKER_MAX_REQUESTS: int = int(os.getenv("WORKER_MAX_REQUESTS", 10000))
+    WORKER_MAX_REQUESTS_JITTER: int = int(os.getenv("WORKER_MAX_REQUESTS_JITTER", 1000))
     
 settings=Settings()
\ No newline at end of file
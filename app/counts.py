@@ -0,0 +1,135 @@
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, func, insert, literal, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models import Article, ArticleCounter, ArticleTag, TagCount
+from app.logger import logger
+
+# name of the ArticleCounter row holding the total number of articles
+TOTAL_COUNTER = "articles"
+
+
+def tag_deltas(added: Iterable[str] = (), removed: Iterable[str] = ()) -> Dict[str, int]:
+    deltas: Dict[str, int] = {}
+    for tag in added:
+        deltas[tag] = deltas.get(tag, 0) + 1
+    for tag in removed:
+        deltas[tag] = deltas.get(tag, 0) - 1
+    return {tag: delta for tag, delta in deltas.items() if delta}
+
+
+def _upsert_add(db: Session, model, key_column: str, value_column: str, deltas: Dict[str, int]) -> None:
+    # "value = value + delta", creating missing rows, in one statement
+    # on Postgres/SQLite and as update-then-insert everywhere else
+    if not deltas:
+        return
+
+    rows = [{key_column: key, value_column: delta} for key, delta in deltas.items()]
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key_column],
+            set_={value_column: getattr(model, value_column) + getattr(stmt.excluded, value_column)}
+        )
+        db.execute(stmt)
+        return
+
+    key_attr, value_attr = getattr(model, key_column), getattr(model, value_column)
+    for key, delta in deltas.items():
+        result = db.execute(
+            update(model).where(key_attr == key).values({value_column: value_attr + delta})
+        )
+        if result.rowcount == 0:
+            db.add(model(**{key_column: key, value_column: delta}))
+
+
+def adjust_counts(db: Session, total_delta: int = 0, tag_delta: Optional[Dict[str, int]] = None) -> None:
+    # Must run inside the same transaction as the article write it accounts for,
+    # so counters and rows commit (or roll back) together
+    if total_delta:
+        _upsert_add(db, ArticleCounter, "name", "value", {TOTAL_COUNTER: total_delta})
+    if tag_delta:
+        _upsert_add(db, TagCount, "tag", "article_count", tag_delta)
+
+
+def counter_total_expr(tag: Optional[str] = None):
+    # Scalar subquery reading the maintained counter, so the total can ride
+    # along with the page query instead of costing its own round trip
+    if tag:
+        stmt = select(TagCount.article_count).where(TagCount.tag == tag)
+    else:
+        stmt = select(ArticleCounter.value).where(ArticleCounter.name == TOTAL_COUNTER)
+    return func.coalesce(stmt.scalar_subquery(), 0)
+
+
+def counter_total(db: Session, tag: Optional[str] = None) -> int:
+    return db.execute(select(counter_total_expr(tag))).scalar_one()
+
+
+def estimate_total(db: Session, query, filtered: bool) -> Optional[int]:
+    # Planner estimate - Postgres only, returns None elsewhere so callers
+    # can fall back to the maintained counter
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    try:
+        if not filtered:
+            # reltuples is kept up to date by VACUUM/ANALYZE (-1 = never analyzed)
+            estimate = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'articles'::regclass")
+            ).scalar()
+            return max(int(estimate), 0) if estimate is not None else None
+
+        # accepts a legacy Query or a 2.0 select()
+        statement = query.statement if hasattr(query, "statement") else query
+        compiled = statement.compile(dialect=bind.dialect)
+        plan = db.connection().exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+        ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    except Exception as e:
+        logger.warning(f"Count estimate failed, falling back to counter - Error: {str(e)}")
+        return None
+
+
+def list_tags(db: Session, prefix: Optional[str] = None, limit: Optional[int] = None, order: str = "count") -> List[dict]:
+    # Tag catalogue straight from tag_counts - never touches articles.
+    # order: "count" (most used first, ties by name) or "name".
+    # Tags whose count dropped to zero are kept as rows but not listed.
+    stmt = select(TagCount.tag, TagCount.article_count).where(TagCount.article_count > 0)
+    if prefix:
+        stmt = stmt.where(TagCount.tag.startswith(prefix, autoescape=True))
+    if order == "name":
+        stmt = stmt.order_by(TagCount.tag)
+    else:
+        stmt = stmt.order_by(TagCount.article_count.desc(), TagCount.tag)
+    if limit:
+        stmt = stmt.limit(limit)
+    return [{"tag": tag, "count": count} for tag, count in db.execute(stmt).all()]
+
+
+def rebuild_counts(db: Session) -> Dict[str, int]:
+    # Drift repair: recompute every counter from articles / article_tags.
+    # Runs in the caller's transaction, so readers see the old or the new
+    # counts, never an empty table in between.
+    db.execute(delete(ArticleCounter).where(ArticleCounter.name == TOTAL_COUNTER))
+    db.execute(insert(ArticleCounter).from_select(
+        ["name", "value"],
+        select(literal(TOTAL_COUNTER), func.count()).select_from(Article)
+    ))
+
+    db.execute(delete(TagCount))
+    db.execute(insert(TagCount).from_select(
+        ["tag", "article_count"],
+        select(ArticleTag.tag, func.count()).group_by(ArticleTag.tag)
+    ))
+
+    total = counter_total(db)
+    tags = db.execute(select(func.count()).select_from(TagCount)).scalar_one()
+    logger.info(f"Rebuilt counters - {total} articles, {tags} tags")
+    return {"articles": total, "tags": tags}
@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from app.database import engine, Base
 from app import models  
+from app import search  # creates the full-text search index alongside the tables
 
 print("Creating tables if they don't exist...")
 Base.metadata.create_all(bind=engine)
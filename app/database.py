@@ -1,30 +1,195 @@
-import os
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from app.config import settings
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from fastapi import Request
+from typing import Optional
+from app.config import Settings, settings
+from app.pool_stats import PoolStats, instrumented_pool_class, attach_pool_listeners
+from app.metrics import attach_query_listeners
+from app.replicas import ReplicaSet, prefers_primary, replica_urls
 from app.logger import logger 
 
-load_dotenv()  
+# Engines are created on first use, not at import: importing the models
+# (Alembic, scripts, tests) opens nothing and doesn't need DATABASE_URL.
+# The app creates them in its lifespan (create_app in app/main.py), the
+# session dependencies and SessionLocal on first use, and scripts through
+# `from app.database import engine`, which goes through __getattr__ below.
+# Engines are per process - the first settings to create them win.
 
+_init_lock = threading.Lock()
+_initialized = False
 
-DATABASE_URL = os.getenv("DATABASE_URL")
-logger.info(f"Using DATABASE_URL from env: {DATABASE_URL}")
+# module attributes set by init_engines()
+_ENGINE_ATTRIBUTES = (
+    "DATABASE_URL", "engine", "pool_stats", "replica_set", "ReplicaSessionLocals",
+    "async_engine", "AsyncSessionLocal", "AsyncReplicaSessionLocals", "async_replica_engines"
+)
 
-if not DATABASE_URL:
-    logger.error("No DATABASE_URL found! Falling back or raising error.")
-    raise ValueError("DATABASE_URL environment variable is required!")
 
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,                  
-)
+def engine_options(url, pool_class, stats: PoolStats, config: Settings = settings) -> dict:
+    # Pool sizing/echo from settings. In-memory SQLite keeps SQLAlchemy's
+    # default single-connection pool - a QueuePool would give every
+    # connection its own empty database.
+    url = make_url(url)
+    options = {"echo": config.DB_ECHO}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=instrumented_pool_class(pool_class, stats),
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+# SQLite ignores foreign keys (and ON DELETE CASCADE) unless asked per connection
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _create_sync_engine(url, stats: PoolStats, config: Settings = settings):
+    sync_engine = create_engine(url, **engine_options(url, QueuePool, stats, config))
+    attach_pool_listeners(sync_engine, stats)
+    attach_query_listeners(sync_engine)
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _enable_sqlite_foreign_keys)
+    return sync_engine
+
+
+def _create_async_engine(url, stats: PoolStats, config: Settings = settings):
+    new_engine = create_async_engine(url, **engine_options(url, AsyncAdaptedQueuePool, stats, config))
+    attach_pool_listeners(new_engine.sync_engine, stats)
+    attach_query_listeners(new_engine.sync_engine)
+    if new_engine.dialect.name == "sqlite":
+        event.listen(new_engine.sync_engine, "connect", _enable_sqlite_foreign_keys)
+    return new_engine
+
+
+def init_engines(config: Settings = settings) -> None:
+    # Create the primary engine, the replicas and the async stack. Safe to
+    # call from anywhere, any number of times - only the first call works.
+    global _initialized, DATABASE_URL, engine, pool_stats, replica_set, ReplicaSessionLocals
+    global async_engine, AsyncSessionLocal, AsyncReplicaSessionLocals, async_replica_engines
+    if _initialized:
+        return
+    with _init_lock:
+        if _initialized:
+            return
+
+        if not config.DATABASE_URL:
+            logger.error("No DATABASE_URL found! Falling back or raising error.")
+            raise ValueError("DATABASE_URL environment variable is required!")
+        DATABASE_URL = config.DATABASE_URL
+        logger.info(f"Using DATABASE_URL from env: {make_url(DATABASE_URL).render_as_string(hide_password=True)}")
+
+        pool_stats = PoolStats("primary")
+        engine = _create_sync_engine(DATABASE_URL, pool_stats, config)
+
+        # Read replicas (REPLICA_DATABASE_URLS) - sessions are tagged
+        # info["replica"] so callers can tell where their data came from
+        urls = replica_urls(config)
+        replica_set = None
+        ReplicaSessionLocals = []
+        if urls:
+            logger.info(f"Read replicas enabled - {len(urls)} replica(s)")
+            replica_set = ReplicaSet(
+                [_create_sync_engine(url, PoolStats(f"replica{i}"), config) for i, url in enumerate(urls)],
+                health_interval=config.REPLICA_HEALTH_INTERVAL
+            )
+            ReplicaSessionLocals = [
+                sessionmaker(autocommit=False, autoflush=False, bind=replica_engine, info={"replica": True})
+                for replica_engine in replica_set.engines
+            ]
+
+        # Async stack (ASYNC_DB) - same database, asyncio driver
+        async_engine = None
+        AsyncSessionLocal = None
+        AsyncReplicaSessionLocals = []
+        async_replica_engines = []
+        if config.ASYNC_DB:
+            async_url = config.ASYNC_DATABASE_URL or make_async_url(DATABASE_URL)
+            logger.info(f"Async stack enabled - driver: {make_url(async_url).drivername}")
+            async_engine = _create_async_engine(async_url, PoolStats("async"), config)
+
+            # expire_on_commit=False: attributes stay readable after commit
+            # without an implicit (and in asyncio, forbidden) lazy load
+            AsyncSessionLocal = async_sessionmaker(
+                bind=async_engine,
+                class_=AsyncSession,
+                autoflush=False,
+                expire_on_commit=False
+            )
+
+            # async twins of the replica engines, same index as replica_set.engines
+            # (health is tracked on the sync engines)
+            for i, url in enumerate(urls):
+                async_replica_engine = _create_async_engine(make_async_url(url), PoolStats(f"async-replica{i}"), config)
+                async_replica_engines.append(async_replica_engine)
+                AsyncReplicaSessionLocals.append(async_sessionmaker(
+                    bind=async_replica_engine,
+                    class_=AsyncSession,
+                    autoflush=False,
+                    expire_on_commit=False,
+                    info={"replica": True}
+                ))
+
+        _initialized = True
+
+
+def __getattr__(name):
+    # `from app.database import engine` (and the other engine attributes)
+    # creates the engines on first access
+    if name in _ENGINE_ATTRIBUTES:
+        init_engines()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_engine():
+    init_engines()
+    return engine
+
+
+def engines_initialized() -> bool:
+    return _initialized
+
+
+async def dispose_engines() -> None:
+    # Close pooled connections (server shutdown). The engines stay usable -
+    # they reconnect on the next checkout.
+    if not _initialized:
+        return
+    if async_engine is not None:
+        await async_engine.dispose()
+    for async_replica_engine in async_replica_engines:
+        await async_replica_engine.dispose()
+    if replica_set is not None:
+        for replica_engine in replica_set.engines:
+            replica_engine.dispose()
+    engine.dispose()
+
+
+class _PrimarySession(Session):
+    # SessionLocal() sessions bind to the primary engine, creating it if need be
+    def __init__(self, bind=None, **kw):
+        super().__init__(bind=bind if bind is not None else get_engine(), **kw)
+
 
 SessionLocal = sessionmaker(
+    class_=_PrimarySession,
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
 )
 
 Base = declarative_base()
@@ -36,3 +201,74 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def pick_replica(request) -> Optional[int]:
+    # None = use the primary (no replicas, all unhealthy, or the client
+    # wrote recently and must read its own writes)
+    init_engines()
+    if replica_set is None or prefers_primary(request.cookies):
+        return None
+    return replica_set.pick()
+
+
+def read_engine(request):
+    index = pick_replica(request)
+    return engine if index is None else replica_set.engines[index]
+
+
+# Read-only session dependency for GET handlers. The replica connection
+# is checked out up front: if it fails, the replica is marked unhealthy
+# (handle_error listener) and this request falls back to the primary.
+def get_read_db(request: Request):
+    index = pick_replica(request)
+    db = SessionLocal() if index is None else ReplicaSessionLocals[index]()
+    if index is not None:
+        try:
+            db.connection()
+        except OperationalError:
+            db.close()
+            db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Async stack (settings.ASYNC_DB) - same database, asyncio driver
+def make_async_url(url: str):
+    # postgresql:// -> postgresql+asyncpg://, sqlite:// -> sqlite+aiosqlite://
+    url = make_url(url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        return url.set(drivername="postgresql+asyncpg")
+    if url.drivername in ("sqlite", "sqlite+pysqlite"):
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+# Async database session dependency
+async def get_async_db():
+    init_engines()
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async stack is disabled - set ASYNC_DB=True")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Async read-only session dependency for GET handlers
+async def get_async_read_db(request: Request):
+    init_engines()
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async stack is disabled - set ASYNC_DB=True")
+    index = pick_replica(request)
+    if index is not None:
+        async with AsyncReplicaSessionLocals[index]() as db:
+            try:
+                await db.connection()
+            except OperationalError:
+                replica_set.mark(index, False, "connection failed")
+            else:
+                yield db
+                return
+    async with AsyncSessionLocal() as db:
+        yield db
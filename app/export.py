@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.models import Article, ArticleBody, ArticleTag
+from app.bodies import decode_body
+from app.tags import split_tags
+from app.filters import as_datetime
+from app.logger import logger
+
+# Streaming export of the whole corpus. Rows are read through a
+# server-side cursor (stream_results + yield_per), so only one batch of
+# EXPORT_BATCH_SIZE rows is held in memory, and every batch is encoded
+# and handed to the StreamingResponse before the next one is fetched.
+# Bodies come from article_bodies as stored (codec, data) and are
+# decompressed row by row while encoding.
+
+EXPORT_COLUMNS = ("id", "title", "content", "author", "tags", "created_at", "updated_at")
+
+# CSV has no lists - tags go in one cell, joined by this
+CSV_TAG_SEPARATOR = ","
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def export_query(since: Optional[datetime] = None, tag: Optional[str] = None):
+    # Oldest first by id - stable, and an interrupted export can be
+    # resumed with since= from the last updated_at it saw
+    columns = []
+    for name in EXPORT_COLUMNS:
+        # the body is selected as stored and decoded in _row_dict
+        columns += [ArticleBody.codec, ArticleBody.data] if name == "content" else [getattr(Article, name)]
+    stmt = select(*columns).outerjoin(ArticleBody, ArticleBody.article_id == Article.id)
+    if tag:
+        stmt = stmt.join(ArticleTag, ArticleTag.article_id == Article.id).where(ArticleTag.tag == tag)
+    if since:
+        # updated_at is naive UTC - an aware since is compared after conversion
+        stmt = stmt.where(Article.updated_at >= as_datetime(since))
+    return stmt.order_by(Article.id)
+
+
+def _row_dict(row) -> dict:
+    # Rows carry EXPORT_COLUMNS with codec + data in place of content
+    values = row._mapping
+    item = {}
+    for name in EXPORT_COLUMNS:
+        if name == "content":
+            item[name] = decode_body(values["codec"], values["data"])
+        elif name in ("created_at", "updated_at"):
+            item[name] = values[name].isoformat() if values[name] else None
+        elif name == "tags":
+            # a list, as in API responses and bulk import records
+            item[name] = split_tags(values[name])
+        else:
+            item[name] = values[name]
+    return item
+
+
+def _encode_ndjson(rows) -> str:
+    return "".join(json.dumps(_row_dict(row), ensure_ascii=False) + "\n" for row in rows)
+
+
+def _encode_csv(rows, header: bool) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        item = _row_dict(row)
+        if item["tags"] is not None:
+            item["tags"] = CSV_TAG_SEPARATOR.join(item["tags"])
+        writer.writerow([item[name] for name in EXPORT_COLUMNS])
+    return out.getvalue()
+
+
+def export_articles(bind: Engine, format: str, since: Optional[datetime] = None, tag: Optional[str] = None,
+                    compress: bool = False) -> Iterator[bytes]:
+    # Sync generator - Starlette iterates it in the threadpool. It owns its
+    # connection on `bind` (primary or replica, picked by the route) rather
+    # than using the request's Session, because the body is still being
+    # produced after the endpoint has returned.
+    gzip = zlib.compressobj(settings.EXPORT_GZIP_LEVEL, zlib.DEFLATED, 31) if compress else None
+    exported = 0
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return gzip.compress(data) if gzip else data
+
+    try:
+        with bind.connect() as connection:
+            result = connection.execution_options(
+                stream_results=True,
+                yield_per=settings.EXPORT_BATCH_SIZE
+            ).execute(export_query(since, tag))
+
+            if format == "csv":
+                yield emit(_encode_csv([], header=True))
+
+            for rows in result.partitions():
+                chunk = _encode_csv(rows, header=False) if format == "csv" else _encode_ndjson(rows)
+                exported += len(rows)
+                data = emit(chunk)
+                if data:
+                    yield data
+
+        if gzip:
+            yield gzip.flush()
+
+    except Exception as e:
+        # headers are already sent - all we can do is cut the stream short
+        logger.error(f"Failure: Export aborted after {exported} articles - Error: {str(e)}")
+        raise
+
+    logger.info(f"Success: Exported {exported} articles as {format}{' (gzip)' if compress else ''}")
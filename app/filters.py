@@ -0,0 +1,113 @@
+from datetime import date, datetime, timezone
+from typing import Annotated, List, Optional, Tuple, Union
+from pydantic import BeforeValidator
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.models import Article, ArticleTag
+from app.counts import counter_total_expr
+
+# Facets for the article list: author, created_at range and tags.
+# Each one lines up with an index (see app/models.py), so with the
+# newest-first ordering an archive page is a single index range scan:
+#   author (+ range)  -> ix_articles_author_created_at_id
+#   range only        -> ix_articles_created_at_id
+#   tags              -> ix_article_tags_tag_article_id
+
+
+def as_datetime(value: Optional[Union[date, datetime]]) -> Optional[datetime]:
+    # Date-only bounds (created_after=2025-03-01) mean midnight; a bound
+    # with an offset is converted to the naive UTC created_at is stored in
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _parse_bound(value):
+    # YYYY-MM-DD is a date, anything else is parsed as a datetime - so a
+    # midnight with an offset keeps its offset
+    if isinstance(value, str) and len(value) == 10:
+        return as_datetime(date.fromisoformat(value))
+    return value
+
+
+# Query parameter type for created_after / created_before / since
+DateBound = Annotated[datetime, BeforeValidator(_parse_bound)]
+
+
+def date_range(created_after: Optional[datetime], created_before: Optional[datetime]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    # Both bounds as naive UTC; ValueError for a range nothing can be in
+    created_after, created_before = as_datetime(created_after), as_datetime(created_before)
+    if created_after and created_before and created_after >= created_before:
+        raise ValueError("created_after must be earlier than created_before")
+    return created_after, created_before
+
+
+class ArticleFilters:
+
+    def __init__(self, author: Optional[str] = None, created_after: Optional[datetime] = None,
+                 created_before: Optional[datetime] = None, tags: Optional[List[str]] = None,
+                 tag_mode: str = "all"):
+        self.author = author
+        # created_after is inclusive, created_before exclusive, so
+        # consecutive ranges (one month, the next month) never overlap
+        self.created_after = created_after
+        self.created_before = created_before
+        self.tags = tags or []
+        self.tag_mode = tag_mode
+
+    @property
+    def active(self) -> bool:
+        return bool(self.author or self.created_after or self.created_before or self.tags)
+
+    @property
+    def tags_only(self) -> bool:
+        # Only tag filters - the page changes only when one of its tags does
+        return bool(self.tags) and not (self.author or self.created_after or self.created_before)
+
+    @property
+    def counter_backed(self) -> bool:
+        # Totals the maintained counters can answer: everything, or one tag
+        return not (self.author or self.created_after or self.created_before) and len(self.tags) <= 1
+
+    def apply(self, stmt):
+        # Works on a legacy Query and on a 2.0 select() alike
+        if self.author:
+            stmt = stmt.where(Article.author == self.author)
+        if self.created_after:
+            stmt = stmt.where(Article.created_at >= self.created_after)
+        if self.created_before:
+            stmt = stmt.where(Article.created_at < self.created_before)
+
+        if len(self.tags) == 1:
+            # one tag - join, driven by the (tag, article_id) index
+            stmt = stmt.join(Article.tag_links).where(ArticleTag.tag == self.tags[0])
+        elif self.tags:
+            # several tags - ids from the tag index first (IN, so an article
+            # with more than one of them is still listed once); "all" keeps
+            # the ids that matched every tag
+            ids = select(ArticleTag.article_id).where(ArticleTag.tag.in_(self.tags))
+            if self.tag_mode == "all":
+                ids = ids.group_by(ArticleTag.article_id).having(func.count() == len(self.tags))
+            stmt = stmt.where(Article.id.in_(ids))
+        return stmt
+
+    def total_expr(self):
+        # Scalar subquery for meta.total: the maintained counter when it can
+        # answer, otherwise a COUNT over the same index range as the page
+        if self.counter_backed:
+            return counter_total_expr(self.tags[0] if self.tags else None)
+        return select(func.count()).select_from(self.apply(select(Article.id)).subquery()).scalar_subquery()
+
+    def __str__(self) -> str:
+        return (
+            f"author={self.author}&created_after={self.created_after}&created_before={self.created_before}"
+            f"&tags={','.join(self.tags)}&tag_mode={self.tag_mode}"
+        )
+
+
+def filtered_total(db: Session, filters: ArticleFilters) -> int:
+    return db.execute(select(filters.total_expr())).scalar_one()
@@ -0,0 +1,174 @@
+from typing import List, Optional, Sequence
+from fastapi import Request, Response
+from sqlalchemy import select, tuple_
+from app.models import Article
+from app.tags import normalize_tags
+from app.pagination import encode_cursor, decode_cursor
+from app.filters import ArticleFilters, date_range
+from app.cache import list_cache
+from app.projection import resolve_fields, projection_options, article_item
+from app.serialization import success_response, cached_response
+from app.conditional import list_etag, is_not_modified, validator_headers, not_modified_response
+from app.config import settings
+from app.logger import logger
+
+# GET /articles, shared by the sync and async routers. Everything but
+# running the statements lives here - parameters, the filtered page
+# select(), the list cache, ETags and the response body - so the handlers
+# only differ in how they execute (Session vs AsyncSession).
+
+
+class ArticleList:
+
+    def __init__(self, tag: Optional[List[str]], tag_mode: str, author: Optional[str],
+                 created_after, created_before, page: int, limit: int, cursor: Optional[str],
+                 count: str, view: str, fields: Optional[str]):
+        # ValueError (a 400) for an empty date range, a cursor we didn't
+        # issue or an unknown field
+        created_after, created_before = date_range(created_after, created_before)
+
+        self.seek = None
+        if cursor:
+            try:
+                self.seek = decode_cursor(cursor)
+            except ValueError:
+                raise ValueError("Invalid cursor") from None
+
+        # Which item fields to return (and load)
+        self.item_fields = resolve_fields(fields, view)
+        self.page = page
+        self.limit = limit
+        self.count = count
+        self.filters = ArticleFilters(
+            author=author.strip() if author else None,
+            created_after=created_after,
+            created_before=created_before,
+            tags=normalize_tags(tag),
+            tag_mode=tag_mode
+        )
+
+        # Planner estimate, set by the handler for count=estimate (None
+        # means fall back to the counter)
+        self.total = None
+
+        # First pages come from the list cache. On a miss this request
+        # renders the page; concurrent misses for it wait instead of querying
+        self.cache_key = None
+        self.cache_owner = False
+        if list_cache.enabled and not self.seek and page <= settings.LIST_CACHE_MAX_PAGE:
+            self.cache_key = list_cache.key(
+                self.filters.tags if self.filters.tags_only else None,
+                f"{self.filters}|{page}|{limit}|{count}|{self.variant}"
+            )
+
+    @property
+    def variant(self) -> str:
+        return ",".join(self.item_fields)
+
+    @property
+    def use_counter(self) -> bool:
+        return self.count == "exact" or (self.count == "estimate" and self.total is None)
+
+    def cached(self, request: Request, cached) -> Optional[Response]:
+        # The response for a claimed list cache entry - None on a miss, which
+        # makes this request the one that renders and stores the page
+        if cached is None:
+            self.cache_owner = True
+            return None
+        etag, body = cached
+        if is_not_modified(request, etag):
+            logger.info(f"Success: Articles page not modified (cached) - ETag: {etag}")
+            return not_modified_response(etag)
+        logger.info(f"Success: Fetched articles page {self.page} from the list cache")
+        return cached_response(body, headers=validator_headers(etag))
+
+    def statement(self):
+        # Filtered select - only the columns the items need are loaded
+        return self.filters.apply(select(Article).options(*projection_options(self.item_fields)))
+
+    def _paged(self, stmt):
+        # Newest first; id breaks ties so the order is stable across pages
+        stmt = stmt.order_by(Article.created_at.desc(), Article.id.desc())
+        if self.seek:
+            # Keyset mode - seek straight past the previous page on the (created_at, id) index
+            # (the plain created_at bound is redundant, but lets Postgres skip
+            # newer partitions when articles is partitioned by month)
+            stmt = stmt.where(tuple_(Article.created_at, Article.id) < self.seek, Article.created_at <= self.seek[0])
+        else:
+            stmt = stmt.offset((self.page - 1) * self.limit)
+        # one extra row tells whether there is a next page
+        stmt = stmt.limit(self.limit + 1)
+
+        # The total (maintained counter, or a COUNT for filters the counters
+        # can't answer) rides along as a scalar subquery, so the page and
+        # its total come back in a single round trip
+        if self.use_counter:
+            stmt = stmt.add_columns(self.filters.total_expr().label("total"))
+        return stmt
+
+    def page_statement(self):
+        # Rows of (Article[, total])
+        return self._paged(self.statement())
+
+    def validates_first(self, request: Request) -> bool:
+        # Conditional request - check the page's ids and versions first and
+        # answer 304 without loading or serializing the full rows
+        # (cacheable pages are rendered in full, to fill the cache)
+        return "if-none-match" in request.headers and not self.cache_owner
+
+    def light_statement(self):
+        # Rows of (id, created_at, updated_at[, total])
+        return self._paged(self.filters.apply(select(Article.id, Article.created_at, Article.updated_at)))
+
+    def needs_total(self, rows: Sequence) -> bool:
+        # An empty page has no row to carry the total - it takes its own
+        # query (filtered_total)
+        return self.use_counter and not rows
+
+    def _page_total(self, rows: Sequence, counted: Optional[int]) -> Optional[int]:
+        if not self.use_counter:
+            return self.total
+        return rows[0].total if rows else counted
+
+    def not_modified(self, request: Request, rows: Sequence, counted: Optional[int] = None) -> Optional[Response]:
+        # 304 if the light rows still match If-None-Match
+        etag = list_etag([(r.id, r.updated_at) for r in rows[:self.limit]],
+                         self._page_total(rows, counted), len(rows) > self.limit, self.variant)
+        if is_not_modified(request, etag):
+            logger.info(f"Success: Articles page not modified - ETag: {etag}")
+            return not_modified_response(etag)
+        return None
+
+    def response(self, request: Request, rows: Sequence, counted: Optional[int] = None,
+                 replica: bool = False) -> Response:
+        total = self._page_total(rows, counted)
+        articles = [row[0] for row in rows]
+        has_more = len(articles) > self.limit
+        articles = articles[:self.limit]
+        next_cursor = encode_cursor(articles[-1].created_at, articles[-1].id) if has_more else None
+
+        # Weak validator for the page, so clients can revalidate with If-None-Match
+        etag = list_etag([(a.id, a.updated_at) for a in articles], total, has_more, self.variant)
+
+        paginated = {
+            "items": [article_item(a, self.item_fields) for a in articles],
+            "meta": {
+                "page": None if self.seek else self.page,
+                "limit": self.limit,
+                "total": total,
+                "total_pages": (total + self.limit - 1) // self.limit if total is not None else None,
+                "next_cursor": next_cursor,
+                "count": self.count
+            }
+        }
+
+        logger.info(f"Success: Fetched {len(articles)} articles on page {'cursor' if self.seek else self.page} (total: {total})")
+
+        response = success_response(paginated, headers=validator_headers(etag))
+        if self.cache_owner:
+            # a replica read right after a write may predate it - don't cache it
+            if not (replica and list_cache.invalidated_within(settings.READ_YOUR_WRITES_SECONDS)):
+                list_cache.set(self.cache_key, etag, response.body)
+            if is_not_modified(request, etag):
+                return not_modified_response(etag)
+        return response
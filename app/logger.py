@@ -1,7 +1,9 @@
 import logging
+import os
 
+# LOG_LEVEL=WARNING silences the per-request INFO lines (e.g. for benchmarks)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S"
 )
@@ -1,17 +1,139 @@
+import time
+
+# cold start: time spent importing the app (see app/readiness.py)
+IMPORT_STARTED = time.perf_counter()
+
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import articles
-from app.config import settings
-
-app = FastAPI(
-    title="Personal Blog API",
-    description="A simple blog API with CRUD operations",
-    version="1.0.0",
-    debug=settings.DEBUG
-)
-
-app.include_router(
-    articles.router,
-    prefix="/api/v1/articles",   
-    tags=["articles"]            
-)
+from fastapi.concurrency import run_in_threadpool
+from app.routers import articles, articles_async, search, bulk, export, tags, internal, metrics, health
+from app.config import Settings, settings
+from app.database import init_engines, get_engine, dispose_engines
+from app.metrics import MetricsMiddleware
+from app.replicas import ReadYourWritesMiddleware, replica_urls
+from app.compression import CompressionMiddleware, compressed_cache, load_codecs
+from app.admission import AdmissionMiddleware, make_gates
+from app.partitions import ensure_future_partitions
+from app.readiness import Readiness
+from app.logger import logger
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+
+
+# Partitioned articles table: make sure the next months have partitions
+# (a catalog lookup and nothing else on an unpartitioned database)
+async def create_upcoming_partitions():
+    try:
+        await run_in_threadpool(ensure_future_partitions, get_engine())
+    except Exception as e:
+        # inserts still land in the default partition - don't refuse to start
+        logger.error(f"Could not create upcoming article partitions - Error: {str(e)}")
+
+
+def create_app(settings: Settings = settings) -> FastAPI:
+    # Building the app opens nothing - engines are created, pools warmed and
+    # migrations checked in the lifespan, and /ready reports when that's done.
+    # Run with `uvicorn app.main:app` or `uvicorn --factory app.main:create_app`.
+    started = time.perf_counter()
+    readiness = Readiness(settings)
+    readiness.record("import", IMPORT_SECONDS)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        lifespan_started = time.perf_counter()
+        with readiness.phase("engines"):
+            await run_in_threadpool(init_engines, settings)
+        with readiness.phase("partitions"):
+            await create_upcoming_partitions()
+        await readiness.check(startup=True)
+        readiness.log_startup(total=IMPORT_SECONDS + readiness.timings["app"] + time.perf_counter() - lifespan_started)
+        yield
+        # Close pooled connections cleanly when the server stops
+        await dispose_engines()
+
+    app = FastAPI(
+        title="Personal Blog API",
+        description="A simple blog API with CRUD operations",
+        version="1.0.0",
+        debug=settings.DEBUG,
+        lifespan=lifespan
+    )
+    app.state.readiness = readiness
+
+    # /search, /bulk and /export must be registered before /{id}
+    app.include_router(
+        search.router,
+        prefix="/api/v1/articles",
+        tags=["articles"]
+    )
+
+    app.include_router(
+        bulk.router,
+        prefix="/api/v1/articles",
+        tags=["articles"]
+    )
+
+    app.include_router(
+        export.router,
+        prefix="/api/v1/articles",
+        tags=["articles"]
+    )
+
+    # ASYNC_DB=True serves the same API from the asyncio stack
+    app.include_router(
+        articles_async.router if settings.ASYNC_DB else articles.router,
+        prefix="/api/v1/articles",
+        tags=["articles"]
+    )
+
+    app.include_router(
+        tags.router,
+        prefix="/api/v1/tags",
+        tags=["tags"]
+    )
+
+    app.include_router(
+        internal.router,
+        prefix="/internal",
+        include_in_schema=False
+    )
+
+    app.include_router(
+        metrics.router,
+        include_in_schema=False
+    )
+
+    app.include_router(
+        health.router,
+        include_in_schema=False
+    )
+
+    # Writers read from the primary for a few seconds after each write
+    if replica_urls(settings):
+        app.add_middleware(ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS)
+
+    # gzip/br/zstd for JSON responses, negotiated from Accept-Encoding
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            codecs=load_codecs([name.strip() for name in settings.COMPRESSION_ENCODINGS.split(",") if name.strip()]),
+            min_size=settings.COMPRESSION_MIN_SIZE,
+            max_concurrency=settings.COMPRESSION_MAX_CONCURRENCY,
+            cache=compressed_cache
+        )
+
+    # Caps /api requests in flight at what the pool can serve and sheds the
+    # excess with 503 + Retry-After (inside metrics, so shed requests count)
+    app.state.admission = make_gates(settings) if settings.ADMISSION_ENABLED else {}
+    if settings.ADMISSION_ENABLED:
+        app.add_middleware(AdmissionMiddleware, gates=app.state.admission, retry_after=settings.ADMISSION_RETRY_AFTER)
+
+    # Per-route latency, status codes and SQL counts, scraped from /metrics
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    readiness.record("app", time.perf_counter() - started)
+    return app
+
 
+app = create_app()
@@ -0,0 +1,338 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.logger import logger
+
+# Request and SQL instrumentation, exposed on /metrics in the Prometheus
+# text format. Hand-rolled (no prometheus_client dependency): a handful of
+# counters, gauges and histograms keyed by label values.
+#
+# MetricsMiddleware opens a RequestMetrics for every HTTP request and puts
+# it in a context variable. The cursor events attached to each engine
+# add query count and DB time to whatever request is current - context
+# variables follow the request into the threadpool and into SQLAlchemy's
+# asyncio greenlets.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# requests that matched no route share one label instead of one per URL
+UNMATCHED_ROUTE = "<unmatched>"
+# queries issued outside any request (startup, background work)
+NO_ROUTE = "<none>"
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {round(value, 6)}")
+        return lines
+
+
+class Gauge(Counter):
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, *label_values, value: float) -> None:
+        with self._lock:
+            self._values[label_values] = value
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._counts: Dict[Tuple, List[int]] = {}
+        self._sums: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        with self._lock:
+            counts = self._counts.get(label_values)
+            if counts is None:
+                counts = self._counts[label_values] = [0] * (len(self.buckets) + 1)
+                self._sums[label_values] = 0.0
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+            self._sums[label_values] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values in sorted(self._counts):
+                counts = self._counts[values]
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    labels = _format_labels(self.labels + ("le",), values + (le,))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labels, values)
+                lines.append(f"{self.name}_sum{labels} {round(self._sums[values], 6)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status code",
+    ("method", "route", "status")
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streaming the body",
+    ("method", "route")
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+    ("method",)
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request",
+    ("method", "route"), buckets=QUERY_COUNT_BUCKETS
+)
+DB_QUERIES = Counter(
+    "db_queries_total", "SQL statements executed, by the route that issued them",
+    ("route",)
+)
+DB_TIME = Counter(
+    "db_query_duration_seconds_total", "Time spent executing SQL, by the route that issued it",
+    ("route",)
+)
+
+# group commit (app/group_commit.py) - for tuning window and batch size
+GROUP_COMMIT_BATCH_SIZE = Histogram(
+    "group_commit_batch_size", "Articles inserted per group commit",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+GROUP_COMMIT_FLUSHES = Counter(
+    "group_commit_flushes_total", "Group commits, by trigger (window elapsed or batch full)",
+    ("reason",)
+)
+GROUP_COMMIT_WAIT = Histogram(
+    "group_commit_wait_seconds", "Time a create waited in the queue before its batch was flushed",
+    buckets=(0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1)
+)
+
+# response compression (app/compression.py)
+COMPRESSED_RESPONSES = Counter(
+    "http_responses_compressed_total", "Compressible responses by encoding and outcome (compressed, cache, skipped_busy)",
+    ("encoding", "source")
+)
+COMPRESSION_BYTES = Counter(
+    "http_compression_bytes_total", "Response bytes before (in) and after (out) compression",
+    ("encoding", "direction")
+)
+
+# admission control (app/admission.py) - per request class (read / write)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Admitted /api requests currently being served",
+    ("class",)
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "/api requests waiting for a slot",
+    ("class",)
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "/api requests answered 503 by admission control, by reason (queue_full, queue_timeout)",
+    ("class", "reason")
+)
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds", "Time an admitted request waited in the queue",
+    ("class",), buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+# cold start (app/readiness.py) - import, app, engines, partitions, warmup, migrations, total
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds", "Time spent in each startup phase of this process",
+    ("phase",)
+)
+
+_METRICS = (
+    REQUESTS, REQUEST_LATENCY, IN_FLIGHT, REQUEST_QUERIES, DB_QUERIES, DB_TIME,
+    GROUP_COMMIT_BATCH_SIZE, GROUP_COMMIT_FLUSHES, GROUP_COMMIT_WAIT,
+    COMPRESSED_RESPONSES, COMPRESSION_BYTES, ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTED, ADMISSION_WAIT, STARTUP_SECONDS
+)
+
+
+class RequestMetrics:
+    # Per-request accumulator. statements is only filled when the slow
+    # request log is on, and is capped at SLOW_REQUEST_MAX_SQL entries.
+
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = UNMATCHED_ROUTE
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements: List[Tuple[float, str]] = []
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar("request_metrics", default=None)
+
+
+def attach_query_listeners(engine: Engine) -> None:
+    # Times every cursor execution. For executemany the whole batch counts
+    # as one statement, which is what it costs in round trips.
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        # inside a request the totals are booked once it finishes,
+        # when its route is known
+        current = _current.get()
+        if current is None:
+            DB_QUERIES.inc(NO_ROUTE)
+            DB_TIME.inc(NO_ROUTE, amount=elapsed)
+            return
+
+        current.queries += 1
+        current.db_seconds += elapsed
+        if settings.SLOW_REQUEST_MS > 0 and len(current.statements) < settings.SLOW_REQUEST_MAX_SQL:
+            current.statements.append((elapsed, statement))
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware rather than @app.middleware("http"), so
+    # streaming responses pass through untouched and the latency covers
+    # the whole body, not just the first byte.
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict = {}
+
+    def _route_template(self, scope) -> str:
+        # The router leaves the matched endpoint in scope; map it back to
+        # its path template (/api/v1/articles/{id}) to keep label cardinality low
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if endpoint not in self._routes:
+            app = scope.get("app")
+            for route in getattr(app, "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    self._routes[endpoint] = route.path
+                    break
+            else:
+                self._routes[endpoint] = UNMATCHED_ROUTE
+        return self._routes[endpoint]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics(scope["method"], scope["path"])
+        token = _current.set(metrics)
+        status = 500
+        start = time.perf_counter()
+        # the route is only known once the router has matched, so
+        # in-flight requests are tracked per method
+        IN_FLIGHT.inc(metrics.method)
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec(metrics.method)
+            _current.reset(token)
+            metrics.route = self._route_template(scope)
+            self._record(metrics, status, elapsed)
+
+    def _record(self, metrics: RequestMetrics, status: int, elapsed: float) -> None:
+        REQUESTS.inc(metrics.method, metrics.route, str(status))
+        REQUEST_LATENCY.observe(elapsed, metrics.method, metrics.route)
+        REQUEST_QUERIES.observe(metrics.queries, metrics.method, metrics.route)
+        if metrics.queries:
+            DB_QUERIES.inc(metrics.route, amount=metrics.queries)
+            DB_TIME.inc(metrics.route, amount=metrics.db_seconds)
+
+        if settings.SLOW_REQUEST_MS > 0 and elapsed * 1000 >= settings.SLOW_REQUEST_MS:
+            statements = "\n".join(
+                f"  [{seconds * 1000:.1f} ms] {' '.join(sql.split())}" for seconds, sql in metrics.statements
+            )
+            logger.warning(
+                f"Slow request: {metrics.method} {metrics.path} -> {status} in {elapsed * 1000:.1f} ms "
+                f"({metrics.queries} queries, {metrics.db_seconds * 1000:.1f} ms in DB)"
+                + (f"\n{statements}" if statements else "")
+            )
+
+
+def render_metrics(pool_data: Optional[dict] = None) -> str:
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+
+    # connection pools, from app/pool_stats.py
+    if pool_data:
+        pool_metrics = (
+            ("checkedout", "db_pool_checked_out", "gauge", "Connections currently checked out"),
+            ("overflow", "db_pool_overflow", "gauge", "Overflow connections currently open"),
+            ("checkouts", "db_pool_checkouts_total", "counter", "Connection checkouts"),
+            ("timeouts", "db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection"),
+            ("wait_seconds_total", "db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection"),
+        )
+        for key, name, kind, help in pool_metrics:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for pool, data in sorted(pool_data.items()):
+                if key in data:
+                    # QueuePool reports overflow as negative until the pool is full
+                    value = max(data[key], 0) if key == "overflow" else data[key]
+                    lines.append(f'{name}{{pool="{pool}"}} {value}')
+
+    return "\n".join(lines) + "\n"
@@ -1,7 +1,11 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from typing import Optional
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import relationship, query_expression
+from sqlalchemy.orm.attributes import flag_modified
 from datetime import datetime
 
 from .database import Base
+from .bodies import encode_body, decode_body, make_preview
 
 
 class Article(Base):
@@ -9,11 +13,137 @@ class Article(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)          
-    content = Column(Text, nullable=False)
-    author = Column(String, index=True)    
+    # start of the body - list excerpts are cut from it, so summary pages
+    # never read article_bodies. The body itself is `content` below.
+    preview = Column(Text)
+    # indexed by ix_articles_author_created_at_id (author is its prefix)
+    author = Column(String)
     tags = Column(String, nullable=True)                        
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)  
+    # bumped on every ORM update - drives ETag/Last-Modified
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    # start of preview, only populated by list queries that ask for it
+    # (see app/projection.py) - None otherwise
+    excerpt = query_expression()
+
+    # (created_at, id) backs the newest-first ordering and keyset pagination;
+    # (author, created_at, id) does the same for one author's archive.
+    # Ascending is fine for the newest-first order - both are scanned backwards.
+    # On a Postgres database converted by partition_articles.py the table is
+    # partitioned by month on created_at, its primary key is (id, created_at)
+    # and the cascade to article_tags / article_bodies is done by a delete
+    # trigger instead of the foreign keys below (see app/partitions.py); id
+    # stays unique through its sequence, so the model keeps id as the key.
+    __table_args__ = (
+        Index("ix_articles_created_at_id", "created_at", "id"),
+        Index("ix_articles_author_created_at_id", "author", "created_at", "id"),
+    )
+
+    # normalized tags, one row per (article, tag) - used for filtering
+    tag_links = relationship(
+        "ArticleTag",
+        back_populates="article",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    # compressed body, one row in article_bodies - loaded only when content
+    # is read (handlers that return it load it eagerly)
+    body = relationship(
+        "ArticleBody",
+        back_populates="article",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+    @property
+    def content(self) -> Optional[str]:
+        return self.body.text if self.body is not None else None
+
+    @content.setter
+    def content(self, value: str) -> None:
+        if self.body is None:
+            self.body = ArticleBody(text=value)
+        elif self.body.text == value:
+            return
+        else:
+            self.body.text = value
+        self.preview = make_preview(value)
+        # the articles row is written even when the change lies beyond the
+        # preview - that bumps updated_at and re-indexes the article
+        flag_modified(self, "preview")
 
     
     def __repr__(self):
-        return f"<Article(id={self.id}, title='{self.title}', tags='{self.tags}')>"
\ No newline at end of file
+        return f"<Article(id={self.id}, title='{self.title}', tags='{self.tags}')>"
+
+
+class ArticleBody(Base):
+    __tablename__ = "article_bodies"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    # how data is encoded: "zstd", "zlib" or "plain" (see app/bodies.py)
+    codec = Column(String, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    # uncompressed size in bytes
+    size = Column(Integer, nullable=False)
+
+    article = relationship("Article", back_populates="body")
+
+    @property
+    def text(self) -> Optional[str]:
+        return decode_body(self.codec, self.data)
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.codec, self.data = encode_body(value)
+        self.size = len(value.encode("utf-8"))
+
+    def __repr__(self):
+        return f"<ArticleBody(article_id={self.article_id}, codec='{self.codec}', size={self.size})>"
+
+
+class ArticleTag(Base):
+    __tablename__ = "article_tags"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String, primary_key=True)
+
+    article = relationship("Article", back_populates="tag_links")
+
+    # tag first, so "all articles with tag X" is a single index range scan
+    __table_args__ = (
+        Index("ix_article_tags_tag_article_id", "tag", "article_id"),
+    )
+
+    def __repr__(self):
+        return f"<ArticleTag(article_id={self.article_id}, tag='{self.tag}')>"
+
+
+class ArticleCounter(Base):
+    __tablename__ = "article_counters"
+
+    # one row per counter, e.g. "articles" = total number of articles
+    name = Column(String, primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ArticleCounter(name='{self.name}', value={self.value})>"
+
+
+class TagCount(Base):
+    __tablename__ = "tag_counts"
+
+    tag = Column(String, primary_key=True)
+    article_count = Column(BigInteger, nullable=False, default=0)
+
+    # most used tags first, ties by name (GET /api/v1/tags) - the index is
+    # in that order, so the top N are its first N entries
+    __table_args__ = (
+        Index("ix_tag_counts_article_count_tag", article_count.desc(), tag),
+    )
+
+    def __repr__(self):
+        return f"<TagCount(tag='{self.tag}', article_count={self.article_count})>"
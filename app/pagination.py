@@ -0,0 +1,36 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+# Cursors are opaque to clients: urlsafe base64 of [created_at, id]
+# taken from the last row of the previous page.
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    # Raises ValueError for anything that isn't a cursor we issued
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+# Search cursors carry the relevance score instead of created_at
+def encode_search_cursor(score: float, id: int) -> str:
+    raw = json.dumps([score, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(score), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
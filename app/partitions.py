@@ -0,0 +1,294 @@
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection, Engine
+from app.config import settings
+from app.models import Article, ArticleBody, ArticleTag
+from app.bodies import article_row, body_row
+from app.tags import normalize_tags
+from app.search import index_articles
+from app.export import EXPORT_COLUMNS, _encode_ndjson
+from app.logger import logger
+
+# Optional partitioned layout for Postgres: `articles` range-partitioned
+# by created_at, one partition per month (articles_y2025m03), plus a
+# DEFAULT partition so an insert never fails for lack of a partition.
+#
+# Reads mostly touch recent months, so with month partitions the hot
+# working set is the last few partitions and their indexes; older ones
+# stay cold on disk, and vacuum works partition by partition. Queries
+# prune partitions when they carry a plain created_at predicate (date
+# range filters, keyset cursors - see the list handlers).
+#
+# A partitioned table's unique keys must include the partition key, so
+# the primary key becomes (id, created_at) and nothing can reference
+# articles(id) with a foreign key any more: ON DELETE CASCADE to
+# article_tags / article_bodies / article_search is replaced by a row
+# trigger.
+#
+# Managed with partition_articles.py (convert, ensure, archive, restore,
+# status). The app itself only creates upcoming partitions at startup.
+
+PARENT = "articles"
+DEFAULT_PARTITION = "articles_default"
+_PARTITION_NAME = re.compile(r"^articles_y(\d{4})m(\d{2})$")
+
+# pg_advisory_xact_lock key - one partition DDL run at a time
+# (several workers start at once)
+_LOCK_KEY = 7_301_917_233
+
+# the export row shape - bodies as stored, decoded while encoding
+_ARCHIVE_COLUMNS = ", ".join("b.codec, b.data" if name == "content" else f"a.{name}" for name in EXPORT_COLUMNS)
+
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"articles_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    # None for anything that isn't a month partition (e.g. the default one)
+    match = _PARTITION_NAME.match(name)
+    return datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def is_partitioned(connection: Connection) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return bool(connection.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+    ), {"table": PARENT}).scalar())
+
+
+def list_partitions(connection: Connection, parent: str = PARENT) -> List[dict]:
+    rows = connection.execute(text(
+        "SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bounds, "
+        "greatest(c.reltuples, 0)::bigint AS rows, pg_total_relation_size(c.oid) AS bytes "
+        "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:parent) ORDER BY c.relname"
+    ), {"parent": parent}).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def _lock(connection: Connection) -> None:
+    connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+
+
+def create_partition(connection: Connection, month: datetime, parent: str = PARENT) -> str:
+    # Bounds are literals - DDL takes no bind parameters. A month that
+    # already has rows in the default partition can't be created until
+    # they are moved out (Postgres refuses, the transaction rolls back).
+    name = partition_name(month)
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    ))
+    return name
+
+
+def ensure_partitions(connection: Connection, through: datetime, start: Optional[datetime] = None,
+                      parent: str = PARENT) -> List[str]:
+    # Create the missing month partitions from `start` (default: this
+    # month) through `through`. Returns the names created.
+    _lock(connection)
+    existing = {p["name"] for p in list_partitions(connection, parent)}
+    month = month_start(start or datetime.utcnow())
+    created = []
+    while month <= month_start(through):
+        if partition_name(month) not in existing:
+            created.append(create_partition(connection, month, parent))
+        month = add_months(month, 1)
+    if DEFAULT_PARTITION not in existing:
+        connection.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {parent} DEFAULT"))
+    if created:
+        logger.info(f"Created article partitions: {', '.join(created)}")
+    return created
+
+
+def ensure_future_partitions(bind: Engine) -> List[str]:
+    # App startup: partitions for this month and PARTITION_MONTHS_AHEAD
+    # more. A no-op (one catalog query) on unpartitioned databases.
+    with bind.begin() as connection:
+        if not is_partitioned(connection):
+            return []
+        return ensure_partitions(connection, add_months(month_start(datetime.utcnow()), settings.PARTITION_MONTHS_AHEAD))
+
+
+def create_cascade_function(connection: Connection) -> None:
+    # Stands in for ON DELETE CASCADE from the tables that reference articles.
+    # An UPDATE of created_at that moves a row to another partition runs as
+    # a delete plus an insert and fires this too - the id still exists then,
+    # and nothing may be removed.
+    connection.execute(text(
+        "CREATE OR REPLACE FUNCTION articles_delete_cascade() RETURNS trigger AS $$ "
+        "BEGIN "
+        "IF EXISTS (SELECT 1 FROM articles WHERE id = OLD.id) THEN RETURN OLD; END IF; "
+        "DELETE FROM article_tags WHERE article_id = OLD.id; "
+        "DELETE FROM article_bodies WHERE article_id = OLD.id; "
+        "DELETE FROM article_search WHERE article_id = OLD.id; "
+        "RETURN OLD; "
+        "END $$ LANGUAGE plpgsql"
+    ))
+
+
+def convert_to_partitioned(connection: Connection, drop_old: bool = False) -> dict:
+    # One transaction (Postgres DDL is transactional): copy articles into a
+    # new partitioned table and swap the names. Writes wait on the lock for
+    # the duration of the copy, reads carry on against the old table.
+    if connection.dialect.name != "postgresql":
+        raise RuntimeError("Partitioning needs PostgreSQL")
+    if is_partitioned(connection):
+        raise RuntimeError("articles is already partitioned")
+
+    _lock(connection)
+    connection.execute(text("LOCK TABLE articles IN EXCLUSIVE MODE"))
+    oldest = connection.execute(text("SELECT min(created_at) FROM articles")).scalar()
+    start = month_start(oldest or datetime.utcnow())
+    through = add_months(month_start(datetime.utcnow()), settings.PARTITION_MONTHS_AHEAD)
+
+    connection.execute(text(
+        "CREATE TABLE articles_partitioned (LIKE articles INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    ))
+    connection.execute(text("ALTER TABLE articles_partitioned ADD PRIMARY KEY (id, created_at)"))
+    partitions = ensure_partitions(connection, through, start, parent="articles_partitioned")
+    copied = connection.execute(text("INSERT INTO articles_partitioned SELECT * FROM articles")).rowcount
+
+    # foreign keys to articles(id) can't point at a partitioned table
+    foreign_keys = connection.execute(text(
+        "SELECT conrelid::regclass::text AS table_name, conname FROM pg_constraint "
+        "WHERE contype = 'f' AND confrelid = 'articles'::regclass"
+    )).all()
+    for table_name, constraint in foreign_keys:
+        connection.execute(text(f'ALTER TABLE {table_name} DROP CONSTRAINT "{constraint}"'))
+
+    # old table and its indexes step aside, the model's index names are reused
+    connection.execute(text("ALTER TABLE articles RENAME TO articles_unpartitioned"))
+    for (index,) in connection.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'articles_unpartitioned'"
+    )).all():
+        connection.execute(text(f'ALTER INDEX "{index}" RENAME TO "{index[:48]}_unpartitioned"'))
+    connection.execute(text("ALTER TABLE articles_partitioned RENAME TO articles"))
+    connection.execute(text("ALTER TABLE articles RENAME CONSTRAINT articles_partitioned_pkey TO articles_pkey"))
+    connection.execute(text("ALTER SEQUENCE IF EXISTS articles_id_seq OWNED BY articles.id"))
+
+    # indexes on the parent are created on every partition, present and future
+    for index in Article.__table__.indexes:
+        index.create(connection)
+
+    create_cascade_function(connection)
+    connection.execute(text(
+        "CREATE TRIGGER articles_delete_cascade AFTER DELETE ON articles "
+        "FOR EACH ROW EXECUTE FUNCTION articles_delete_cascade()"
+    ))
+
+    if drop_old:
+        connection.execute(text("DROP TABLE articles_unpartitioned"))
+    connection.execute(text("ANALYZE articles"))
+
+    logger.info(f"Partitioned articles - {copied} rows copied into {len(partitions)} month partitions")
+    return {"rows": copied, "partitions": len(partitions), "old_table_dropped": drop_old}
+
+
+def archive_partition(connection: Connection, name: str, archive_dir: str) -> dict:
+    # Cold archive: write one month's rows to a gzip NDJSON file (the
+    # export format), then detach and drop the partition together with its
+    # bodies, tag links and search entries. The month only blocks writes
+    # (SHARE lock) while the file is written; the file is fsynced before
+    # anything is dropped, and a failure rolls back leaving the month attached.
+    _lock(connection)
+    connection.execute(text(f"LOCK TABLE {name} IN SHARE MODE"))
+
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.ndjson.gz")
+    partial = path + ".partial"
+    archived = 0
+    # options on the statement, not the connection - the DDL below runs on
+    # the same connection and can't go through a server-side cursor
+    result = connection.execute(
+        text(
+            f"SELECT {_ARCHIVE_COLUMNS} FROM {name} a "
+            "LEFT JOIN article_bodies b ON b.article_id = a.id ORDER BY a.id"
+        ).execution_options(stream_results=True, yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    with open(partial, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9) as archive:
+            for rows in result.partitions():
+                archive.write(_encode_ndjson(rows).encode("utf-8"))
+                archived += len(rows)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(partial, path)
+
+    connection.execute(text(f"ALTER TABLE articles DETACH PARTITION {name}"))
+    connection.execute(text(f"DELETE FROM article_tags WHERE article_id IN (SELECT id FROM {name})"))
+    connection.execute(text(f"DELETE FROM article_bodies WHERE article_id IN (SELECT id FROM {name})"))
+    connection.execute(text(f"DELETE FROM article_search WHERE article_id IN (SELECT id FROM {name})"))
+    connection.execute(text(f"DROP TABLE {name}"))
+
+    logger.info(f"Archived partition {name} - {archived} articles to {path}")
+    return {"partition": name, "rows": archived, "path": path, "bytes": os.path.getsize(path)}
+
+
+def partitions_before(connection: Connection, cutoff: datetime) -> List[str]:
+    # Month partitions that end on or before the cutoff month
+    return [
+        p["name"] for p in list_partitions(connection)
+        if partition_month(p["name"]) is not None and add_months(partition_month(p["name"]), 1) <= month_start(cutoff)
+    ]
+
+
+def restore_archive(connection: Connection, path: str, batch_size: int = 1000) -> int:
+    # Re-attach an archived month: recreate its partition and insert the
+    # rows with their original ids and timestamps, plus bodies, tags and
+    # search entries. Counters are not touched - callers rebuild them.
+    _lock(connection)
+    restored = 0
+    batch = []
+
+    def flush():
+        nonlocal restored
+        if not batch:
+            return
+        months = {month_start(row["created_at"]) for row in batch}
+        existing = {p["name"] for p in list_partitions(connection)}
+        for month in months:
+            if partition_name(month) not in existing:
+                create_partition(connection, month)
+        connection.execute(insert(Article), [article_row(row) for row in batch])
+        bodies = [body_row(row["id"], row["content"]) for row in batch if row["content"] is not None]
+        if bodies:
+            connection.execute(insert(ArticleBody), bodies)
+        links = [{"article_id": row["id"], "tag": tag} for row in batch for tag in normalize_tags(row["tags"])]
+        if links:
+            connection.execute(insert(ArticleTag), links)
+        index_articles(connection, [(row["id"], row["title"], row["content"]) for row in batch])
+        restored += len(batch)
+        batch.clear()
+
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            for name in ("created_at", "updated_at"):
+                row[name] = datetime.fromisoformat(row[name]) if row[name] else None
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush()
+    flush()
+
+    logger.info(f"Restored {restored} articles from {path}")
+    return restored
@@ -0,0 +1,124 @@
+import threading
+import time
+from typing import Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+
+class PoolStats:
+    # Counters for one connection pool, fed by the pool class below and
+    # by pool events. Thread-safe - sync handlers run on a threadpool.
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkins = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.closes = 0
+            self.invalidations = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.peak_checked_out = 0
+            self.peak_overflow = 0
+
+    def record_checkout(self, wait: float, checked_out: int, overflow: int):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_timeout(self, wait: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def incr(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "closes": self.closes,
+                "invalidations": self.invalidations,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+            }
+        # live gauges straight from the pool (QueuePool only)
+        for gauge in ("size", "checkedin", "checkedout", "overflow"):
+            if hasattr(pool, gauge):
+                data[gauge] = getattr(pool, gauge)()
+        data["status"] = pool.status()
+        return data
+
+
+def instrumented_pool_class(base, stats: PoolStats):
+    # Pool events fire after a connection is handed out, so the time spent
+    # waiting for one is measured around _do_get instead. Stats live on the
+    # class, which survives pool.recreate() (it instantiates self.__class__).
+    class InstrumentedPool(base):
+        pool_stats = stats
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except PoolTimeoutError:
+                self.pool_stats.record_timeout(time.perf_counter() - start)
+                raise
+            self.pool_stats.record_checkout(
+                time.perf_counter() - start,
+                self.checkedout(),
+                max(self.overflow(), 0)
+            )
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+# name -> (engine, stats), read by the internal stats endpoint
+_registry: Dict[str, tuple] = {}
+
+
+def attach_pool_listeners(engine: Engine, stats: PoolStats) -> None:
+    # Connection churn: new DBAPI connections, closes and invalidations
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.incr("connects")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        stats.incr("checkins")
+
+    @event.listens_for(engine, "close")
+    def _on_close(dbapi_connection, connection_record):
+        stats.incr("closes")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.incr("invalidations")
+
+    _registry[stats.name] = (engine, stats)
+
+
+def pool_snapshot() -> dict:
+    # engine.pool is read at call time - dispose() swaps in a new pool
+    return {name: stats.snapshot(engine.pool) for name, (engine, stats) in _registry.items()}
@@ -0,0 +1,76 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import load_only, selectinload, with_expression
+from app.models import Article
+from app.bodies import PREVIEW_LENGTH
+from app.tags import split_tags
+from app.config import settings
+
+# Item shapes for the list endpoint
+FULL_FIELDS = ("id", "title", "content", "author", "tags", "created_at", "updated_at")
+SUMMARY_FIELDS = ("id", "title", "author", "tags", "created_at", "updated_at", "excerpt")
+ALLOWED_FIELDS = FULL_FIELDS + ("excerpt",)
+
+# excerpts are cut from articles.preview, so they can't be longer than it
+EXCERPT_LENGTH = min(settings.EXCERPT_LENGTH, PREVIEW_LENGTH - 1)
+
+# always loaded: identity, keyset cursor and ETag need them
+_REQUIRED_COLUMNS = ("id", "created_at", "updated_at")
+
+
+def resolve_fields(fields: Optional[str], view: str) -> Tuple[str, ...]:
+    # fields= wins over view=; id is always returned. Raises ValueError
+    # for unknown field names.
+    if not fields:
+        return SUMMARY_FIELDS if view == "summary" else FULL_FIELDS
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in ALLOWED_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(ALLOWED_FIELDS)}")
+
+    return ("id",) + tuple(f for f in ALLOWED_FIELDS if f in requested and f != "id")
+
+
+def projection_options(fields: Tuple[str, ...]) -> List:
+    # Loader options that fetch only what the response needs - bodies are
+    # read (one extra query for the page) only when content is asked for,
+    # the excerpt is cut in SQL from the inline preview
+    columns = [getattr(Article, name) for name in FULL_FIELDS
+               if name != "content" and (name in fields or name in _REQUIRED_COLUMNS)]
+    options = [load_only(*columns)]
+    if "content" in fields:
+        options.append(selectinload(Article.body))
+    if "excerpt" in fields:
+        # one extra character tells make_excerpt whether the text was cut
+        options.append(with_expression(
+            Article.excerpt,
+            func.substr(Article.preview, 1, EXCERPT_LENGTH + 1)
+        ))
+    return options
+
+
+def make_excerpt(text: Optional[str], length: Optional[int] = None) -> Optional[str]:
+    # Trim to length characters on a word boundary, with an ellipsis if cut
+    if text is None:
+        return None
+    length = length or EXCERPT_LENGTH
+    if len(text) <= length:
+        return text
+    cut = text[:length]
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + "…"
+
+
+def article_item(article: Article, fields: Tuple[str, ...]) -> dict:
+    item = {}
+    for name in fields:
+        if name == "excerpt":
+            item["excerpt"] = make_excerpt(article.excerpt)
+        elif name == "tags":
+            item["tags"] = split_tags(article.tags)
+        else:
+            # datetimes are encoded by the response (app/serialization.py)
+            item[name] = getattr(article, name)
+    return item
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from app import database
+from app.config import Settings
+from app.metrics import STARTUP_SECONDS
+from app.logger import logger
+
+# Startup and readiness. The lifespan of create_app (app/main.py) creates
+# the engines, then opens DB_POOL_WARMUP connections in every pool that
+# serves the API, so the first requests find them open, and compares the
+# database's Alembic revision with the migration scripts. GET /ready
+# answers 503 until both have passed (a probe retries whatever failed,
+# e.g. after `alembic upgrade head` ran or the database came back).
+#
+# Every phase is timed - logged once, returned by /ready and exported as
+# app_startup_seconds - so a slower cold start shows up like any other
+# regression.
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+
+
+def _warm_count(pool, count: int) -> int:
+    # never more than the pool keeps; single-connection pools (in-memory
+    # SQLite) have no size()
+    return min(count, pool.size()) if hasattr(pool, "size") else min(count, 1)
+
+
+def warm_sync_pool(engine, count: int) -> int:
+    # Hold `count` connections at once, so the pool opens that many, then
+    # hand them all back. Returns how many were opened.
+    count = _warm_count(engine.pool, count)
+    connections = []
+    try:
+        for _ in range(count):
+            connection = engine.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+    return count
+
+
+async def warm_async_pool(engine, count: int) -> int:
+    count = _warm_count(engine.pool, count)
+    connections = []
+    try:
+        for _ in range(count):
+            connection = await engine.connect()
+            connections.append(connection)
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
+    return count
+
+
+@lru_cache(maxsize=1)
+def migration_heads() -> FrozenSet[str]:
+    # alembic is only imported when the check runs
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    return frozenset(ScriptDirectory.from_config(Config(str(ALEMBIC_INI))).get_heads())
+
+
+def current_revisions(engine) -> FrozenSet[str]:
+    # empty when the database has no alembic_version table
+    from alembic.runtime.migration import MigrationContext
+    with engine.connect() as connection:
+        return frozenset(MigrationContext.configure(connection).get_current_heads())
+
+
+class Readiness:
+    # Per-app readiness state, on app.state.readiness
+
+    def __init__(self, config: Settings):
+        self.config = config
+        self.warm = config.DB_POOL_WARMUP <= 0
+        self.migrations_ok = not config.READY_REQUIRE_MIGRATIONS
+        self.migrations: Dict[str, list] = {}
+        self.warmed: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self.warm and self.migrations_ok
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = round(seconds, 6)
+        STARTUP_SECONDS.set(phase, value=seconds)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    async def warm_up(self) -> None:
+        # The pools the API reads from - the async ones with ASYNC_DB. A
+        # replica that can't be reached is only logged: reads fall back to
+        # the primary, so it doesn't hold readiness back.
+        count = self.config.DB_POOL_WARMUP
+        if database.async_engine is not None:
+            pools = [("async", database.async_engine, True)]
+            pools += [(f"async-replica{i}", e, False) for i, e in enumerate(database.async_replica_engines)]
+        else:
+            pools = [("primary", database.engine, True)]
+            if database.replica_set is not None:
+                pools += [(f"replica{i}", e, False) for i, e in enumerate(database.replica_set.engines)]
+
+        warm = True
+        for name, engine, required in pools:
+            try:
+                if database.async_engine is not None:
+                    self.warmed[name] = await warm_async_pool(engine, count)
+                else:
+                    self.warmed[name] = await run_in_threadpool(warm_sync_pool, engine, count)
+                self.errors.pop(f"warmup:{name}", None)
+            except Exception as e:
+                self.errors[f"warmup:{name}"] = str(e).splitlines()[0]
+                if required:
+                    warm = False
+                    logger.error(f"Could not warm up the {name} connection pool - Error: {str(e)}")
+                else:
+                    logger.warning(f"Could not warm up the {name} connection pool - Error: {str(e)}")
+        self.warm = warm
+
+    def check_migrations(self) -> None:
+        try:
+            heads = migration_heads()
+            current = current_revisions(database.get_engine())
+        except Exception as e:
+            self.errors["migrations"] = str(e).splitlines()[0]
+            logger.error(f"Could not check the database migration revision - Error: {str(e)}")
+            return
+        self.errors.pop("migrations", None)
+        self.migrations = {"current": sorted(current), "head": sorted(heads)}
+        self.migrations_ok = current == heads
+        if not self.migrations_ok:
+            logger.warning(f"Database is at revision {sorted(current) or 'none'}, migrations are at {sorted(heads)}")
+
+    async def check(self, startup: bool = False) -> bool:
+        # Runs whatever hasn't passed yet; once ready, stays ready. Only the
+        # startup run is timed - later probes would overwrite the numbers.
+        async with self._lock:
+            if not self.warm:
+                with self.phase("warmup") if startup else nullcontext():
+                    await self.warm_up()
+            if not self.migrations_ok:
+                with self.phase("migrations") if startup else nullcontext():
+                    await run_in_threadpool(self.check_migrations)
+        return self.ready
+
+    def snapshot(self) -> dict:
+        return {
+            "ready": self.ready,
+            "pool_warm": self.warm,
+            "migrations_at_head": self.migrations_ok,
+            "migrations": self.migrations,
+            "warmed_connections": self.warmed,
+            "startup_seconds": self.timings,
+            "errors": self.errors,
+        }
+
+    def log_startup(self, total: Optional[float] = None) -> None:
+        if total is not None:
+            self.record("total", total)
+        phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.timings.items())
+        waiting = [name for name, ok in (("pool warm-up", self.warm), ("migrations", self.migrations_ok)) if not ok]
+        state = "ready" if self.ready else f"not ready - waiting for {' and '.join(waiting)}"
+        logger.info(f"Startup: {phases} - {state}")
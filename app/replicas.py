@@ -0,0 +1,138 @@
+import threading
+import time
+from typing import List, Optional
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from app.config import Settings, settings
+from app.logger import logger
+
+# Read replicas (REPLICA_DATABASE_URLS). GET handlers take their session
+# from a replica picked round-robin among the healthy ones; writes always
+# use the primary. A replica is taken out of rotation when a connection to
+# it fails, and put back once a background SELECT 1 succeeds again.
+#
+# Read-your-writes: every successful write response sets a short-lived
+# cookie, and requests carrying it read from the primary until it expires,
+# so an editor never sees the replica lag behind their own change.
+
+STICKY_COOKIE = "primary_until"
+
+
+class ReplicaSet:
+
+    def __init__(self, engines: List[Engine], health_interval: float):
+        self.engines = engines
+        self.health_interval = health_interval
+        self.healthy = [True] * len(engines)
+        self.failures = [0] * len(engines)
+        self._next = 0
+        self._lock = threading.Lock()
+        self._checker: Optional[threading.Thread] = None
+
+        for index, engine in enumerate(engines):
+            self._watch(index, engine)
+
+    def _watch(self, index: int, engine: Engine) -> None:
+        # Connection refused / dropped -> out of rotation right away,
+        # without waiting for the next health check
+        @event.listens_for(engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect or context.connection is None:
+                self.mark(index, False, str(context.original_exception).splitlines()[0])
+
+    def mark(self, index: int, healthy: bool, reason: str = "") -> None:
+        with self._lock:
+            if self.healthy[index] == healthy:
+                return
+            self.healthy[index] = healthy
+            if not healthy:
+                self.failures[index] += 1
+        if healthy:
+            logger.info(f"Replica {index} is healthy again, back in rotation")
+        else:
+            logger.warning(f"Replica {index} removed from rotation - Error: {reason}")
+
+    def pick(self) -> Optional[int]:
+        # Index of the next healthy replica, None if all are down
+        # (callers fall back to the primary)
+        self._start_checker()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                index = self._next
+                self._next = (self._next + 1) % len(self.engines)
+                if self.healthy[index]:
+                    return index
+        return None
+
+    def check(self) -> None:
+        for index, engine in enumerate(self.engines):
+            try:
+                with engine.connect() as connection:
+                    connection.execute(text("SELECT 1"))
+                self.mark(index, True)
+            except Exception as e:
+                self.mark(index, False, str(e).splitlines()[0])
+
+    def _start_checker(self) -> None:
+        # started lazily, from the first request, so imports stay side-effect free
+        if self._checker is not None or self.health_interval <= 0:
+            return
+        with self._lock:
+            if self._checker is not None:
+                return
+            self._checker = threading.Thread(target=self._run_checks, name="replica-health", daemon=True)
+        self._checker.start()
+
+    def _run_checks(self) -> None:
+        while True:
+            time.sleep(self.health_interval)
+            self.check()
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [
+                {
+                    "replica": index,
+                    "url": engine.url.render_as_string(hide_password=True),
+                    "healthy": self.healthy[index],
+                    "failures": self.failures[index],
+                }
+                for index, engine in enumerate(self.engines)
+            ]
+
+
+def prefers_primary(cookies: dict) -> bool:
+    # True while the client's read-your-writes window is open
+    try:
+        return float(cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    # Plain ASGI middleware: successful non-GET responses get the sticky cookie
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, app, window: float):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS or self.window <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window
+                cookie = f"{STICKY_COOKIE}={until:.3f}; Max-Age={int(self.window) or 1}; Path=/; HttpOnly; SameSite=Lax"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def replica_urls(config: Settings = settings) -> List[str]:
+    return [url.strip() for url in (config.REPLICA_DATABASE_URLS or "").split(",") if url.strip()]
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from app.database import get_db
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional, List, Literal
+from datetime import datetime
+from app.database import get_db, get_read_db
 from app.models import Article
+from app.tags import normalize_tags, set_article_tags
+from app.counts import adjust_counts, tag_deltas, estimate_total
+from app.filters import DateBound, filtered_total
+from app.listing import ArticleList
+from app.cache import article_cache, list_cache
+from app.serialization import success_response, message_response, article_data
+from app.group_commit import group_committer, created_article_data
+from app.conditional import (
+    article_etag, is_not_modified, has_conditional_headers,
+    validator_headers, not_modified_response
+)
 from app.schemas.article import ArticleResponse, ArticleCreate, PaginatedArticleResponse, ArticleUpdate
 from app.schemas.response import BaseResponse, MessageResponse, ErrorResponse
+from app.config import settings
 from app.logger import logger 
 
 router = APIRouter()
@@ -30,7 +44,8 @@ router = APIRouter()
                             "content": "এই আর্টিকেলে আমরা FastAPI-এর সাথে ...",
                             "author": "Suborno",
                             "tags": ["fastapi", "python"],
-                            "created_at": "2025-01-01T12:00:00"
+                            "created_at": "2025-01-01T12:00:00",
+                            "updated_at": "2025-01-01T12:00:00"
                         }
                     }
                 }
@@ -72,41 +87,34 @@ def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
     logger.info(f"Incoming POST /articles - Title: '{article.title}', Author: '{article.author or 'Anonymous'}'")
 
     try:
-        # Prepare tags as comma-separated string
-        tags_str = None
-        if isinstance(article.tags, list):
-            tags_str = ", ".join(article.tags)
-        elif isinstance(article.tags, str):
-            tags_str = article.tags.strip()
+        # Group commit - insert together with concurrent creates in one transaction
+        if group_committer is not None:
+            row = anyio.from_thread.run(group_committer.submit, article)
+            logger.info(f"Success: Article created (group commit) - ID: {row.id}, Title: '{article.title}'")
+            return success_response(created_article_data(article, row), status_code=status.HTTP_201_CREATED)
 
         # Create new Article instance
         db_article = Article(
             title=article.title,
             content=article.content,
-            tags=tags_str,
             author=article.author if article.author else "Anonymous"
         )
 
-        # Save to database
+        # Store tags as comma-separated string + normalized article_tags rows
+        added_tags, _ = set_article_tags(db_article, article.tags)
+
+        # Save to database (counters are bumped in the same transaction)
         db.add(db_article)
+        adjust_counts(db, total_delta=1, tag_delta=tag_deltas(added=added_tags))
         db.commit()
+        list_cache.invalidate(added_tags)
         db.refresh(db_article)
 
         # Log success
         logger.info(f"Success: Article created - ID: {db_article.id}, Title: '{db_article.title}'")
 
         # Return formatted response
-        return {
-            "success": True,
-            "data": {
-                "id": db_article.id,
-                "title": db_article.title,
-                "content": db_article.content,
-                "author": db_article.author,
-                "tags": db_article.tags,
-                "created_at": db_article.created_at.isoformat() if db_article.created_at else None
-            }
-        }
+        return success_response(article_data(db_article), status_code=status.HTTP_201_CREATED)
 
     except Exception as e:
         # Log error and return clean 500 response
@@ -117,12 +125,21 @@ def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
         )
 
 
-# GET all articles - with page-based pagination and tag filter
+# GET all articles - with page-based pagination and author/date/tag filters
 @router.get(
     "/",
     response_model=BaseResponse[PaginatedArticleResponse],
     summary="List all articles",
-    description="You can view a list of all articles using pagination and tag filters. The default is page 1 and the limit is 10.",
+    description=(
+        "You can view a list of all articles using pagination and filters. The default is page 1 and the limit is 10. "
+        "Articles are returned newest first. Filter by `author`, by creation date (`created_after` inclusive, "
+        "`created_before` exclusive - e.g. one month's archive) and by one or more `tag`s "
+        "(repeat the parameter or comma-separate; `tag_mode=all` requires every tag, `any` at least one). For deep paging, pass the `next_cursor` from the previous response as `cursor` "
+        "instead of `page` - every cursor page costs the same, no matter how far in you are. "
+        "`count` controls `meta.total`: `exact` (default, from maintained counters - or a COUNT when filtering by author, date or several tags), `estimate` (planner estimate on Postgres) "
+        "or `none` (skip the total, for infinite scroll). "
+        "Use `view=summary` (no content, plus a short `excerpt`) or `fields=title,author,...` to fetch only what an index page needs."
+    ),
     responses={  # ← এখানে responses যোগ করো
         200: {
             "description": "List of articles with pagination metadata",
@@ -138,19 +155,37 @@ def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
                                     "content": "Sample content...",
                                     "author": "Suborno",
                                     "tags": ["python"],
-                                    "created_at": "2025-01-01T12:00:00"
+                                    "created_at": "2025-01-01T12:00:00",
+                                    "updated_at": "2025-01-01T12:00:00"
                                 }
                             ],
                             "meta": {
                                 "page": 1,
                                 "limit": 10,
-                                "total": 47
+                                "total": 47,
+                                "total_pages": 5,
+                                "next_cursor": "WyIyMDI1LTAxLTAxVDEyOjAwOjAwIiwxXQ",
+                                "count": "exact"
                             }
                         }
                     }
                 }
             }
         },
+        304: {
+            "description": "Not modified - the page still matches the ETag sent in If-None-Match"
+        },
+        400: {
+            "description": "Invalid cursor, unknown field in `fields` or an empty date range",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": False,
+                        "error": "Invalid cursor"
+                    }
+                }
+            }
+        },
         500: {
             "description": "Internal server error",
             "content": {
@@ -165,60 +200,55 @@ def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
     }
 )
 def get_articles(
-    db: Session = Depends(get_db),
-    tag: Optional[str] = Query(None, description="Filter by tag"),
+    request: Request,
+    db: Session = Depends(get_read_db),
+    tag: Optional[List[str]] = Query(None, description="Filter by tag (repeat or comma-separate for several)"),
+    tag_mode: Literal["all", "any"] = Query("all", description="With several tags: all = every tag, any = at least one"),
+    author: Optional[str] = Query(None, description="Filter by author (exact match)"),
+    created_after: Optional[DateBound] = Query(None, description="Only articles created at or after this date/time (UTC unless it has an offset)"),
+    created_before: Optional[DateBound] = Query(None, description="Only articles created before this date/time (UTC unless it has an offset)"),
     page: int = Query(1, ge=1, description="Page number (starts from 1)"),
-    limit: int = Query(10, ge=1, le=100, description="Items per page (1-100)")
+    limit: int = Query(10, ge=1, le=100, description="Items per page (1-100)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.next_cursor (keyset pagination, overrides page)"),
+    count: Literal["exact", "estimate", "none"] = Query("exact", description="How to compute meta.total: exact, estimate or none"),
+    view: Literal["full", "summary"] = Query("full", description="full = every column, summary = no content, plus an excerpt"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return (overrides view), e.g. title,author,excerpt")
 ):
     
     # Log incoming request with query params
-    logger.info(f"Incoming GET /articles?page={page}&limit={limit}&tag={tag}")
+    logger.info(f"Incoming GET /articles?page={page}&limit={limit}&tag={tag}&tag_mode={tag_mode}&author={author}&created_after={created_after}&created_before={created_before}&cursor={cursor}&count={count}&view={view}&fields={fields}")
 
+    # Filters, cursor and fields are checked up front so a bad one is a 400,
+    # not a 500 (see app/listing.py - shared with the async router)
     try:
-        # Build base query
-        query = db.query(Article)
-
-        # Apply tag filter if provided
-        if tag:
-            query = query.filter(Article.tags.ilike(f"%{tag}%"))
-
-        # Get total count (before pagination)
-        total = query.count()
-
-        # Calculate skip/offset based on page
-        skip = (page - 1) * limit
-
-        # Fetch paginated articles
-        articles = query.offset(skip).limit(limit).all()
-
-        # Prepare response data
-        paginated = {
-            "items": [
-                {
-                    "id": a.id,
-                    "title": a.title,
-                    "content": a.content,
-                    "author": a.author,
-                    "tags": a.tags,
-                    "created_at": a.created_at.isoformat() if a.created_at else None
-                }
-                for a in articles
-            ],
-            "meta": {
-                "page": page,
-                "limit": limit,
-                "total": total,
-                "total_pages": (total + limit - 1) // limit if limit > 0 else 1
-            }
-        }
-
-        # Log success with number of items fetched
-        logger.info(f"Success: Fetched {len(articles)} articles on page {page} (total: {total})")
+        listing = ArticleList(tag, tag_mode, author, created_after, created_before, page, limit, cursor, count, view, fields)
+    except ValueError as e:
+        logger.warning(f"Failure: Invalid list parameters - {e}")
+        raise HTTPException(
+            status_code=400,
+            detail={"success": False, "error": str(e)}
+        )
 
-        return {
-            "success": True,
-            "data": paginated
-        }
+    try:
+        if listing.cache_key is not None:
+            cached = listing.cached(request, list_cache.claim(listing.cache_key))
+            if cached is not None:
+                return cached
+
+        # Planner estimate (Postgres only)
+        if count == "estimate":
+            listing.total = estimate_total(db, listing.statement(), filtered=listing.filters.active)
+
+        if listing.validates_first(request):
+            rows = db.execute(listing.light_statement()).all()
+            counted = filtered_total(db, listing.filters) if listing.needs_total(rows) else None
+            not_modified = listing.not_modified(request, rows, counted)
+            if not_modified is not None:
+                return not_modified
+
+        rows = db.execute(listing.page_statement()).all()
+        counted = filtered_total(db, listing.filters) if listing.needs_total(rows) else None
+        return listing.response(request, rows, counted, replica=db.info.get("replica", False))
 
     except Exception as e:
         # Log error and return clean 500 response
@@ -228,6 +258,10 @@ def get_articles(
             detail={"success": False, "error": "Unable to fetch articles. Try again later."}
         )
 
+    finally:
+        if listing.cache_owner:
+            list_cache.release(listing.cache_key)
+
 
 # GET single article by ID
 @router.get(
@@ -248,12 +282,16 @@ def get_articles(
                             "content": "...",
                             "author": "Suborno",
                             "tags": ["python"],
-                            "created_at": "2025-01-01T12:00:00"
+                            "created_at": "2025-01-01T12:00:00",
+                            "updated_at": "2025-01-01T12:00:00"
                         }
                     }
                 }
             }
         },
+        304: {
+            "description": "Not modified - matched If-None-Match (ETag) or If-Modified-Since"
+        },
         404: {
             "description": "Article not found",
             "content": {
@@ -267,13 +305,37 @@ def get_articles(
         }
     }
 )
-def get_article(id: int, db: Session = Depends(get_db)):
+def get_article(id: int, request: Request, db: Session = Depends(get_read_db)):
     
     # Log incoming request
     logger.info(f"Incoming GET /articles/{id}")
 
+    # Hot articles are served from the cache without touching the pool
+    cached = article_cache.get(id)
+    if cached is not None:
+        updated_at = datetime.fromisoformat(cached["updated_at"]) if cached.get("updated_at") else None
+        etag = article_etag(id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            logger.info(f"Success: Article not modified - ID: {id}")
+            return not_modified_response(etag, updated_at)
+
+        logger.info(f"Success: Fetched article from cache - ID: {id}")
+        return success_response(cached, headers=validator_headers(etag, updated_at))
+
     try:
-        article = db.query(Article).filter(Article.id == id).first()
+        generation = article_cache.generation(id)
+
+        # Conditional request - compare versions before loading the whole row
+        if has_conditional_headers(request):
+            updated_at = db.query(Article.updated_at).filter(Article.id == id).scalar()
+            if updated_at is not None:
+                etag = article_etag(id, updated_at)
+                if is_not_modified(request, etag, updated_at):
+                    logger.info(f"Success: Article not modified - ID: {id}")
+                    return not_modified_response(etag, updated_at)
+
+        # body in the same query (it's returned below)
+        article = db.query(Article).options(joinedload(Article.body)).filter(Article.id == id).first()
 
         if not article:
             # Log warning for not found
@@ -286,17 +348,16 @@ def get_article(id: int, db: Session = Depends(get_db)):
         # Log success
         logger.info(f"Success: Fetched article - ID: {id}, Title: '{article.title}'")
 
-        return {
-            "success": True,
-            "data": {
-                "id": article.id,
-                "title": article.title,
-                "content": article.content,
-                "author": article.author,
-                "tags": article.tags,
-                "created_at": article.created_at.isoformat() if article.created_at else None
-            }
-        }
+        data = article_data(article)
+        # a lagging replica may still return the row as it was before a recent write
+        if not (db.info.get("replica") and article_cache.invalidated_within(settings.READ_YOUR_WRITES_SECONDS)):
+            article_cache.set(id, data, generation)
+
+        return success_response(data, headers=validator_headers(article_etag(id, article.updated_at), article.updated_at))
+
+    except HTTPException:
+        # 404s are already clean responses - don't turn them into 500s
+        raise
 
     except Exception as e:
         # Log unexpected error
@@ -330,7 +391,8 @@ def get_article(id: int, db: Session = Depends(get_db)):
                             "content": "এই আর্টিকেলে আমরা FastAPI-এর সাথে ... (Updated content)",
                             "author": "Suborno",
                             "tags": ["fastapi", "python", "api"],
-                            "created_at": "2026-01-25T11:29:39.161433"
+                            "created_at": "2026-01-25T11:29:39.161433",
+                            "updated_at": "2026-01-25T11:29:39.161433"
                         }
                     }
                 }
@@ -401,28 +463,28 @@ def update_article(
             detail={"success": False, "error": "At least one field must be provided for update"}
         )
 
-    # Apply updates
+    # Apply updates (list pages of the old and the new tags both change)
+    touched_tags = normalize_tags(db_article.tags)
+    tag_delta = None
     for key, value in update_data.items():
-        setattr(db_article, key, value)
+        if key == "tags":
+            added_tags, removed_tags = set_article_tags(db_article, value)
+            tag_delta = tag_deltas(added=added_tags, removed=removed_tags)
+        else:
+            setattr(db_article, key, value)
+    touched_tags += normalize_tags(db_article.tags)
 
     try:
+        adjust_counts(db, tag_delta=tag_delta)
         db.commit()
+        article_cache.invalidate(id)
+        list_cache.invalidate(touched_tags)
         db.refresh(db_article)
 
         # Log success
         logger.info(f"Success: Updated article - ID: {id}")
 
-        return {
-            "success": True,
-            "data": {
-                "id": db_article.id,
-                "title": db_article.title,
-                "content": db_article.content,
-                "author": db_article.author,
-                "tags": db_article.tags,
-                "created_at": db_article.created_at.isoformat() if db_article.created_at else None
-            }
-        }
+        return success_response(article_data(db_article))
 
     except Exception as e:
         logger.error(f"Failure: PUT /articles/{id} failed - Error: {str(e)}")
@@ -495,13 +557,20 @@ def delete_article(
                 detail={"success": False, "error": "Article not found"}
             )
 
+        removed_tags = normalize_tags(article.tags)
         db.delete(article)
+        adjust_counts(db, total_delta=-1, tag_delta=tag_deltas(removed=removed_tags))
         db.commit()
+        article_cache.invalidate(id)
+        list_cache.invalidate(removed_tags)
 
         # Log success
         logger.info(f"Success: Deleted article - ID: {id}")
 
-        return MessageResponse(success=True, message="Article deleted successfully")
+        return message_response("Article deleted successfully")
+
+    except HTTPException:
+        raise
 
     except Exception as e:
         logger.error(f"Failure: DELETE /articles/{id} failed - Error: {str(e)}")
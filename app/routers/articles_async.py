@@ -0,0 +1,301 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from typing import Optional, List, Literal
+from datetime import datetime
+from app.database import get_async_db, get_async_read_db
+from app.models import Article
+from app.tags import normalize_tags, set_article_tags
+from app.counts import adjust_counts, tag_deltas, estimate_total
+from app.filters import DateBound, filtered_total
+from app.listing import ArticleList
+from app.cache import article_cache, list_cache
+from app.serialization import success_response, message_response, article_data
+from app.group_commit import group_committer, created_article_data
+from app.conditional import (
+    article_etag, is_not_modified, has_conditional_headers,
+    validator_headers, not_modified_response
+)
+from app.schemas.article import ArticleCreate, ArticleUpdate
+from app.routers import articles as sync_articles
+from app.config import settings
+from app.logger import logger
+
+# Async twin of app/routers/articles.py (enabled with ASYNC_DB=True).
+# Handlers run on the event loop with an AsyncSession, so in-flight requests
+# are no longer capped by Starlette's threadpool. Paths, parameters, responses
+# and OpenAPI docs are identical to the sync router.
+router = APIRouter()
+
+
+def _docs(endpoint) -> dict:
+    # Reuse the route metadata (response model, summary, examples...) of the sync handler
+    route = next(r for r in sync_articles.router.routes if r.endpoint is endpoint)
+    return {
+        "response_model": route.response_model,
+        "status_code": route.status_code,
+        "summary": route.summary,
+        "description": route.description,
+        "responses": route.responses,
+    }
+
+
+# POST endpoint - Create a new article
+@router.post("/", **_docs(sync_articles.create_article))
+async def create_article(article: ArticleCreate, db: AsyncSession = Depends(get_async_db)):
+
+    # Log incoming request details
+    logger.info(f"Incoming POST /articles (async) - Title: '{article.title}', Author: '{article.author or 'Anonymous'}'")
+
+    try:
+        # Group commit - insert together with concurrent creates in one transaction
+        if group_committer is not None:
+            row = await group_committer.submit(article)
+            logger.info(f"Success: Article created (group commit) - ID: {row.id}, Title: '{article.title}'")
+            return success_response(created_article_data(article, row), status_code=status.HTTP_201_CREATED)
+
+        db_article = Article(
+            title=article.title,
+            content=article.content,
+            author=article.author if article.author else "Anonymous"
+        )
+        # new object - tag_links is empty, no lazy load involved
+        added_tags, _ = set_article_tags(db_article, article.tags)
+
+        # Save to database (counters are bumped in the same transaction)
+        db.add(db_article)
+        await db.run_sync(adjust_counts, total_delta=1, tag_delta=tag_deltas(added=added_tags))
+        await db.commit()
+        list_cache.invalidate(added_tags)
+        await db.refresh(db_article)
+        # refresh() leaves relationships unloaded - the body is returned below
+        await db.refresh(db_article, ["body"])
+
+        logger.info(f"Success: Article created - ID: {db_article.id}, Title: '{db_article.title}'")
+
+        return success_response(article_data(db_article), status_code=status.HTTP_201_CREATED)
+
+    except Exception as e:
+        logger.error(f"Failure: POST /articles (async) failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Something went wrong on our end. Please try again later."}
+        )
+
+
+# GET all articles - with page-based or cursor pagination and author/date/tag filters
+@router.get("/", **_docs(sync_articles.get_articles))
+async def get_articles(
+    request: Request,
+    db: AsyncSession = Depends(get_async_read_db),
+    tag: Optional[List[str]] = Query(None, description="Filter by tag (repeat or comma-separate for several)"),
+    tag_mode: Literal["all", "any"] = Query("all", description="With several tags: all = every tag, any = at least one"),
+    author: Optional[str] = Query(None, description="Filter by author (exact match)"),
+    created_after: Optional[DateBound] = Query(None, description="Only articles created at or after this date/time (UTC unless it has an offset)"),
+    created_before: Optional[DateBound] = Query(None, description="Only articles created before this date/time (UTC unless it has an offset)"),
+    page: int = Query(1, ge=1, description="Page number (starts from 1)"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page (1-100)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.next_cursor (keyset pagination, overrides page)"),
+    count: Literal["exact", "estimate", "none"] = Query("exact", description="How to compute meta.total: exact, estimate or none"),
+    view: Literal["full", "summary"] = Query("full", description="full = every column, summary = no content, plus an excerpt"),
+    fields: Optional[str] = Query(None, description="Comma-separated item fields to return (overrides view), e.g. title,author,excerpt")
+):
+
+    logger.info(f"Incoming GET /articles (async)?page={page}&limit={limit}&tag={tag}&tag_mode={tag_mode}&author={author}&created_after={created_after}&created_before={created_before}&cursor={cursor}&count={count}&view={view}&fields={fields}")
+
+    try:
+        listing = ArticleList(tag, tag_mode, author, created_after, created_before, page, limit, cursor, count, view, fields)
+    except ValueError as e:
+        logger.warning(f"Failure: Invalid list parameters - {e}")
+        raise HTTPException(
+            status_code=400,
+            detail={"success": False, "error": str(e)}
+        )
+
+    try:
+        if listing.cache_key is not None:
+            cached = listing.cached(request, await list_cache.aclaim(listing.cache_key))
+            if cached is not None:
+                return cached
+
+        if count == "estimate":
+            listing.total = await db.run_sync(estimate_total, listing.statement(), listing.filters.active)
+
+        if listing.validates_first(request):
+            rows = (await db.execute(listing.light_statement())).all()
+            counted = await db.run_sync(filtered_total, listing.filters) if listing.needs_total(rows) else None
+            not_modified = listing.not_modified(request, rows, counted)
+            if not_modified is not None:
+                return not_modified
+
+        rows = (await db.execute(listing.page_statement())).all()
+        counted = await db.run_sync(filtered_total, listing.filters) if listing.needs_total(rows) else None
+        return listing.response(request, rows, counted, replica=db.info.get("replica", False))
+
+    except Exception as e:
+        logger.error(f"Failure: GET /articles (async) failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Unable to fetch articles. Try again later."}
+        )
+
+    finally:
+        if listing.cache_owner:
+            list_cache.arelease(listing.cache_key)
+
+
+# GET single article by ID
+@router.get("/{id}", **_docs(sync_articles.get_article))
+async def get_article(id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+
+    logger.info(f"Incoming GET /articles/{id} (async)")
+
+    cached = article_cache.get(id)
+    if cached is not None:
+        updated_at = datetime.fromisoformat(cached["updated_at"]) if cached.get("updated_at") else None
+        etag = article_etag(id, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            logger.info(f"Success: Article not modified - ID: {id}")
+            return not_modified_response(etag, updated_at)
+
+        logger.info(f"Success: Fetched article from cache - ID: {id}")
+        return success_response(cached, headers=validator_headers(etag, updated_at))
+
+    try:
+        generation = article_cache.generation(id)
+
+        # Conditional request - compare versions before loading the whole row
+        if has_conditional_headers(request):
+            updated_at = (await db.execute(select(Article.updated_at).where(Article.id == id))).scalar()
+            if updated_at is not None:
+                etag = article_etag(id, updated_at)
+                if is_not_modified(request, etag, updated_at):
+                    logger.info(f"Success: Article not modified - ID: {id}")
+                    return not_modified_response(etag, updated_at)
+
+        # body in the same query - lazy loading isn't allowed under asyncio
+        article = await db.get(Article, id, options=[joinedload(Article.body)])
+
+        if not article:
+            logger.warning(f"Failure: Article not found - ID: {id}")
+            raise HTTPException(
+                status_code=404,
+                detail={"success": False, "error": "Article not found"}
+            )
+
+        logger.info(f"Success: Fetched article - ID: {id}, Title: '{article.title}'")
+
+        data = article_data(article)
+        # a lagging replica may still return the row as it was before a recent write
+        if not (db.info.get("replica") and article_cache.invalidated_within(settings.READ_YOUR_WRITES_SECONDS)):
+            article_cache.set(id, data, generation)
+
+        return success_response(data, headers=validator_headers(article_etag(id, article.updated_at), article.updated_at))
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"Failure: GET /articles/{id} (async) failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Something went wrong. Please try again later."}
+        )
+
+
+# PUT endpoint - Update an existing article
+@router.put("/{id}", **_docs(sync_articles.update_article))
+async def update_article(
+    id: int,
+    article_update: ArticleUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+
+    update_data = article_update.model_dump(exclude_unset=True)
+    logger.info(f"Incoming PUT /articles/{id} (async) - Updating fields: {list(update_data.keys())}")
+
+    # tag_links and body are loaded up front - lazy loading isn't allowed under asyncio
+    db_article = await db.get(Article, id, options=[selectinload(Article.tag_links), joinedload(Article.body)])
+
+    if not db_article:
+        logger.warning(f"Failure: Article not found - ID: {id}")
+        raise HTTPException(
+            status_code=404,
+            detail={"success": False, "error": "Article not found"}
+        )
+
+    if not update_data:
+        logger.warning(f"Failure: Empty update attempt - ID: {id}")
+        raise HTTPException(
+            status_code=400,
+            detail={"success": False, "error": "At least one field must be provided for update"}
+        )
+
+    touched_tags = normalize_tags(db_article.tags)
+    tag_delta = None
+    for key, value in update_data.items():
+        if key == "tags":
+            added_tags, removed_tags = set_article_tags(db_article, value)
+            tag_delta = tag_deltas(added=added_tags, removed=removed_tags)
+        else:
+            setattr(db_article, key, value)
+    touched_tags += normalize_tags(db_article.tags)
+
+    try:
+        await db.run_sync(adjust_counts, tag_delta=tag_delta)
+        await db.commit()
+        article_cache.invalidate(id)
+        list_cache.invalidate(touched_tags)
+        await db.refresh(db_article)
+        # refresh() leaves relationships unloaded - the body is returned below
+        await db.refresh(db_article, ["body"])
+
+        logger.info(f"Success: Updated article - ID: {id}")
+
+        return success_response(article_data(db_article))
+
+    except Exception as e:
+        logger.error(f"Failure: PUT /articles/{id} (async) failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Something went wrong while updating the article. Please try again later."}
+        )
+
+
+# DELETE endpoint - Delete an article
+@router.delete("/{id}", **_docs(sync_articles.delete_article))
+async def delete_article(id: int, db: AsyncSession = Depends(get_async_db)):
+
+    logger.info(f"Incoming DELETE /articles/{id} (async)")
+
+    try:
+        article = await db.get(Article, id)
+
+        if not article:
+            logger.warning(f"Failure: Article not found - ID: {id}")
+            raise HTTPException(
+                status_code=404,
+                detail={"success": False, "error": "Article not found"}
+            )
+
+        removed_tags = normalize_tags(article.tags)
+        await db.delete(article)
+        await db.run_sync(adjust_counts, total_delta=-1, tag_delta=tag_deltas(removed=removed_tags))
+        await db.commit()
+        article_cache.invalidate(id)
+        list_cache.invalidate(removed_tags)
+
+        logger.info(f"Success: Deleted article - ID: {id}")
+
+        return message_response("Article deleted successfully")
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"Failure: DELETE /articles/{id} (async) failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Something went wrong while deleting the article. Please try again later."}
+        )
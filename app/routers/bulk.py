@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, Request, status
+from app.bulk import import_articles
+from app.schemas.article import BulkImportResponse
+from app.schemas.response import BaseResponse
+from app.serialization import success_response
+from app.logger import logger
+
+# Mounted under /api/v1/articles *before* the articles router, next to /search
+router = APIRouter()
+
+
+# POST bulk import - streamed NDJSON or JSON array body
+@router.post(
+    "/bulk",
+    response_model=BaseResponse[BulkImportResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Bulk import articles",
+    description=(
+        "Import many articles in one request. Send either NDJSON (`application/x-ndjson`, one article object per line) "
+        "or a JSON array of article objects. Every record is validated like `POST /articles`. "
+        "The body is read as a stream and inserted in batches, so uploads of any size are fine. "
+        "Bad records do not abort the import: each one is reported in `errors` with its 0-based `index`, "
+        "and all other records are inserted - a malformed element of a JSON array is skipped up to the next one. "
+        "The body must be UTF-8: an invalid byte stops the import there, with the byte offset in the last error. "
+        "At most `BULK_MAX_ERRORS` errors are listed "
+        "(`errors_truncated` is true when more failed)."
+    ),
+    responses={
+        200: {
+            "description": "Import finished (check `failed` / `errors` for rejected records)",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "data": {
+                            "received": 3,
+                            "inserted": 2,
+                            "failed": 1,
+                            "errors": [
+                                {"index": 1, "error": "title: String should have at least 5 characters"}
+                            ],
+                            "errors_truncated": False
+                        }
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": False,
+                        "error": "Bulk import failed. Records in completed batches may have been saved."
+                    }
+                }
+            }
+        }
+    }
+)
+async def bulk_import(request: Request):
+
+    # Log incoming request
+    logger.info(f"Incoming POST /articles/bulk - Content-Type: '{request.headers.get('content-type')}'")
+
+    try:
+        summary = await import_articles(request.stream())
+
+        logger.info(
+            f"Success: Bulk import - received {summary['received']}, "
+            f"inserted {summary['inserted']}, failed {summary['failed']}"
+        )
+
+        return success_response(summary)
+
+    except Exception as e:
+        logger.error(f"Failure: POST /articles/bulk failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Bulk import failed. Records in completed batches may have been saved."}
+        )
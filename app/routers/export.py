@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+from app.database import read_engine
+from app.export import export_articles, MEDIA_TYPES
+from app.filters import DateBound
+from app.compression import accepts
+from app.tags import normalize_tag
+from app.logger import logger
+
+# Mounted under /api/v1/articles *before* the articles router, so
+# /export is not swallowed by /{id}
+router = APIRouter()
+
+
+def accepts_gzip(request: Request) -> bool:
+    # Accept-Encoding: gzip (or gzip;q=0.5, or *) - q=0 means "not acceptable"
+    return accepts(request.headers.get("accept-encoding", ""), "gzip")
+
+
+# GET export every article as a stream
+@router.get(
+    "/export",
+    summary="Export articles",
+    description=(
+        "Stream every article as NDJSON (one JSON object per line, default) or CSV, oldest first. "
+        "Use `since` to export only articles created or updated at or after a timestamp, and `tag` to export one tag. "
+        "The response is gzip-compressed on the fly when the client sends `Accept-Encoding: gzip`. "
+        "Rows are read through a server-side cursor, so exports of any size use flat memory."
+    ),
+    responses={
+        200: {
+            "description": "The exported articles",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"id": 1, "title": "Sample Article", "content": "Sample content...", "author": "Suborno", '
+                               '"tags": ["python", "fastapi"], "created_at": "2025-01-01T12:00:00", "updated_at": "2025-01-01T12:00:00"}\n'
+                },
+                "text/csv": {
+                    "example": "id,title,content,author,tags,created_at,updated_at\n"
+                               "1,Sample Article,Sample content...,Suborno,\"python,fastapi\",2025-01-01T12:00:00,2025-01-01T12:00:00\n"
+                }
+            }
+        }
+    }
+)
+def export(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format: ndjson or csv"),
+    since: Optional[DateBound] = Query(None, description="Only articles created or updated at or after this time (ISO 8601 date or datetime, UTC unless it has an offset)"),
+    tag: Optional[str] = Query(None, description="Filter by tag")
+):
+
+    # Log incoming request with query params
+    logger.info(f"Incoming GET /articles/export?format={format}&since={since}&tag={tag}")
+
+    compress = accepts_gzip(request)
+    tag_filter = normalize_tag(tag) if tag else None
+    filename = f"articles.{'csv' if format == 'csv' else 'ndjson'}"
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "Vary": "Accept-Encoding"
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        export_articles(read_engine(request), format, since, tag_filter, compress),
+        media_type=MEDIA_TYPES[format],
+        headers=headers
+    )
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+# Probes for the load balancer / orchestrator - not part of the public API docs
+router = APIRouter()
+
+
+# GET liveness - the process is up and serving requests
+@router.get("/health", summary="Liveness probe", include_in_schema=False)
+def get_health():
+    return {"success": True, "data": {"status": "ok"}}
+
+
+# GET readiness - 200 once the connection pools are warm and the database
+# is at the latest migration, 503 until then (see app/readiness.py)
+@router.get("/ready", summary="Readiness probe", include_in_schema=False)
+async def get_ready(request: Request):
+    readiness = request.app.state.readiness
+    ready = await readiness.check()
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"success": ready, "data": readiness.snapshot()}
+    )
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.pool_stats import pool_snapshot
+from app.cache import article_cache, list_cache
+from app.compression import compressed_cache
+from app import database
+from app.database import get_read_db
+from app.models import ArticleBody
+from app.logger import logger
+
+# Operational endpoints - not part of the public API docs.
+# Keep /internal/* off the public load balancer.
+router = APIRouter()
+
+
+# GET connection pool statistics
+@router.get("/pool", summary="Connection pool statistics", include_in_schema=False)
+def get_pool_stats():
+
+    logger.info("Incoming GET /internal/pool")
+
+    return {
+        "success": True,
+        "data": pool_snapshot()
+    }
+
+
+# GET article cache statistics (hits, misses, evictions)
+@router.get("/cache", summary="Article cache statistics", include_in_schema=False)
+def get_cache_stats():
+
+    logger.info("Incoming GET /internal/cache")
+
+    return {
+        "success": True,
+        "data": {"articles": article_cache.stats(), "list_pages": list_cache.stats(), "compressed_responses": compressed_cache.stats()}
+    }
+
+
+# GET read replica health (empty list when no replicas are configured)
+@router.get("/replicas", summary="Read replica health", include_in_schema=False)
+def get_replica_stats():
+
+    logger.info("Incoming GET /internal/replicas")
+
+    return {
+        "success": True,
+        "data": database.replica_set.snapshot() if database.replica_set is not None else []
+    }
+
+
+# GET admission control state per request class (empty when disabled)
+@router.get("/admission", summary="Admission control", include_in_schema=False)
+def get_admission_stats(request: Request):
+
+    logger.info("Incoming GET /internal/admission")
+
+    return {
+        "success": True,
+        "data": {name: gate.snapshot() for name, gate in request.app.state.admission.items()}
+    }
+
+
+# GET article body storage per codec (scans article_bodies - not for polling)
+@router.get("/storage", summary="Article body storage", include_in_schema=False)
+def get_storage_stats(db: Session = Depends(get_read_db)):
+
+    logger.info("Incoming GET /internal/storage")
+
+    rows = db.execute(
+        select(ArticleBody.codec, func.count(), func.sum(ArticleBody.size), func.sum(func.length(ArticleBody.data)))
+        .group_by(ArticleBody.codec)
+    ).all()
+    return {
+        "success": True,
+        "data": [
+            {"codec": codec, "bodies": bodies, "bytes": int(size or 0), "stored_bytes": int(stored or 0)}
+            for codec, bodies, size, stored in rows
+        ]
+    }
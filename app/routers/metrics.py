@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.metrics import render_metrics
+from app.pool_stats import pool_snapshot
+
+# Prometheus scrape target - like /internal/*, keep it off the public load balancer
+router = APIRouter()
+
+
+# GET metrics in the Prometheus text exposition format
+@router.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+def get_metrics():
+    return PlainTextResponse(
+        render_metrics(pool_snapshot()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
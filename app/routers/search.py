@@ -0,0 +1,156 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database import get_read_db
+from app.search import SearchUnavailableError, search_articles
+from app.pagination import encode_search_cursor, decode_search_cursor
+from app.schemas.article import SearchResponse
+from app.schemas.response import BaseResponse
+from app.serialization import success_response
+from app.tags import split_tags
+from app.logger import logger
+
+# Mounted under /api/v1/articles *before* the articles router, so
+# /search is not swallowed by /{id}
+router = APIRouter()
+
+
+# GET full-text search over titles and content
+@router.get(
+    "/search",
+    response_model=BaseResponse[SearchResponse],
+    summary="Search articles",
+    description=(
+        "Full-text search over article titles and content, best matches first. "
+        "Title matches rank higher than body matches. Each result carries a relevance `score` and a `snippet` "
+        "with the matching words wrapped in `<mark>...</mark>` (the snippet is not HTML-escaped). "
+        "Pass `meta.next_cursor` back as `cursor` for the next page."
+    ),
+    responses={
+        200: {
+            "description": "Ranked search results",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "data": {
+                            "items": [
+                                {
+                                    "id": 1,
+                                    "title": "FastAPI best practices",
+                                    "author": "Suborno",
+                                    "tags": ["fastapi", "python"],
+                                    "created_at": "2025-01-01T12:00:00",
+                                    "updated_at": "2025-01-01T12:00:00",
+                                    "score": 0.6079,
+                                    "snippet": "… building APIs with <mark>FastAPI</mark> and SQLAlchemy …"
+                                }
+                            ],
+                            "meta": {
+                                "q": "fastapi",
+                                "limit": 10,
+                                "next_cursor": None
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        400: {
+            "description": "Invalid cursor",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": False,
+                        "error": "Invalid cursor"
+                    }
+                }
+            }
+        },
+        501: {
+            "description": "Full-text search is not available on this database",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": False,
+                        "error": "Search is not available on this server"
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": False,
+                        "error": "Unable to search articles. Try again later."
+                    }
+                }
+            }
+        }
+    }
+)
+def search(
+    db: Session = Depends(get_read_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Search words, e.g. `fastapi pagination`"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page (1-100)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from meta.next_cursor")
+):
+
+    # Log incoming request with query params
+    logger.info(f"Incoming GET /articles/search?q={q}&limit={limit}&cursor={cursor}")
+
+    seek = None
+    if cursor:
+        try:
+            seek = decode_search_cursor(cursor)
+        except ValueError:
+            logger.warning(f"Failure: Invalid cursor - {cursor}")
+            raise HTTPException(
+                status_code=400,
+                detail={"success": False, "error": "Invalid cursor"}
+            )
+
+    try:
+        rows, has_more = search_articles(db, q, limit, seek)
+
+        items = [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "author": row["author"],
+                "tags": split_tags(row["tags"]),
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "score": row["score"],
+                "snippet": row["snippet"]
+            }
+            for row in rows
+        ]
+        next_cursor = encode_search_cursor(rows[-1]["score"], rows[-1]["id"]) if has_more else None
+
+        logger.info(f"Success: Search '{q}' returned {len(items)} articles")
+
+        return success_response({
+            "items": items,
+            "meta": {
+                "q": q,
+                "limit": limit,
+                "next_cursor": next_cursor
+            }
+        })
+
+    except SearchUnavailableError as e:
+        logger.warning(f"Failure: Search unavailable - {str(e)}")
+        raise HTTPException(
+            status_code=501,
+            detail={"success": False, "error": "Search is not available on this server"}
+        )
+
+    except Exception as e:
+        logger.error(f"Failure: GET /articles/search failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Unable to search articles. Try again later."}
+        )
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Literal, Optional
+from app.database import get_read_db
+from app.counts import list_tags
+from app.tags import normalize_tag
+from app.schemas.article import TagListResponse
+from app.schemas.response import BaseResponse
+from app.serialization import success_response
+from app.logger import logger
+
+router = APIRouter()
+
+
+# GET all tags with their article counts
+@router.get(
+    "/",
+    response_model=BaseResponse[TagListResponse],
+    summary="List tags",
+    description=(
+        "All tags with the number of articles using them, most used first. "
+        "Use `prefix` for autocomplete (`prefix=py` -> python, pytest...), `limit` for a top-N tag cloud "
+        "and `order=name` for an alphabetical list. Counts are kept up to date on every write, "
+        "so this is cheap no matter how many articles there are."
+    ),
+    responses={
+        200: {
+            "description": "Tags with article counts",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": True,
+                        "data": {
+                            "items": [
+                                {"tag": "python", "count": 42},
+                                {"tag": "fastapi", "count": 17}
+                            ],
+                            "meta": {
+                                "prefix": None,
+                                "limit": 2,
+                                "order": "count"
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        500: {
+            "description": "Internal server error",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "success": False,
+                        "error": "Unable to fetch tags. Try again later."
+                    }
+                }
+            }
+        }
+    }
+)
+def get_tags(
+    db: Session = Depends(get_read_db),
+    prefix: Optional[str] = Query(None, max_length=50, description="Only tags starting with this text (case-insensitive)"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Return at most this many tags (top-N)"),
+    order: Literal["count", "name"] = Query("count", description="count = most used first, name = alphabetical")
+):
+
+    # Log incoming request with query params
+    logger.info(f"Incoming GET /tags?prefix={prefix}&limit={limit}&order={order}")
+
+    # tags are stored normalized (lowercased), so match the prefix the same way
+    prefix_filter = normalize_tag(prefix) if prefix else None
+
+    try:
+        items = list_tags(db, prefix_filter, limit, order)
+
+        logger.info(f"Success: Fetched {len(items)} tags")
+
+        return success_response({
+            "items": items,
+            "meta": {
+                "prefix": prefix_filter,
+                "limit": limit,
+                "order": order
+            }
+        })
+
+    except Exception as e:
+        logger.error(f"Failure: GET /tags failed - Error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail={"success": False, "error": "Unable to fetch tags. Try again later."}
+        )
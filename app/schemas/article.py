@@ -77,21 +77,74 @@ class ArticleUpdate(BaseModel):
 class ArticleResponse(ArticleBase):
     id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
     
 class PaginationMeta(BaseModel):
-    page: int
+    page: Optional[int] = None
     limit: int
-    total: int    
+    total: Optional[int] = None
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    count: Optional[str] = None
+
+class ArticleListItem(BaseModel):
+    # list items may be partial (fields= / view=summary), so everything but id is optional
+    id: int
+    title: Optional[str] = None
+    content: Optional[str] = None
+    author: Optional[str] = None
+    tags: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    excerpt: Optional[str] = None
 
 class PaginatedArticleResponse(BaseModel):
-    items: List[ArticleResponse]
-    total: int
-    page: int
-    limit: int
-    total_pages: int
-    articles: List[ArticleResponse]
+    items: List[ArticleListItem]
     meta: PaginationMeta
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class SearchResultItem(BaseModel):
+    id: int
+    title: str
+    author: Optional[str] = None
+    tags: Optional[List[str]] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    score: float
+    snippet: Optional[str] = None
+
+class SearchMeta(BaseModel):
+    q: str
+    limit: int
+    next_cursor: Optional[str] = None
+
+class SearchResponse(BaseModel):
+    items: List[SearchResultItem]
+    meta: SearchMeta
+
+class BulkImportError(BaseModel):
+    index: int
+    error: str
+
+class BulkImportResponse(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkImportError]
+    errors_truncated: bool = False
+
+class TagCountItem(BaseModel):
+    tag: str
+    count: int
+
+class TagListMeta(BaseModel):
+    prefix: Optional[str] = None
+    limit: Optional[int] = None
+    order: str
+
+class TagListResponse(BaseModel):
+    items: List[TagCountItem]
+    meta: TagListMeta
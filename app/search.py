@@ -0,0 +1,215 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import DateTime, event, inspect, select, text
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models import Article, ArticleBody
+from app.bodies import decode_body
+from app.config import settings
+
+# Full-text search index, kept in its own table next to articles:
+#   Postgres - article_search(article_id, document tsvector) + GIN index,
+#              ranked with ts_rank, snippets from ts_headline over the
+#              (decompressed) bodies of the result page
+#   SQLite   - FTS5 virtual table article_search(title, content), rowid = article id,
+#              ranked with bm25, snippets from snippet()
+# The index is maintained from the ORM (mapper events below), so every
+# create/update/delete through a Session keeps it current in the same
+# transaction. Core bulk inserts must call index_articles() themselves.
+
+SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+
+class SearchUnavailableError(Exception):
+    # The database has no full-text index this module knows how to query
+    pass
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+
+def _document_sql() -> str:
+    # title weighs more than body
+    return (
+        "setweight(to_tsvector(CAST(:language AS regconfig), coalesce(:title, '')), 'A') || "
+        "setweight(to_tsvector(CAST(:language AS regconfig), coalesce(:content, '')), 'B')"
+    )
+
+
+def create_search_schema(connection) -> None:
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS article_search ("
+            "article_id INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_article_search_document ON article_search USING GIN (document)"
+        ))
+    elif dialect == "sqlite":
+        connection.execute(text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS article_search "
+            "USING fts5(title, content, tokenize='porter unicode61')"
+        ))
+
+
+def index_articles(connection, articles: List[Tuple[int, Optional[str], Optional[str]]]) -> None:
+    # (id, title, content) tuples - insert or replace their index entries
+    if not articles or connection.dialect.name not in SUPPORTED_DIALECTS:
+        return
+
+    params = [
+        {"id": id, "title": title, "content": content, "language": settings.SEARCH_LANGUAGE}
+        for id, title, content in articles
+    ]
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(
+            f"INSERT INTO article_search (article_id, document) VALUES (:id, {_document_sql()}) "
+            "ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document"
+        ), params)
+    else:
+        # FTS5 tables have no upsert
+        connection.execute(text("DELETE FROM article_search WHERE rowid = :id"), params)
+        connection.execute(text(
+            "INSERT INTO article_search (rowid, title, content) VALUES (:id, :title, :content)"
+        ), params)
+
+
+def unindex_articles(connection, ids: List[int]) -> None:
+    # Postgres cascades from articles, FTS5 tables have no foreign keys
+    if ids and connection.dialect.name == "sqlite":
+        connection.execute(text("DELETE FROM article_search WHERE rowid = :id"), [{"id": id} for id in ids])
+
+
+def load_bodies(connection, ids: List[int]) -> Dict[int, str]:
+    # {article id: decompressed body}
+    rows = connection.execute(
+        select(ArticleBody.article_id, ArticleBody.codec, ArticleBody.data).where(ArticleBody.article_id.in_(ids))
+    )
+    return {row.article_id: decode_body(row.codec, row.data) for row in rows}
+
+
+def rebuild_search_index(connection, batch_size: int = 1000) -> None:
+    # Re-create every index entry from articles and their bodies (drift
+    # repair). Bodies are compressed, so they are decoded here, batch by batch.
+    dialect = connection.dialect.name
+    if dialect not in SUPPORTED_DIALECTS:
+        return
+    connection.execute(text("TRUNCATE article_search" if dialect == "postgresql" else "DELETE FROM article_search"))
+    result = connection.execute(
+        select(Article.id, Article.title, ArticleBody.codec, ArticleBody.data)
+        .outerjoin(ArticleBody, ArticleBody.article_id == Article.id)
+        .order_by(Article.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for rows in result.partitions():
+        index_articles(connection, [(row.id, row.title, decode_body(row.codec, row.data)) for row in rows])
+
+
+# create_all() (app/create_db.py) also creates the search index
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_schema(target, connection, **kw):
+    create_search_schema(connection)
+
+
+@event.listens_for(Article, "after_insert")
+def _index_inserted(mapper, connection, target):
+    index_articles(connection, [(target.id, target.title, target.content)])
+
+
+@event.listens_for(Article, "after_update")
+def _index_updated(mapper, connection, target):
+    state = inspect(target)
+    # setting content always marks preview as changed (see Article.content)
+    if state.attrs.title.history.has_changes() or state.attrs.preview.history.has_changes():
+        index_articles(connection, [(target.id, target.title, target.content)])
+
+
+@event.listens_for(Article, "after_delete")
+def _unindex_deleted(mapper, connection, target):
+    unindex_articles(connection, [target.id])
+
+
+def _fts5_query(q: str) -> str:
+    # Quote every word so user input can't break FTS5 query syntax;
+    # words are ANDed like websearch_to_tsquery does by default
+    words = re.findall(r"\w+", q)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def search_articles(db: Session, q: str, limit: int, seek: Optional[Tuple[float, int]] = None):
+    # Ranked matches, best first, keyset-paginated on (score, id).
+    # Returns (rows, has_more); rows have id, title, author, tags,
+    # created_at, updated_at, score and snippet.
+    dialect = db.get_bind().dialect.name
+    params = {"q": q, "limit": limit + 1}
+    seek_sql = ""
+    if seek:
+        params.update(seek_score=seek[0], seek_id=seek[1])
+        # explicit double precision, so the score from the cursor compares
+        # equal to the one it was read from (see the Postgres score below)
+        seek_sql = (
+            "AND (score < CAST(:seek_score AS DOUBLE PRECISION) "
+            "OR (score = CAST(:seek_score AS DOUBLE PRECISION) AND id < :seek_id)) "
+        )
+
+    if dialect == "postgresql":
+        # ts_rank returns real (float4); compared with the cursor's float it
+        # is widened to float8 and never equals the value the client got
+        # back, so ties around a page boundary would repeat or vanish.
+        # Selected as float8, the score round-trips through the cursor exactly.
+        params.update(
+            language=settings.SEARCH_LANGUAGE,
+            headline_options=(
+                f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, "
+                "MaxFragments=2, MaxWords=20, MinWords=5, FragmentDelimiter=' … '"
+            )
+        )
+        sql = (
+            "SELECT * FROM ("
+            "  SELECT a.id, a.title, a.author, a.tags, a.created_at, a.updated_at, "
+            "         CAST(ts_rank(s.document, query) AS DOUBLE PRECISION) AS score "
+            "  FROM article_search s "
+            "  JOIN articles a ON a.id = s.article_id, "
+            "       websearch_to_tsquery(CAST(:language AS regconfig), :q) query "
+            "  WHERE s.document @@ query"
+            ") matches WHERE TRUE " + seek_sql +
+            "ORDER BY score DESC, id DESC LIMIT :limit"
+        )
+    elif dialect == "sqlite":
+        params["q"] = _fts5_query(q)
+        if not params["q"]:
+            return [], False
+        # bm25() is lower-is-better; negate it so both dialects rank "higher is better"
+        sql = (
+            "SELECT * FROM ("
+            "  SELECT a.id, a.title, a.author, a.tags, a.created_at, a.updated_at, "
+            "         -bm25(article_search, 10.0, 1.0) AS score, "
+            f"        snippet(article_search, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', ' … ', 16) AS snippet "
+            "  FROM article_search JOIN articles a ON a.id = article_search.rowid "
+            "  WHERE article_search MATCH :q"
+            ") matches WHERE 1 = 1 " + seek_sql +
+            "ORDER BY score DESC, id DESC LIMIT :limit"
+        )
+    else:
+        raise SearchUnavailableError(f"Full-text search is not available on {dialect}")
+
+    # typed so SQLite hands back datetimes too
+    stmt = text(sql).columns(created_at=DateTime, updated_at=DateTime)
+    rows = db.execute(stmt, params).mappings().all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if dialect == "postgresql" and rows:
+        # Bodies are stored compressed, so ts_headline gets them decoded -
+        # only for the rows of this page, in one statement
+        bodies = load_bodies(db, [row["id"] for row in rows])
+        snippets = dict(db.execute(text(
+            "SELECT b.id, ts_headline(CAST(:language AS regconfig), b.body, "
+            "websearch_to_tsquery(CAST(:language AS regconfig), :q), :headline_options) "
+            "FROM unnest(CAST(:ids AS integer[]), CAST(:bodies AS text[])) AS b(id, body)"
+        ), {**params, "ids": list(bodies), "bodies": list(bodies.values())}).all())
+        rows = [{**row, "snippet": snippets.get(row["id"])} for row in rows]
+
+    return rows, has_more
@@ -0,0 +1,51 @@
+from typing import Any, Optional
+from fastapi import Response
+from pydantic_core import to_json
+from app.models import Article
+from app.tags import split_tags
+
+# Handlers build plain dicts in the shape of their response_model and
+# return them as JSONBytesResponse, encoded once by pydantic-core's Rust
+# encoder. Returning a Response makes FastAPI skip its own validate +
+# jsonable_encoder + json.dumps pass; response_model stays on the route
+# and only feeds the OpenAPI schema.
+#
+# Because nothing re-validates the output, the dicts built here must match
+# the schemas in app/schemas - e.g. tags are a list, not the stored string.
+
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # datetimes -> ISO 8601, like the default encoder
+        return to_json(content)
+
+
+def success_response(data: Any, status_code: int = 200, headers: Optional[dict] = None) -> JSONBytesResponse:
+    # BaseResponse envelope
+    return JSONBytesResponse({"success": True, "data": data}, status_code=status_code, headers=headers)
+
+
+def cached_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    # A body rendered earlier (list page cache) - sent as is
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def message_response(message: str, status_code: int = 200) -> JSONBytesResponse:
+    # MessageResponse envelope
+    return JSONBytesResponse({"success": True, "message": message}, status_code=status_code)
+
+
+def article_data(article: Article) -> dict:
+    # ArticleResponse. Timestamps stay ISO strings: the dict is also what
+    # the article cache stores (as JSON in the shared backend).
+    return {
+        "id": article.id,
+        "title": article.title,
+        "content": article.content,
+        "author": article.author,
+        "tags": split_tags(article.tags),
+        "created_at": article.created_at.isoformat() if article.created_at else None,
+        "updated_at": article.updated_at.isoformat() if article.updated_at else None
+    }
@@ -0,0 +1,59 @@
+from typing import Iterable, List, Optional, Tuple, Union
+from app.models import ArticleTag
+
+
+def normalize_tag(tag: str) -> str:
+    # tags are matched case-insensitively, so store them lowercased
+    return tag.strip().lower()
+
+
+def normalize_tags(tags: Optional[Union[Iterable[str], str]]) -> List[str]:
+    # Accepts a list of tags or the comma-joined string stored on Article.tags
+    # and returns unique, non-empty, normalized tags (original order kept).
+    # Commas inside list items are split too, so normalize_tags(list) and
+    # normalize_tags(join_tags(list)) always agree.
+    if not tags:
+        return []
+    if isinstance(tags, str):
+        tags = [tags]
+
+    result = []
+    for item in tags:
+        if item is None:
+            continue
+        for tag in item.split(","):
+            normalized = normalize_tag(tag)
+            if normalized and normalized not in result:
+                result.append(normalized)
+    return result
+
+
+def join_tags(tags: Optional[Union[Iterable[str], str]]) -> Optional[str]:
+    # Comma-joined form kept on Article.tags for display
+    if tags is None:
+        return None
+    if isinstance(tags, str):
+        return tags.strip()
+    return ", ".join(tags)
+
+
+def split_tags(tags: Optional[str]) -> Optional[List[str]]:
+    # Display string -> list for API responses (case and order kept)
+    if tags is None:
+        return None
+    return [tag.strip() for tag in tags.split(",") if tag.strip()]
+
+
+def set_article_tags(article, tags: Optional[Union[Iterable[str], str]]) -> Tuple[List[str], List[str]]:
+    # Keeps Article.tags (display string) and the article_tags rows in sync.
+    # Links for tags that stay are reused, so an update only touches the diff.
+    # Returns (added, removed) normalized tags for the tag counters.
+    article.tags = join_tags(tags)
+
+    existing = {link.tag: link for link in article.tag_links}
+    wanted = normalize_tags(tags)
+    article.tag_links = [existing.get(tag) or ArticleTag(tag=tag) for tag in wanted]
+
+    added = [tag for tag in wanted if tag not in existing]
+    removed = [tag for tag in existing if tag not in wanted]
+    return added, removed
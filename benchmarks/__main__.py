@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Usage:
+#   python -m benchmarks --sizes 1000,10000 --requests 500 --concurrency 8
+#   python -m benchmarks --compare benchmarks/results/old.json benchmarks/results/new.json
+#   python -m benchmarks --sizes 100000 --check-plans   (EXPLAIN the list filters, exit 1 on a bad plan)
+#   python -m benchmarks --transports uvicorn --scenarios list --cold-start 5   (startup time, median of 5)
+#
+# Runs against DATABASE_URL (Postgres or SQLite). Without one it uses a
+# throwaway SQLite file. The database is wiped and re-seeded for every size.
+
+DEFAULT_DATABASE_URL = "sqlite:///./benchmark.db"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Seed a synthetic dataset and benchmark the articles API")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated dataset sizes (articles), e.g. 1000,100000,1000000")
+    parser.add_argument("--requests", type=int, default=300, help="measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent clients per scenario")
+    parser.add_argument("--transports", default="asgi,uvicorn", help="asgi (in-process), uvicorn (real socket) or both")
+    parser.add_argument("--scenarios", default=None, help="comma-separated scenario names (default: all)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for the dataset and the request mix")
+    parser.add_argument("--output", default=None, help="result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--cold-start", type=int, default=3, metavar="RUNS",
+                        help="with the uvicorn transport, time server start -> /ready this many times (0 to skip)")
+    parser.add_argument("--check-plans", action="store_true", help="seed, then check the list filter query plans instead of benchmarking")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="print the difference between two result files and exit")
+    return parser.parse_args(argv)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline_path: str, candidate_path: str) -> None:
+    baseline = json.loads(Path(baseline_path).read_text())
+    candidate = json.loads(Path(candidate_path).read_text())
+    def key(result):
+        return result["size"], result["transport"], result["scenario"]
+
+    before = {key(r): r for r in baseline["results"]}
+
+    if "cold_start" in baseline and "cold_start" in candidate:
+        old, new = baseline["cold_start"], candidate["cold_start"]
+        print(f"cold start (ms): ready {old['ready_ms']:.1f}->{new['ready_ms']:.1f}")
+        for phase, ms in new["phases_ms"].items():
+            if phase in old["phases_ms"]:
+                print(f"  {phase:<12} {old['phases_ms'][phase]:.1f}->{ms:.1f}")
+
+    print(f"{'size':>8} {'transport':<8} {'scenario':<26} {'rps':>16} {'p50 ms':>18} {'p99 ms':>18}")
+    for result in candidate["results"]:
+        old = before.get(key(result))
+        if old is None:
+            continue
+        rps = f"{old['throughput_rps']:.0f}->{result['throughput_rps']:.0f}"
+        p50 = f"{old['latency_ms']['p50']:.1f}->{result['latency_ms']['p50']:.1f}"
+        p99 = f"{old['latency_ms']['p99']:.1f}->{result['latency_ms']['p99']:.1f}"
+        print(f"{result['size']:>8} {result['transport']:<8} {result['scenario']:<26} {rps:>16} {p50:>18} {p99:>18}")
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # app.config reads DATABASE_URL when it is first imported
+    os.environ.setdefault("DATABASE_URL", DEFAULT_DATABASE_URL)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    from app.database import engine
+    from benchmarks.dataset import seed
+    from benchmarks.runner import measure_cold_start, run_in_process, run_over_socket
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    transports = [t.strip() for t in args.transports.split(",")]
+    scenarios = args.scenarios.split(",") if args.scenarios else None
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "dialect": engine.dialect.name,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "seeding": [],
+        "results": [],
+    }
+
+    for size in sizes:
+        inserted, seconds = seed(size, args.seed)
+        report["seeding"].append({"size": size, "seconds": round(seconds, 3), "rows_per_s": round(inserted / seconds, 1) if seconds else None})
+        print(f"seeded {inserted} articles in {seconds:.1f}s", file=sys.stderr)
+
+        if args.check_plans:
+            from benchmarks.plans import check_plans
+            failed = 0
+            for result in check_plans(engine):
+                failed += not result["ok"]
+                print(f"{size:>8} {result['case']:<14} {'ok' if result['ok'] else 'FAIL':<5} {' | '.join(result['plan'])}", file=sys.stderr)
+            if failed:
+                sys.exit(1)
+            continue
+
+        if args.cold_start > 0 and "uvicorn" in transports and "cold_start" not in report:
+            report["cold_start"] = asyncio.run(measure_cold_start(args.cold_start))
+            cold_start = report["cold_start"]
+            phases = ", ".join(f"{phase} {ms:.1f}" for phase, ms in cold_start["phases_ms"].items())
+            print(f"cold start: ready in {cold_start['ready_ms']:.1f} ms ({phases})", file=sys.stderr)
+
+        for transport in transports:
+            run = run_in_process if transport == "asgi" else run_over_socket
+            results = asyncio.run(run(size, args.requests, args.concurrency, args.seed, scenarios))
+            for result in results:
+                report["results"].append({"size": size, "transport": transport, **result})
+                latency = result["latency_ms"]
+                print(
+                    f"{size:>8} {transport:<8} {result['scenario']:<26} {result['throughput_rps']:>9.1f} rps "
+                    f"p50 {latency['p50']:>8.2f} p95 {latency['p95']:>8.2f} p99 {latency['p99']:>8.2f} ms",
+                    file=sys.stderr
+                )
+
+    if args.check_plans:
+        return
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+from sqlalchemy import insert, text
+from app.database import Base, SessionLocal, engine
+from app.models import Article, ArticleBody, ArticleTag
+from app.bodies import article_row, body_row
+from app.tags import normalize_tags, join_tags
+from app.counts import adjust_counts, tag_deltas
+from app.search import index_articles
+from app.logger import logger
+
+# Synthetic, reproducible dataset: the same (size, seed) always produces
+# the same articles. Shapes are loosely modelled on a real blog:
+#   - content length is log-normal (median ~3k characters, long tail to 40k)
+#   - tags are heavily skewed (Zipf-like) over TAG_VOCABULARY, 0-5 per article
+#   - a few prolific authors write most posts
+#   - created_at is spread over the last three years
+
+WORDS = (
+    "api backend database index query cache latency python fastapi sqlalchemy postgres "
+    "request response server client async thread pool connection transaction commit "
+    "schema migration table column row page cursor offset limit count search token "
+    "deploy docker container cluster node worker process memory disk network socket "
+    "design pattern module package function class method object value type error "
+    "test benchmark profile trace metric log monitor alert incident release version "
+    "the a an of to in for on with and or but is are was be this that it we you they"
+).split()
+
+TAG_VOCABULARY = [f"tag{i:03d}" for i in range(200)]
+AUTHORS = [f"author{i:02d}" for i in range(50)]
+SPAN = timedelta(days=3 * 365)
+
+
+def _zipf_index(rng: random.Random, n: int, skew: float = 3.0) -> int:
+    # Heavy-headed pick from range(n) - index 0 is the most popular.
+    # A power of a uniform draw: cheap enough for 1M rows, close enough to Zipf.
+    return min(int(n * rng.random() ** skew), n - 1)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def generate_articles(size: int, seed: int = 42, now: datetime = None) -> Iterator[dict]:
+    # Yields article rows (title, content, author, tags, created_at, updated_at)
+    rng = random.Random(seed)
+    now = now or datetime(2025, 1, 1)
+    for i in range(size):
+        title = f"{_sentence(rng, rng.randint(3, 9)).capitalize()} #{i}"[:100]
+        length = min(max(int(rng.lognormvariate(8.0, 0.8)), 200), 40_000)
+        paragraphs = []
+        total = 0
+        while total < length:
+            paragraph = _sentence(rng, rng.randint(40, 120)).capitalize() + "."
+            paragraphs.append(paragraph)
+            total += len(paragraph) + 2
+        content = "\n\n".join(paragraphs)[:length]
+
+        tags = [TAG_VOCABULARY[_zipf_index(rng, len(TAG_VOCABULARY))] for _ in range(rng.randint(0, 5))]
+        created_at = now - SPAN * rng.random()
+        # a quarter of the posts were edited at some point
+        updated_at = created_at + (now - created_at) * rng.random() if rng.random() < 0.25 else created_at
+
+        yield {
+            "title": title,
+            "content": content,
+            "author": AUTHORS[_zipf_index(rng, len(AUTHORS))],
+            "tags": join_tags(tags) if tags else None,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+
+def reset_database() -> None:
+    # Empty every table the app writes to (and the search index)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(text(
+                "TRUNCATE TABLE article_search, article_tags, article_bodies, articles, article_counters, tag_counts "
+                "RESTART IDENTITY CASCADE"
+            ))
+        else:
+            for table in ("article_tags", "article_bodies", "articles", "article_counters", "tag_counts"):
+                connection.execute(text(f"DELETE FROM {table}"))
+            if connection.dialect.name == "sqlite":
+                connection.execute(text("DELETE FROM article_search"))
+
+
+def _insert_batch(rows: List[dict]) -> List[int]:
+    # Same statements as the bulk import (app/bulk.py), plus explicit
+    # timestamps: one INSERT ... RETURNING, one executemany each for the
+    # bodies and the tags, one counter update and one search-index write per batch
+    with SessionLocal() as db:
+        ids = db.execute(
+            insert(Article).returning(Article.id, sort_by_parameter_order=True),
+            [article_row(row) for row in rows]
+        ).scalars().all()
+        db.execute(insert(ArticleBody), [body_row(id, row["content"]) for id, row in zip(ids, rows)])
+
+        links = []
+        added_tags = []
+        for id, row in zip(ids, rows):
+            for tag in normalize_tags(row["tags"]):
+                links.append({"article_id": id, "tag": tag})
+                added_tags.append(tag)
+        if links:
+            db.execute(insert(ArticleTag), links)
+
+        adjust_counts(db, total_delta=len(ids), tag_delta=tag_deltas(added=added_tags))
+        index_articles(db.connection(), [(id, row["title"], row["content"]) for id, row in zip(ids, rows)])
+        db.commit()
+        return ids
+
+
+def seed(size: int, seed: int = 42, batch_size: int = 2000) -> Tuple[int, float]:
+    # Replace the database contents with `size` synthetic articles.
+    # Returns (rows inserted, seconds taken).
+    reset_database()
+    start = time.perf_counter()
+    inserted = 0
+    batch: List[dict] = []
+
+    for row in generate_articles(size, seed):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            inserted += len(_insert_batch(batch))
+            batch = []
+    if batch:
+        inserted += len(_insert_batch(batch))
+
+    # fresh planner statistics, so Postgres plans like it would in production
+    with engine.begin() as connection:
+        if connection.dialect.name in ("postgresql", "sqlite"):
+            connection.execute(text("ANALYZE"))
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Seeded {inserted} articles in {elapsed:.1f}s ({inserted / elapsed:.0f} rows/s)")
+    return inserted, elapsed
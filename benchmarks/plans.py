@@ -0,0 +1,72 @@
+import json
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from app.filters import ArticleFilters
+from app.models import Article
+from benchmarks.dataset import AUTHORS, TAG_VOCABULARY
+
+# Query plan checks for the list filters: EXPLAIN the page query each
+# facet produces (same statement as GET /api/v1/articles) and check that
+# the planner uses the index meant for it and - where the index order
+# matches the newest-first ordering - does not sort.
+#
+# Run after seeding, so the planner has statistics:
+#   python -m benchmarks --sizes 100000 --check-plans
+
+# (name, filters, acceptable indexes, must avoid a sort)
+PLAN_CASES: List[Tuple[str, ArticleFilters, Tuple[str, ...], bool]] = [
+    ("author", ArticleFilters(author=AUTHORS[1]),
+     ("ix_articles_author_created_at_id",), True),
+    ("author_month", ArticleFilters(author=AUTHORS[1], created_after=datetime(2023, 3, 1), created_before=datetime(2023, 4, 1)),
+     ("ix_articles_author_created_at_id",), True),
+    ("month", ArticleFilters(created_after=datetime(2023, 3, 1), created_before=datetime(2023, 4, 1)),
+     ("ix_articles_created_at_id", "ix_articles_created_at"), True),
+    ("tag", ArticleFilters(tags=[TAG_VOCABULARY[50]]),
+     ("ix_article_tags_tag_article_id",), False),
+    ("tags_all", ArticleFilters(tags=[TAG_VOCABULARY[0], TAG_VOCABULARY[1]]),
+     ("ix_article_tags_tag_article_id",), False),
+    ("tags_any", ArticleFilters(tags=[TAG_VOCABULARY[50], TAG_VOCABULARY[60]], tag_mode="any"),
+     ("ix_article_tags_tag_article_id",), False),
+]
+
+
+def page_statement(filters: ArticleFilters, limit: int = 10):
+    return filters.apply(select(Article)).order_by(Article.created_at.desc(), Article.id.desc()).limit(limit + 1)
+
+
+def _walk(node: dict, visit: Callable[[dict], None]) -> None:
+    visit(node)
+    for child in node.get("Plans", []):
+        _walk(child, visit)
+
+
+def explain(engine: Engine, stmt) -> Tuple[List[str], List[str], bool]:
+    # Returns (plan lines for display, indexes used, sorts)
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled)).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            nodes: List[dict] = []
+            _walk(plan[0]["Plan"], nodes.append)
+            lines = [f"{n['Node Type']} {n.get('Index Name', n.get('Relation Name', ''))}".strip() for n in nodes]
+            indexes = [n["Index Name"] for n in nodes if "Index Name" in n]
+            sorts = any(n["Node Type"] in ("Sort", "Incremental Sort") for n in nodes)
+            return lines, indexes, sorts
+
+        lines = [row[3] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled))]
+        indexes = [line.split(" INDEX ")[1].split()[0] for line in lines if " INDEX " in line]
+        sorts = any("TEMP B-TREE FOR ORDER BY" in line for line in lines)
+        return lines, indexes, sorts
+
+
+def check_plans(engine: Engine) -> List[dict]:
+    results = []
+    for name, filters, expected, no_sort in PLAN_CASES:
+        lines, indexes, sorts = explain(engine, page_statement(filters))
+        ok = any(index in expected for index in indexes) and not (no_sort and sorts)
+        results.append({"case": name, "ok": ok, "expected": list(expected), "indexes": indexes, "sorts": sorts, "plan": lines})
+    return results
@@ -0,0 +1,292 @@
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+try:
+    import httpx
+except ImportError as e:
+    raise SystemExit("Benchmarks need httpx - pip install -r requirements-dev.txt") from e
+from app.pagination import encode_cursor
+from benchmarks.dataset import AUTHORS, SPAN, TAG_VOCABULARY, WORDS, _zipf_index
+
+# Drives the articles API with a fixed mix of requests and measures
+# per-endpoint throughput and latency. The same scenarios run in-process
+# (httpx ASGI transport - no network, isolates app + DB cost) and against
+# a real uvicorn server over a socket (adds HTTP parsing and the event loop).
+
+API = "/api/v1/articles"
+
+# end of the synthetic dataset's created_at range (see generate_articles)
+DATASET_END = datetime(2025, 1, 1)
+
+
+@dataclass
+class State:
+    # What scenarios need to know about the dataset. created holds ids made
+    # by the create scenario, so update/delete never touch seeded rows.
+    size: int
+    rng: random.Random
+    etags: Dict[int, str] = field(default_factory=dict)
+    created: List[int] = field(default_factory=list)
+
+    def random_id(self) -> int:
+        return self.rng.randint(1, max(self.size, 1))
+
+    def random_tag(self) -> str:
+        return TAG_VOCABULARY[_zipf_index(self.rng, len(TAG_VOCABULARY))]
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    json: Optional[dict] = None
+    headers: Optional[dict] = None
+
+
+@dataclass
+class Scenario:
+    name: str
+    build: Callable[[State], Request]
+    # write scenarios run after all reads, so reads see the seeded dataset
+    write: bool = False
+
+
+def _new_article(state: State) -> dict:
+    rng = state.rng
+    return {
+        "title": f"Benchmark article {rng.randint(0, 10**9)}",
+        "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(200, 600))),
+        "author": rng.choice(AUTHORS),
+        "tags": [state.random_tag() for _ in range(rng.randint(0, 4))]
+    }
+
+
+def _deep_page(state: State) -> Request:
+    last_page = max(state.size // 10, 1)
+    return Request("GET", f"{API}/?page={state.rng.randint(1, last_page)}&limit=10")
+
+
+def _cursor_page(state: State) -> Request:
+    seek = DATASET_END - SPAN * state.rng.random()
+    return Request("GET", f"{API}/?limit=10&cursor={encode_cursor(seek, 2**31 - 1)}")
+
+
+def _conditional_get(state: State) -> Request:
+    id = state.rng.choice(list(state.etags)) if state.etags else state.random_id()
+    headers = {"If-None-Match": state.etags[id]} if id in state.etags else None
+    return Request("GET", f"{API}/{id}", headers=headers)
+
+
+def _month_archive(state: State) -> Request:
+    start = datetime(DATASET_END.year - state.rng.randint(1, 3), state.rng.randint(1, 12), 1)
+    end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return Request("GET", f"{API}/?limit=10&created_after={start.isoformat()}&created_before={end.isoformat()}")
+
+
+def _update(state: State) -> Request:
+    id = state.rng.choice(state.created) if state.created else state.random_id()
+    return Request("PUT", f"{API}/{id}", json={"title": f"Updated article {state.rng.randint(0, 10**9)}"})
+
+
+def _delete(state: State) -> Request:
+    id = state.created.pop() if state.created else 0
+    return Request("DELETE", f"{API}/{id}")
+
+
+SCENARIOS = [
+    Scenario("list_first_page", lambda s: Request("GET", f"{API}/?limit=10")),
+    Scenario("list_deep_offset", _deep_page),
+    Scenario("list_cursor", _cursor_page),
+    Scenario("list_by_tag", lambda s: Request("GET", f"{API}/?limit=10&tag={s.random_tag()}")),
+    Scenario("list_by_tags_all", lambda s: Request("GET", f"{API}/?limit=10&tag={s.random_tag()}&tag={s.random_tag()}")),
+    Scenario("list_by_author", lambda s: Request("GET", f"{API}/?limit=10&author={s.rng.choice(AUTHORS)}")),
+    Scenario("list_month_archive", _month_archive),
+    Scenario("list_summary_no_count", lambda s: Request("GET", f"{API}/?limit=50&view=summary&count=none")),
+    Scenario("get_article", lambda s: Request("GET", f"{API}/{s.random_id()}")),
+    Scenario("get_article_not_modified", _conditional_get),
+    Scenario("search", lambda s: Request("GET", f"{API}/search?q={s.rng.choice(WORDS[:60])}+{s.rng.choice(WORDS[:60])}")),
+    Scenario("create_article", lambda s: Request("POST", f"{API}/", json=_new_article(s)), write=True),
+    Scenario("update_article", _update, write=True),
+    Scenario("delete_article", _delete, write=True),
+]
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    # nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(p / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, state: State,
+                       requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            request = scenario.build(state)
+            start = time.perf_counter()
+            try:
+                response = await client.request(request.method, request.url, json=request.json, headers=request.headers)
+                await response.aread()
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+            if scenario.name == "create_article" and response.status_code == 201:
+                state.created.append(response.json()["data"]["id"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "scenario": scenario.name,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            "p50": _ms(percentile(latencies, 50)),
+            "p95": _ms(percentile(latencies, 95)),
+            "p99": _ms(percentile(latencies, 99)),
+            "mean": _ms(sum(latencies) / len(latencies)) if latencies else 0.0,
+            "max": _ms(latencies[-1]) if latencies else 0.0,
+        },
+        "statuses": statuses,
+        "errors": errors,
+    }
+
+
+async def _prime(client: httpx.AsyncClient, state: State) -> None:
+    # ETags for the conditional-GET scenario
+    for _ in range(20):
+        id = state.random_id()
+        response = await client.get(f"{API}/{id}")
+        if response.status_code == 200 and "etag" in response.headers:
+            state.etags[id] = response.headers["etag"]
+
+
+async def run_suite(client: httpx.AsyncClient, size: int, requests: int, concurrency: int,
+                    seed: int, scenarios: Optional[List[str]] = None, warmup: int = 20) -> List[dict]:
+    state = State(size=size, rng=random.Random(seed))
+    await _prime(client, state)
+
+    selected = [s for s in SCENARIOS if not scenarios or s.name in scenarios]
+    ordered = [s for s in selected if not s.write] + [s for s in selected if s.write]
+
+    results = []
+    for scenario in ordered:
+        # warm-up requests are not measured (connection pool, caches, JIT-ish imports)
+        if warmup and not scenario.write:
+            await run_scenario(client, scenario, state, warmup, 1)
+        results.append(await run_scenario(client, scenario, state, requests, concurrency))
+    return results
+
+
+async def run_in_process(size: int, requests: int, concurrency: int, seed: int,
+                         scenarios: Optional[List[str]] = None) -> List[dict]:
+    from app.main import app
+    from app.cache import article_cache, list_cache
+
+    # a re-seeded database must not be served from the previous run's
+    # caches (a shared CACHE_BACKEND is not flushed - benchmark without one)
+    article_cache.local.clear()
+    list_cache.local.clear()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        return await run_suite(client, size, requests, concurrency, seed, scenarios)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    # One uvicorn worker in a subprocess. The benchmark database is made
+    # with create_all, not Alembic, so /ready doesn't wait for migrations.
+    env = dict(os.environ, LOG_LEVEL=os.environ.get("LOG_LEVEL", "WARNING"))
+    env.setdefault("READY_REQUIRE_MIGRATIONS", "False")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, server: subprocess.Popen, startup_timeout: float) -> dict:
+    # Poll /ready until the pools are warm; returns its payload
+    deadline = time.monotonic() + startup_timeout
+    while True:
+        try:
+            response = await client.get("/ready")
+            if response.status_code == 200:
+                return response.json()["data"]
+        except httpx.TransportError:
+            pass
+        if server.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError("uvicorn did not start")
+        await asyncio.sleep(0.05)
+
+
+async def run_over_socket(size: int, requests: int, concurrency: int, seed: int,
+                          scenarios: Optional[List[str]] = None, startup_timeout: float = 30) -> List[dict]:
+    # A fresh server for every dataset
+    port = _free_port()
+    server = _start_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            await _wait_ready(client, server, startup_timeout)
+            return await run_suite(client, size, requests, concurrency, seed, scenarios)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+async def measure_cold_start(runs: int = 3, startup_timeout: float = 30) -> dict:
+    # Process start -> first 200 from /ready, `runs` times, plus the app's
+    # own phase timings (import, engines, warm-up, ...) - medians
+    wall = []
+    phases: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        port = _free_port()
+        started = time.perf_counter()
+        server = _start_server(port)
+        try:
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=10) as client:
+                ready = await _wait_ready(client, server, startup_timeout)
+            wall.append(time.perf_counter() - started)
+            for phase, seconds in ready["startup_seconds"].items():
+                phases.setdefault(phase, []).append(seconds)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+    def median(values: List[float]) -> float:
+        return round(percentile(sorted(values), 50) * 1000, 1)
+
+    return {"runs": runs, "ready_ms": median(wall), "phases_ms": {phase: median(values) for phase, values in phases.items()}}
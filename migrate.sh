@@ -2,8 +2,7 @@
 
 set -e
 
-echo "Running Alembic Migrations..."
-alembic upgrade head
-
-echo "Starting the app..."
-exec uvicorn app.main:app --host 0.0.0.0 --port $PORT
+# serve.py runs the migrations (once), then starts the workers -
+# WEB_WORKERS / DB_CONNECTION_BUDGET size them (see serve.py)
+echo "Running Alembic Migrations and starting the app..."
+exec python serve.py --host 0.0.0.0 --port $PORT
@@ -18,6 +18,20 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata  # এটা গুরুত্বপূর্ণ! None রাখলে কোনো টেবিল generate হবে না
 
 
+# The full-text index lives outside the models (app/search.py): a table and
+# GIN index on Postgres, an FTS5 virtual table plus its shadow tables
+# (article_search_data, _idx, _content, ...) on SQLite. Keep them out of
+# autogenerate / `alembic check`, which would otherwise emit drops for them.
+SEARCH_TABLE = "article_search"
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    table = name if type_ == "table" else getattr(getattr(object, "table", None), "name", None)
+    if table is not None and (table == SEARCH_TABLE or table.startswith(SEARCH_TABLE + "_")):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = os.getenv("DATABASE_URL")
@@ -31,6 +45,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -50,7 +65,8 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata  # এখানেও target_metadata দাও
+            target_metadata=target_metadata,  # এখানেও target_metadata দাও
+            include_object=include_object
         )
 
         with context.begin_transaction():
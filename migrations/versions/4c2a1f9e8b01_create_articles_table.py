@@ -0,0 +1,51 @@
+"""create articles table
+
+Revision ID: 4c2a1f9e8b01
+Revises: 
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c2a1f9e8b01'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # databases created with app/create_db.py already have the table,
+    # so only create it when it is missing
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("articles"):
+        return
+
+    op.create_table(
+        "articles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("author", sa.String(), nullable=True),
+        sa.Column("tags", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_articles_id"), "articles", ["id"], unique=False)
+    op.create_index(op.f("ix_articles_title"), "articles", ["title"], unique=False)
+    op.create_index(op.f("ix_articles_author"), "articles", ["author"], unique=False)
+    op.create_index(op.f("ix_articles_created_at"), "articles", ["created_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_articles_created_at"), table_name="articles")
+    op.drop_index(op.f("ix_articles_author"), table_name="articles")
+    op.drop_index(op.f("ix_articles_title"), table_name="articles")
+    op.drop_index(op.f("ix_articles_id"), table_name="articles")
+    op.drop_table("articles")
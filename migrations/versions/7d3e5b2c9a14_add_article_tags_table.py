@@ -0,0 +1,75 @@
+"""add article_tags table
+
+Revision ID: 7d3e5b2c9a14
+Revises: 4c2a1f9e8b01
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import List, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d3e5b2c9a14'
+down_revision: Union[str, Sequence[str], None] = '4c2a1f9e8b01'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+
+def normalize_tags(tags: Optional[str]) -> List[str]:
+    # Frozen copy of app.tags.normalize_tags as of this revision: the
+    # comma-joined articles.tags string -> unique, lowercased, non-empty
+    # tags in their original order
+    result = []
+    for tag in (tags or "").split(","):
+        tag = tag.strip().lower()
+        if tag and tag not in result:
+            result.append(tag)
+    return result
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    article_tags = op.create_table(
+        "article_tags",
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("tag", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("article_id", "tag"),
+    )
+    op.create_index("ix_article_tags_tag_article_id", "article_tags", ["tag", "article_id"], unique=False)
+
+    # backfill from the comma-joined articles.tags strings, batch by batch
+    # so huge tables don't have to fit in memory
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, tags FROM articles "
+                "WHERE id > :last_id AND tags IS NOT NULL "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+
+        links = [
+            {"article_id": row.id, "tag": tag}
+            for row in rows
+            for tag in normalize_tags(row.tags)
+        ]
+        if links:
+            op.bulk_insert(article_tags, links)
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_article_tags_tag_article_id", table_name="article_tags")
+    op.drop_table("article_tags")
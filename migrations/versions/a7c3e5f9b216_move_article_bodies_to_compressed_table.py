@@ -0,0 +1,164 @@
+"""move article bodies to a compressed article_bodies table
+
+Revision ID: a7c3e5f9b216
+Revises: f2a6d9c1b784
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+import zlib
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f9b216'
+down_revision: Union[str, Sequence[str], None] = 'f2a6d9c1b784'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+# Frozen copies of the body codec, preview length and articles delete
+# trigger as they were at this revision (app/bodies.py, app/partitions.py),
+# so later changes to the app can't change what this migration writes.
+PREVIEW_LENGTH = 500
+COMPRESSION_LEVEL = 6
+COMPRESS_MIN_SIZE = 256
+
+CASCADE_FUNCTION = (
+    "CREATE OR REPLACE FUNCTION articles_delete_cascade() RETURNS trigger AS $$ "
+    "BEGIN "
+    "IF EXISTS (SELECT 1 FROM articles WHERE id = OLD.id) THEN RETURN OLD; END IF; "
+    "DELETE FROM article_tags WHERE article_id = OLD.id; "
+    "DELETE FROM article_bodies WHERE article_id = OLD.id; "
+    "DELETE FROM article_search WHERE article_id = OLD.id; "
+    "RETURN OLD; "
+    "END $$ LANGUAGE plpgsql"
+)
+
+
+def is_partitioned(bind) -> bool:
+    if bind.dialect.name != "postgresql":
+        return False
+    return bool(bind.execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('articles'))"
+    )).scalar())
+
+
+def body_row(article_id: int, text: str) -> dict:
+    # zstd when installed, zlib otherwise; short or incompressible bodies plain
+    raw = text.encode("utf-8")
+    codec, data = "plain", raw
+    if len(raw) >= COMPRESS_MIN_SIZE:
+        if zstandard is not None:
+            codec, data = "zstd", zstandard.ZstdCompressor(level=COMPRESSION_LEVEL).compress(raw)
+        else:
+            codec, data = "zlib", zlib.compress(raw, COMPRESSION_LEVEL)
+        if len(data) >= len(raw):
+            codec, data = "plain", raw
+    return {"article_id": article_id, "codec": codec, "data": data, "size": len(raw)}
+
+
+def decode_body(codec: str, data: bytes) -> str:
+    data = bytes(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Article body is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    return data.decode("utf-8")
+
+
+def make_preview(text: Optional[str]) -> Optional[str]:
+    return text[:PREVIEW_LENGTH] if text is not None else None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    partitioned = is_partitioned(bind)
+
+    # a partitioned articles table can't be referenced by a foreign key -
+    # its delete trigger removes the bodies instead
+    article_bodies = op.create_table(
+        "article_bodies",
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("codec", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        *([] if partitioned else [sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE")]),
+        sa.PrimaryKeyConstraint("article_id"),
+    )
+    if partitioned:
+        op.execute(CASCADE_FUNCTION)
+    op.add_column("articles", sa.Column("preview", sa.Text(), nullable=True))
+
+    # compress the bodies batch by batch, so huge tables don't have to fit
+    # in memory
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, content FROM articles WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+
+        op.bulk_insert(article_bodies, [body_row(row.id, row.content) for row in rows])
+        bind.execute(
+            sa.text("UPDATE articles SET preview = :preview WHERE id = :id"),
+            [{"id": row.id, "preview": make_preview(row.content)} for row in rows]
+        )
+        last_id = rows[-1].id
+
+    # batch mode so SQLite can rebuild the table without the column
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("content")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    op.add_column("articles", sa.Column("content", sa.Text(), nullable=True))
+
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT article_id, codec, data FROM article_bodies "
+                "WHERE article_id > :last_id ORDER BY article_id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+
+        bind.execute(
+            sa.text("UPDATE articles SET content = :content WHERE id = :id"),
+            [{"id": row.article_id, "content": decode_body(row.codec, row.data)} for row in rows]
+        )
+        last_id = rows[-1].article_id
+
+    op.execute("UPDATE articles SET content = '' WHERE content IS NULL")
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("preview")
+    if is_partitioned(bind):
+        # the delete trigger must stop touching article_bodies
+        op.execute(
+            "CREATE OR REPLACE FUNCTION articles_delete_cascade() RETURNS trigger AS $$ "
+            "BEGIN "
+            "DELETE FROM article_tags WHERE article_id = OLD.id; "
+            "DELETE FROM article_search WHERE article_id = OLD.id; "
+            "RETURN OLD; "
+            "END $$ LANGUAGE plpgsql"
+        )
+    op.drop_table("article_bodies")
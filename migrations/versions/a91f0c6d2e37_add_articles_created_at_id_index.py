@@ -0,0 +1,28 @@
+"""add articles (created_at, id) index
+
+Revision ID: a91f0c6d2e37
+Revises: 7d3e5b2c9a14
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91f0c6d2e37'
+down_revision: Union[str, Sequence[str], None] = '7d3e5b2c9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_articles_created_at_id", "articles", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_articles_created_at_id", table_name="articles")
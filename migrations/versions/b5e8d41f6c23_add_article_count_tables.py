@@ -0,0 +1,50 @@
+"""add article_counters and tag_counts tables
+
+Revision ID: b5e8d41f6c23
+Revises: a91f0c6d2e37
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e8d41f6c23'
+down_revision: Union[str, Sequence[str], None] = 'a91f0c6d2e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "article_counters",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_table(
+        "tag_counts",
+        sa.Column("tag", sa.String(), nullable=False),
+        sa.Column("article_count", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("tag"),
+    )
+
+    # seed the counters from the current data
+    op.execute(
+        "INSERT INTO article_counters (name, value) "
+        "SELECT 'articles', COUNT(*) FROM articles"
+    )
+    op.execute(
+        "INSERT INTO tag_counts (tag, article_count) "
+        "SELECT tag, COUNT(*) FROM article_tags GROUP BY tag"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tag_counts")
+    op.drop_table("article_counters")
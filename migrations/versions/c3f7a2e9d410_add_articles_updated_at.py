@@ -0,0 +1,36 @@
+"""add articles.updated_at
+
+Revision ID: c3f7a2e9d410
+Revises: b5e8d41f6c23
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7a2e9d410'
+down_revision: Union[str, Sequence[str], None] = 'b5e8d41f6c23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("articles", sa.Column("updated_at", sa.DateTime(), nullable=True))
+
+    # existing articles were last modified when they were created, as far as we know
+    op.execute("UPDATE articles SET updated_at = created_at WHERE updated_at IS NULL")
+
+    # batch mode so SQLite can rebuild the table to add NOT NULL
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.alter_column("updated_at", existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("updated_at")
@@ -0,0 +1,57 @@
+"""add article_search full-text index
+
+Revision ID: d8b1e4a7c952
+Revises: c3f7a2e9d410
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8b1e4a7c952'
+down_revision: Union[str, Sequence[str], None] = 'c3f7a2e9d410'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        op.execute(
+            "CREATE TABLE article_search ("
+            "article_id INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        op.execute("CREATE INDEX ix_article_search_document ON article_search USING GIN (document)")
+        op.get_bind().execute(
+            sa.text(
+                "INSERT INTO article_search (article_id, document) "
+                "SELECT id, setweight(to_tsvector(CAST(:language AS regconfig), coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector(CAST(:language AS regconfig), coalesce(content, '')), 'B') FROM articles"
+            ),
+            {"language": settings.SEARCH_LANGUAGE}
+        )
+
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE article_search "
+            "USING fts5(title, content, tokenize='porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO article_search (rowid, title, content) "
+            "SELECT id, title, content FROM articles"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name in ("postgresql", "sqlite"):
+        op.execute("DROP TABLE article_search")
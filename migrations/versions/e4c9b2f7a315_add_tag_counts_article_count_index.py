@@ -0,0 +1,35 @@
+"""add tag_counts (article_count DESC, tag) index
+
+Revision ID: e4c9b2f7a315
+Revises: d8b1e4a7c952
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c9b2f7a315'
+down_revision: Union[str, Sequence[str], None] = 'd8b1e4a7c952'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # top-N tags for GET /api/v1/tags (article_count DESC, tag ASC) is a
+    # forward scan of this index - mixed directions can't be read backwards
+    # from an all-ascending one
+    op.create_index(
+        "ix_tag_counts_article_count_tag",
+        "tag_counts",
+        [sa.text("article_count DESC"), "tag"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tag_counts_article_count_tag", table_name="tag_counts")
@@ -0,0 +1,37 @@
+"""add articles (author, created_at, id) index
+
+Revision ID: f2a6d9c1b784
+Revises: e4c9b2f7a315
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6d9c1b784'
+down_revision: Union[str, Sequence[str], None] = 'e4c9b2f7a315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # author archive pages (author = ?, newest first, optional date range)
+    # become one backwards range scan; the single-column author index is
+    # a prefix of it and only costs writes
+    op.create_index(
+        "ix_articles_author_created_at_id",
+        "articles",
+        ["author", "created_at", "id"],
+    )
+    op.drop_index("ix_articles_author", table_name="articles")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_articles_author", "articles", ["author"], unique=False)
+    op.drop_index("ix_articles_author_created_at_id", table_name="articles")
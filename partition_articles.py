@@ -0,0 +1,87 @@
+import argparse
+from datetime import datetime
+from app.config import settings
+from app.database import engine, SessionLocal
+from app.counts import rebuild_counts
+from app.partitions import (
+    add_months, archive_partition, convert_to_partitioned, ensure_partitions, is_partitioned,
+    list_partitions, month_start, partitions_before, restore_archive
+)
+
+# Monthly partitioning of the articles table (PostgreSQL only):
+#   python partition_articles.py convert [--drop-old]   one-off conversion
+#   python partition_articles.py ensure [--months N]     create upcoming partitions
+#   python partition_articles.py archive [--older-than-months N] [--dir DIR]
+#   python partition_articles.py restore FILE            re-attach an archived month
+#   python partition_articles.py status
+# Stop writers (or expect them to wait) while convert runs.
+
+
+def rebuild():
+    with SessionLocal() as db:
+        rebuild_counts(db)
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the monthly partitions of the articles table")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="copy articles into a partitioned table and swap it in")
+    convert.add_argument("--drop-old", action="store_true", help="drop the old table instead of keeping articles_unpartitioned")
+    ensure = commands.add_parser("ensure", help="create partitions for the coming months")
+    ensure.add_argument("--months", type=int, default=settings.PARTITION_MONTHS_AHEAD)
+    archive = commands.add_parser("archive", help="move old months to compressed files and drop them")
+    archive.add_argument("--older-than-months", type=int, default=settings.ARCHIVE_AFTER_MONTHS)
+    archive.add_argument("--dir", default=settings.ARCHIVE_DIR)
+    restore = commands.add_parser("restore", help="load an archived month back")
+    restore.add_argument("file")
+    commands.add_parser("status", help="list partitions")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        parser.error("partitioning needs PostgreSQL")
+
+    if args.command == "convert":
+        with engine.begin() as connection:
+            result = convert_to_partitioned(connection, drop_old=args.drop_old)
+        print(f"Converted: {result['rows']} articles in {result['partitions']} month partitions")
+        if not args.drop_old:
+            print("The old table is kept as articles_unpartitioned - drop it once you are happy")
+        return
+
+    with engine.connect() as connection:
+        if not is_partitioned(connection):
+            parser.error("articles is not partitioned - run convert first")
+
+    if args.command == "ensure":
+        with engine.begin() as connection:
+            created = ensure_partitions(connection, add_months(month_start(datetime.utcnow()), args.months))
+        print(f"Created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+
+    elif args.command == "archive":
+        cutoff = add_months(month_start(datetime.utcnow()), -args.older_than_months)
+        with engine.connect() as connection:
+            names = partitions_before(connection, cutoff)
+        # one transaction per month - a failure keeps the months not yet archived
+        for name in names:
+            with engine.begin() as connection:
+                result = archive_partition(connection, name, args.dir)
+            print(f"{name}: {result['rows']} articles -> {result['path']} ({result['bytes']} bytes)")
+        if names:
+            rebuild()
+        print(f"Archived {len(names)} partitions older than {cutoff:%Y-%m}")
+
+    elif args.command == "restore":
+        with engine.begin() as connection:
+            restored = restore_archive(connection, args.file)
+        rebuild()
+        print(f"Restored {restored} articles from {args.file}")
+
+    elif args.command == "status":
+        with engine.connect() as connection:
+            for partition in list_partitions(connection):
+                print(f"{partition['name']:<24} {partition['rows']:>10} rows {partition['bytes']:>14} bytes  {partition['bounds']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+from app.database import SessionLocal
+from app.counts import rebuild_counts
+
+# Recompute article_counters and tag_counts from the articles and
+# article_tags tables - run after manual SQL edits or if totals drift.
+def main():
+    with SessionLocal() as db:
+        result = rebuild_counts(db)
+        db.commit()
+        print(f"Counters rebuilt: {result['articles']} articles, {result['tags']} tags")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+from gunicorn.app.base import BaseApplication
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+from app.config import Settings, settings
+from app.logger import logger
+
+# Production launcher - gunicorn master, uvicorn workers:
+#   python serve.py                          migrate, then serve on APP_HOST:APP_PORT
+#   python serve.py --workers 4 --no-migrate
+#   python serve.py --plan                   print the worker sizing and exit
+#
+# Workers: WEB_WORKERS, or one per CPU core available to the process (they
+# are asyncio workers - one per core keeps every core busy). Either way the
+# count is capped so that workers x connections per worker stays within
+# DB_CONNECTION_BUDGET; replicas get the same pool sizes, so the cap holds
+# for them too if they allow the same max_connections.
+#
+# Migrations run once, in a child process, before gunicorn starts. The app
+# is then imported once in the master (preload_app) and forked - importing
+# it opens no connections, every worker creates and warms its own pools in
+# its lifespan (app/main.py). The master never holds a connection, so none
+# is shared across fork.
+#
+# Signals to the master: HUP replaces the workers one by one, gracefully
+# (they are forked from the preloaded app - restart the master to deploy
+# new code); TERM stops after in-flight requests finish, within
+# WORKER_GRACEFUL_TIMEOUT. Workers are also recycled after
+# WORKER_MAX_REQUESTS requests.
+#
+# In-process state is per worker: /metrics, /internal/* and the local
+# caches each describe one worker. Without CACHE_BACKEND=redis the local
+# article cache TTL is capped at ARTICLE_CACHE_WORKERS_TTL.
+
+ROOT = Path(__file__).resolve().parent
+WORKER_CLASS = "uvicorn.workers.UvicornWorker"
+
+
+def available_cpus() -> int:
+    # honours CPU affinity / cpusets (containers), unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def connections_per_worker(config: Settings = settings) -> int:
+    # Most connections one worker can open on the primary: its pool at
+    # full overflow, and the async pool on top with ASYNC_DB
+    pool = config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW
+    return pool * 2 if config.ASYNC_DB else pool
+
+
+def uses_connection_budget(url: str) -> bool:
+    # SQLite has no server-side connection limit
+    return make_url(url).get_backend_name() != "sqlite"
+
+
+def plan_workers(requested: int, cpus: int, per_worker: int, budget: Optional[int]) -> int:
+    # requested (or one per core), capped by the connection budget; None = no budget
+    workers = requested if requested > 0 else cpus
+    if budget is None:
+        return workers
+    fits = budget // per_worker
+    if fits < 1:
+        raise SystemExit(
+            f"One worker can open {per_worker} connections, more than DB_CONNECTION_BUDGET={budget} - "
+            "lower DB_POOL_SIZE / DB_MAX_OVERFLOW or raise the budget"
+        )
+    if fits < workers:
+        logger.warning(f"Launcher: {workers} workers would need {workers * per_worker} connections - capped at {fits} (DB_CONNECTION_BUDGET={budget})")
+    return min(workers, fits)
+
+
+def check_server_limit(url: str, budget: int) -> None:
+    # Warn when the budget itself is more than Postgres allows. NullPool:
+    # the connection is closed right away, nothing is left open for fork.
+    checker = create_engine(url, poolclass=NullPool)
+    try:
+        if checker.dialect.name != "postgresql":
+            return
+        with checker.connect() as connection:
+            max_connections = int(connection.execute(text("SHOW max_connections")).scalar())
+            reserved = int(connection.execute(text("SHOW superuser_reserved_connections")).scalar())
+        if budget > max_connections - reserved:
+            logger.warning(
+                f"Launcher: DB_CONNECTION_BUDGET={budget} exceeds the server's max_connections={max_connections} "
+                f"minus {reserved} reserved - workers can run out of connections"
+            )
+    except Exception as e:
+        logger.warning(f"Launcher: could not read max_connections - Error: {str(e)}")
+    finally:
+        checker.dispose()
+
+
+def migrate() -> None:
+    # A child process, so Alembic's engine and connection die with it
+    logger.info("Launcher: running migrations (alembic upgrade head)")
+    subprocess.run([sys.executable, "-m", "alembic", "-c", str(ROOT / "alembic.ini"), "upgrade", "head"], cwd=ROOT, check=True)
+
+
+class Launcher(BaseApplication):
+
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        return app
+
+
+def gunicorn_options(workers: int, host: str, port: int, config: Settings = settings) -> dict:
+    return {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": WORKER_CLASS,
+        "preload_app": True,
+        "timeout": config.WORKER_TIMEOUT,
+        "graceful_timeout": config.WORKER_GRACEFUL_TIMEOUT,
+        "max_requests": config.WORKER_MAX_REQUESTS,
+        "max_requests_jitter": config.WORKER_MAX_REQUESTS_JITTER,
+        "loglevel": os.getenv("LOG_LEVEL", "info").lower(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API with several worker processes")
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS, help="worker processes (0 = one per CPU core)")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--budget", type=int, default=settings.DB_CONNECTION_BUDGET, help="connections all workers may open together")
+    parser.add_argument("--no-migrate", action="store_true", help="skip alembic upgrade head (migrations run elsewhere)")
+    parser.add_argument("--plan", action="store_true", help="print the worker sizing and exit")
+    args = parser.parse_args()
+
+    if not settings.DATABASE_URL:
+        raise SystemExit("DATABASE_URL environment variable is required!")
+
+    cpus = available_cpus()
+    per_worker = connections_per_worker()
+    budget = args.budget if uses_connection_budget(settings.DATABASE_URL) else None
+    workers = plan_workers(args.workers, cpus, per_worker, budget)
+
+    plan = (
+        f"{workers} workers ({cpus} CPUs available), up to {per_worker} connections each, "
+        f"{workers * per_worker} in total" + (f" of a budget of {budget}" if budget is not None else "")
+    )
+    if args.plan:
+        print(plan)
+        return
+    logger.info(f"Launcher: {plan}")
+
+    # A write invalidates the local caches of its own worker only (redis
+    # shares the invalidation). The app isn't imported yet, so a shorter
+    # article TTL set here is the one every worker's cache is built with.
+    stale = []
+    if workers > 1 and settings.CACHE_BACKEND != "redis":
+        if settings.ARTICLE_CACHE_SIZE > 0:
+            settings.ARTICLE_CACHE_TTL = min(settings.ARTICLE_CACHE_TTL, settings.ARTICLE_CACHE_WORKERS_TTL)
+            stale.append(f"articles for up to {settings.ARTICLE_CACHE_TTL:g}s")
+        if settings.LIST_CACHE_SIZE > 0:
+            stale.append(f"list pages for up to {settings.LIST_CACHE_TTL:g}s")
+    if stale:
+        logger.warning(f"Launcher: after a write, other workers can serve cached {' and '.join(stale)} (CACHE_BACKEND=redis shares invalidations)")
+
+    if not args.no_migrate:
+        migrate()
+    if budget is not None:
+        check_server_limit(settings.DATABASE_URL, budget)
+
+    Launcher(gunicorn_options(workers, args.host, args.port)).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+# Tests run against a throwaway SQLite file unless TEST_DATABASE_URL points
+# at another database (e.g. a scratch Postgres - it is wiped). Settings are
+# read when app.config is first imported, so this comes before any app import.
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/test.db"
+# the async stack too (aiosqlite) - elsewhere set ASYNC_DB=True to test it
+if not os.environ.get("TEST_DATABASE_URL"):
+    os.environ.setdefault("ASYNC_DB", "True")
+os.environ.setdefault("READY_REQUIRE_MIGRATIONS", "False")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from app.database import Base, get_engine
+    from app import models, search  # noqa: F401 - registers tables and the search index
+    engine = get_engine()
+    # the search index is created next to the metadata, not part of it
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS article_search"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _client(async_db: bool):
+    from app.config import Settings
+    from app.main import create_app
+    config = Settings()
+    config.ASYNC_DB = async_db
+    return TestClient(create_app(config))
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    with _client(async_db=False) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def async_client(engine):
+    from app import database
+    if database.async_engine is None:
+        pytest.skip("Async stack is disabled - set ASYNC_DB=True")
+    with _client(async_db=True) as client:
+        yield client
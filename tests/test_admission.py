@@ -0,0 +1,27 @@
+from app.admission import AdmissionMiddleware, make_gates
+from app.config import Settings
+
+
+def test_group_commit_creates_are_admitted_a_full_batch():
+    config = Settings()
+    config.GROUP_COMMIT = True
+    config.GROUP_COMMIT_MAX_BATCH = 100
+    gates = make_gates(config)
+    middleware = AdmissionMiddleware(None, gates)
+
+    # creates wait for the batch without a connection; other writes hold one
+    assert gates["create"].limit == 100
+    assert gates["write"].limit == max((config.DB_POOL_SIZE + config.DB_MAX_OVERFLOW) // 3, 1)
+    assert middleware._request_class({"method": "POST", "path": "/api/v1/articles/"}) == "create"
+    assert middleware._request_class({"method": "POST", "path": "/api/v1/articles/bulk"}) == "write"
+    assert middleware._request_class({"method": "PUT", "path": "/api/v1/articles/1"}) == "write"
+
+
+def test_without_group_commit_creates_are_writes():
+    config = Settings()
+    config.GROUP_COMMIT = False
+    gates = make_gates(config)
+    middleware = AdmissionMiddleware(None, gates)
+
+    assert "create" not in gates
+    assert middleware._request_class({"method": "POST", "path": "/api/v1/articles/"}) == "write"
@@ -0,0 +1,47 @@
+import asyncio
+from app.bulk import iter_records
+from app.config import settings
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _records(data: bytes, size: int = 7):
+    async def collect():
+        return [record async for record in iter_records(_chunks(data, size))]
+    return asyncio.run(collect())
+
+
+def test_record_limit_counts_bytes(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_RECORD_BYTES", 60)
+    # 25 characters, 75 bytes of UTF-8, and no newline yet
+    records = _records(('{"title": "' + "অ" * 25).encode("utf-8"))
+    assert records[-1][2] == "Record exceeds 60 bytes, import stopped"
+
+
+def test_records_within_the_limit_parse(monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_RECORD_BYTES", 60)
+    records = _records(('{"title": "' + "অ" * 10 + '"}\n{"title": "b"}\n').encode("utf-8"))
+    assert [(obj, error) for _, obj, error in records] == [({"title": "অ" * 10}, None), ({"title": "b"}, None)]
+
+
+def test_malformed_array_element_does_not_drop_the_rest():
+    data = b'[{"title": "a, ]"}, {"title": }, {"title": [1, "]"]}, 12]'
+    for size in (1, 7, len(data)):
+        records = _records(data, size)
+        assert [(obj, error) for _, obj, error in records] == [
+            ({"title": "a, ]"}, None),
+            (None, "Invalid JSON: Expecting value"),
+            ({"title": [1, "]"]}, None),
+            (12, None),
+        ]
+
+
+def test_invalid_utf8_stops_the_import():
+    records = _records(b'{"title": "a"}\n{"title": "\xff"}\n{"title": "c"}\n')
+    assert [(obj, error) for _, obj, error in records] == [
+        ({"title": "a"}, None),
+        (None, "Invalid UTF-8 at byte 26, import stopped"),
+    ]
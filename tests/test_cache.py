@@ -0,0 +1,55 @@
+from app.cache import ArticleCache, InMemoryBackend, LRUCache
+
+
+class RacingBackend(InMemoryBackend):
+    # the article is updated (and invalidated) while its entry is being read
+    def __init__(self):
+        super().__init__()
+        self.cache = None
+
+    def get(self, key):
+        raw = super().get(key)
+        if self.cache is not None and key == self.cache.prefix + "1":
+            self.cache.invalidate(1)
+        return raw
+
+
+def _worker(shared) -> ArticleCache:
+    return ArticleCache(LRUCache(maxsize=10, ttl=60), shared=shared)
+
+
+def test_shared_hit_is_not_kept_locally_after_an_invalidation():
+    shared = RacingBackend()
+    writer, reader = _worker(shared), _worker(shared)
+    writer.set(1, {"id": 1, "title": "Old title"}, writer.generation(1))
+    shared.cache = reader
+
+    assert reader.get(1) == {"id": 1, "title": "Old title"}
+    assert reader.local.get(1) is None
+
+
+def test_shared_hit_fills_the_local_cache():
+    shared = InMemoryBackend()
+    writer, reader = _worker(shared), _worker(shared)
+    writer.set(1, {"id": 1}, writer.generation(1))
+
+    assert reader.get(1) == {"id": 1}
+    assert reader.local.get(1) is not None
+
+
+def test_write_on_another_worker_stales_the_local_copy():
+    shared = InMemoryBackend()
+    first, second = _worker(shared), _worker(shared)
+    first.set(1, {"id": 1, "title": "Old title"}, first.generation(1))
+    assert first.get(1) == {"id": 1, "title": "Old title"}
+
+    # updated through the second worker - the first one's LRU still has it
+    second.invalidate(1)
+    assert first.get(1) is None
+
+    # a fill that started before the write is stale too
+    generation = second.generation(1)
+    first.invalidate(1)
+    second.set(1, {"id": 1, "title": "Old title"}, generation)
+    assert first.get(1) is None
+    assert second.get(1) is None
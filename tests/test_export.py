@@ -0,0 +1,40 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+API = "/api/v1/articles"
+
+
+def test_export_tags(client):
+    response = client.post(f"{API}/", json={"title": "Exported tags", "content": "Exported body", "tags": ["Python", "FastAPI"]})
+    assert response.status_code == 201
+    id = response.json()["data"]["id"]
+
+    # NDJSON: a list, the same shape bulk import takes
+    lines = client.get(f"{API}/export?tag=python").text.splitlines()
+    exported = [item for item in map(json.loads, lines) if item["id"] == id]
+    assert exported[0]["tags"] == ["Python", "FastAPI"]
+
+    # CSV: one cell, one delimiter
+    rows = list(csv.DictReader(io.StringIO(client.get(f"{API}/export?format=csv&tag=python").text)))
+    exported = [row for row in rows if row["id"] == str(id)]
+    assert exported[0]["tags"] == "Python,FastAPI"
+
+
+def test_export_since_with_an_offset(client):
+    response = client.post(f"{API}/", json={"title": "Exported since", "content": "Exported body", "tags": ["since"]})
+    id = response.json()["data"]["id"]
+
+    # five minutes ago on a +02:00 clock - ahead of the stored naive UTC
+    # updated_at unless it is converted first
+    since = (datetime.now(timezone.utc) - timedelta(minutes=5)).astimezone(timezone(timedelta(hours=2)))
+    lines = client.get(f"{API}/export", params={"since": since.isoformat(), "tag": "since"}).text.splitlines()
+    assert id in [item["id"] for item in map(json.loads, lines)]
+
+    later = since + timedelta(minutes=10)
+    lines = client.get(f"{API}/export", params={"since": later.isoformat(), "tag": "since"}).text.splitlines()
+    assert lines == []
+
+    today = datetime.now(timezone.utc).date()
+    assert client.get(f"{API}/export", params={"since": str(today)}).status_code == 200
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+import pytest
+from app.filters import as_datetime, date_range
+
+API = "/api/v1/articles"
+
+
+def test_bounds_are_naive_utc():
+    assert as_datetime(datetime.fromisoformat("2025-03-01T00:00:00+02:00")) == datetime(2025, 2, 28, 22, 0)
+    assert as_datetime(datetime.fromisoformat("2025-03-01T10:00:00+00:00")) == datetime(2025, 3, 1, 10, 0)
+    with pytest.raises(ValueError):
+        date_range(datetime.fromisoformat("2025-03-02T00:00:00+02:00"), datetime(2025, 3, 1, 22, 0))
+
+
+@pytest.fixture(scope="module")
+def article(client):
+    response = client.post(f"{API}/", json={"title": "Dated article", "content": "Filtered by date", "tags": ["dated"]})
+    assert response.status_code == 201
+    data = response.json()["data"]
+    return data["id"], datetime.fromisoformat(data["created_at"])
+
+
+def _ids(client, **params):
+    response = client.get(f"{API}/", params={"tag": "dated", "count": "none", **params})
+    assert response.status_code == 200, response.text
+    return [item["id"] for item in response.json()["data"]["items"]]
+
+
+@pytest.mark.parametrize("router", ["client", "async_client"])
+def test_mixed_bounds(router, article, request):
+    client = request.getfixturevalue(router)
+    id, created_at = article
+    # an aware lower bound with a date-only upper bound
+    after = (created_at - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    assert _ids(client, created_after=after, created_before="2999-01-01") == [id]
+
+    response = client.get(f"{API}/", params={"created_after": "2030-01-01T10:00:00Z", "created_before": "2030-01-01"})
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"] == "created_after must be earlier than created_before"
+
+
+@pytest.mark.parametrize("router", ["client", "async_client"])
+def test_offset_bounds(router, article, request):
+    client = request.getfixturevalue(router)
+    id, created_at = article
+    # the same instant as created_at + 30 minutes, written in UTC+02:00:
+    # compared in UTC the article is before it, not two hours after
+    bound = (created_at + timedelta(hours=2, minutes=30)).strftime("%Y-%m-%dT%H:%M:%S+02:00")
+    assert _ids(client, created_before=bound) == [id]
+    assert _ids(client, created_after=bound) == []
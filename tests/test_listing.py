@@ -0,0 +1,51 @@
+import pytest
+
+API = "/api/v1/articles"
+
+
+@pytest.fixture(scope="module")
+def listed(client):
+    ids = []
+    for i in range(5):
+        response = client.post(f"{API}/", json={"title": f"Listed article {i}", "content": "Paged through", "tags": ["listed"]})
+        assert response.status_code == 201
+        ids.append(response.json()["data"]["id"])
+    return ids[::-1]
+
+
+@pytest.mark.parametrize("router", ["client", "async_client"])
+def test_cursor_pages_and_revalidation(router, listed, request):
+    client = request.getfixturevalue(router)
+    params = {"tag": "listed", "limit": 2, "fields": "title"}
+
+    seen, cursor = [], None
+    while True:
+        response = client.get(f"{API}/", params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        data = response.json()["data"]
+        assert data["meta"]["total"] == 5
+        assert all(set(item) == {"id", "title"} for item in data["items"])
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["meta"]["next_cursor"]
+        if not cursor:
+            break
+    assert seen == listed
+
+    # the page and its ETag are the same on both routers
+    first = client.get(f"{API}/", params=params)
+    assert first.headers["etag"] == request.getfixturevalue("client").get(f"{API}/", params=params).headers["etag"]
+    again = client.get(f"{API}/", params=params, headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+
+    # an empty page still reports the total
+    empty = client.get(f"{API}/", params={**params, "page": 9}).json()["data"]
+    assert empty["items"] == [] and empty["meta"]["total"] == 5
+
+
+@pytest.mark.parametrize("router", ["client", "async_client"])
+def test_bad_list_parameters_are_400(router, request):
+    client = request.getfixturevalue(router)
+    for params, error in [({"cursor": "nope"}, "Invalid cursor"), ({"fields": "nope"}, "Unknown field(s): nope")]:
+        response = client.get(f"{API}/", params=params)
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"].startswith(error)
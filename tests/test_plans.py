@@ -0,0 +1,12 @@
+import pytest
+from benchmarks.plans import check_plans
+
+
+def test_list_filters_use_their_indexes(engine):
+    # the --check-plans cases, on the test database's schema. SQLite plans
+    # from the schema alone; Postgres picks by statistics, so on a nearly
+    # empty table it rightly prefers a sort - check it after seeding instead
+    if engine.dialect.name != "sqlite":
+        pytest.skip("Postgres plans need a seeded database: python -m benchmarks --check-plans")
+    failed = [result for result in check_plans(engine) if not result["ok"]]
+    assert not failed, "\n".join(f"{r['case']}: expected {r['expected']}, got {r['plan']}" for r in failed)
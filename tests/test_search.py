@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+import pytest
+from app.routers import search as search_router
+from app.search import SearchUnavailableError, search_articles
+
+API = "/api/v1/articles"
+
+
+def test_search_pages_through_tied_scores(client):
+    # identical articles score exactly the same - paging must return each
+    # one once, across every page boundary
+    created = []
+    for i in range(7):
+        response = client.post(f"{API}/", json={"title": "Zephyrine notes", "content": "zephyrine " * 20, "tags": []})
+        assert response.status_code == 201
+        created.append(response.json()["data"]["id"])
+
+    seen = []
+    url = f"{API}/search?q=zephyrine&limit=2"
+    while url:
+        data = client.get(url).json()["data"]
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["meta"].get("next_cursor")
+        url = f"{API}/search?q=zephyrine&limit=2&cursor={cursor}" if cursor else None
+
+    assert len(set(seen)) == len(seen)
+    assert sorted(seen) == sorted(created)
+
+
+def test_search_on_an_unsupported_database_is_a_501(client, monkeypatch):
+    class MySQLSession:
+        def get_bind(self):
+            return SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+
+    with pytest.raises(SearchUnavailableError):
+        search_articles(MySQLSession(), "zephyrine", 10)
+
+    def unavailable(db, q, limit, seek):
+        raise SearchUnavailableError("Full-text search is not available on mysql")
+    monkeypatch.setattr(search_router, "search_articles", unavailable)
+    response = client.get(f"{API}/search?q=zephyrine")
+    assert response.status_code == 501
+    assert response.json()["detail"] == {"success": False, "error": "Search is not available on this server"}